@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Build All Dashboards
+Loads every evidence JSON once, renders the Phoenix / GE / dbt dashboards
+and METRICS_SUMMARY.md, and skips outputs whose inputs are unchanged since
+the last build
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+import generate_dbt_dashboard
+import generate_ge_dashboard
+import generate_metrics_summary
+import generate_phoenix_dashboard
+from dashboard_render import STYLESHEET_PATH, ensure_stylesheet
+from ensemble import ENSEMBLE_FILES
+from ge_history import HISTORY_PATH
+from phoenix_trace_store import TRACE_STORE_PATH
+
+EVIDENCE_DIR = os.path.dirname(os.path.abspath(__file__))
+MANIFEST = '.build_manifest.json'
+SPANS_FILE = 'agent_spans.jsonl'
+METRIC_FILES = ['task_success', 'hallucination_metrics', 'latency_metrics', 'cost_metrics',
+                'model_metrics', 'ge_rules']
+# Renderer code shared by every target; a change to it rebuilds everything
+SHARED_SOURCES = ['dashboard_render.py', STYLESHEET_PATH]
+
+
+class Evidence:
+    """Parsed evidence files plus a content digest per file, read once per build"""
+
+    def __init__(self, evidence_dir=EVIDENCE_DIR, history_path=HISTORY_PATH, spans_path=None,
+                 trace_store_path=TRACE_STORE_PATH):
+        self.data = {}
+        self.digests = {}
+        for name in METRIC_FILES:
+            with open(os.path.join(evidence_dir, f"{name}.json"), 'rb') as f:
+                raw = f.read()
+            self.digests[name] = hashlib.sha256(raw).hexdigest()
+            self.data[name] = json.loads(raw)
+        # Written by ensemble.py; absent until it has been run
+        for name in ENSEMBLE_FILES:
+            path = os.path.join(evidence_dir, f"{name}.json")
+            self.data[name] = self.digests[name] = None
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    raw = f.read()
+                self.digests[name] = hashlib.sha256(raw).hexdigest()
+                self.data[name] = json.loads(raw)
+        self.history_path = history_path
+        self.digests['ge_history'] = history_key(history_path)
+        self.spans_path = spans_path or os.path.join(evidence_dir, SPANS_FILE)
+        self.digests['agent_spans'] = file_key(self.spans_path)
+        self.trace_store_path = trace_store_path
+        self.digests['trace_store'] = _sqlite_key(trace_store_path, "SELECT MAX(ingest_id), MAX(ingest_ts) FROM ingests")
+
+    def subset(self, names):
+        return {name: self.data[name] for name in names}
+
+
+def history_key(path):
+    """Identity of an append-only results history: run count and newest run"""
+    return _sqlite_key(path, "SELECT COUNT(*), MAX(run_id), MAX(run_ts) FROM runs")
+
+
+def _sqlite_key(path, sql):
+    """Row of `sql` against the SQLite file at `path`, or None if there is no such store"""
+    if not os.path.exists(path):
+        return None
+    conn = sqlite3.connect(path)
+    try:
+        return list(conn.execute(sql).fetchone())
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+
+
+def file_key(path):
+    """Identity of a large append-only file (span exports run to GBs): size and mtime"""
+    if not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _source_digest(path):
+    with open(path if os.path.isabs(path) else os.path.join(EVIDENCE_DIR, path), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+# name -> (output file, evidence inputs, generator module, render(evidence, output_path))
+TARGETS = {
+    "phoenix": ("phoenix_dashboard.html",
+                generate_phoenix_dashboard.METRIC_NAMES + ENSEMBLE_FILES + ['agent_spans', 'trace_store'],
+                generate_phoenix_dashboard,
+                lambda ev, out: generate_phoenix_dashboard.generate_phoenix_html(
+                    ev.subset(generate_phoenix_dashboard.METRIC_NAMES + ENSEMBLE_FILES), out,
+                    ev.spans_path, ev.trace_store_path)),
+    "ge": ("ge_dashboard.html", ['ge_rules', 'ge_history'], generate_ge_dashboard,
+           lambda ev, out: generate_ge_dashboard.generate_ge_html_report(ev.history_path, ev.data['ge_rules'], out)),
+    "dbt": ("dbt_dashboard.html", [], generate_dbt_dashboard,
+            lambda ev, out: generate_dbt_dashboard.generate_dbt_html(out)),
+    "summary": ("METRICS_SUMMARY.md", generate_metrics_summary.METRIC_FILES, generate_metrics_summary,
+                lambda ev, out: generate_metrics_summary.generate_metrics_summary(
+                    ev.subset(generate_metrics_summary.METRIC_FILES), out)),
+}
+
+
+def input_hash(name, evidence, shared_digest):
+    """Digest of everything a target's output depends on"""
+    _, inputs, module, _ = TARGETS[name]
+    digest = hashlib.sha256(shared_digest.encode())
+    digest.update(_source_digest(module.__file__).encode())
+    digest.update(json.dumps({key: evidence.digests[key] for key in inputs}, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def build(out_dir=EVIDENCE_DIR, evidence_dir=EVIDENCE_DIR, history_path=HISTORY_PATH,
+          targets=None, force=False, spans_path=None, trace_store_path=TRACE_STORE_PATH):
+    """Render stale targets; returns {target: 'built' | 'skipped'}.
+
+    Targets render one after another: they are pure-Python string building,
+    so threads would only contend for the GIL and interleave their output.
+    """
+    evidence = Evidence(evidence_dir, history_path, spans_path, trace_store_path)
+    shared = hashlib.sha256(''.join(_source_digest(p) for p in SHARED_SOURCES).encode()).hexdigest()
+    manifest_path = os.path.join(out_dir, MANIFEST)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+
+    os.makedirs(out_dir, exist_ok=True)
+    ensure_stylesheet(out_dir)
+    names = targets or list(TARGETS)
+    hashes = {name: input_hash(name, evidence, shared) for name in names}
+    stale = [name for name in names
+             if force or manifest.get(name) != hashes[name]
+             or not os.path.exists(os.path.join(out_dir, TARGETS[name][0]))]
+
+    status = {name: 'skipped' for name in names}
+    if stale:
+        for name in stale:
+            TARGETS[name][3](evidence, os.path.join(out_dir, TARGETS[name][0]))
+            manifest[name] = hashes[name]
+            status[name] = 'built'
+        tmp = manifest_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, manifest_path)
+    return status
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render every dashboard and METRICS_SUMMARY.md from the evidence files")
+    parser.add_argument("--out-dir", default=EVIDENCE_DIR)
+    parser.add_argument("--evidence-dir", default=EVIDENCE_DIR)
+    parser.add_argument("--history", default=HISTORY_PATH, help="GE results history (see ge_history.py)")
+    parser.add_argument("--spans", default=None, help=f"agent span export (default: <evidence-dir>/{SPANS_FILE})")
+    parser.add_argument("--traces", default=TRACE_STORE_PATH, help="trace store (see phoenix_trace_store.py)")
+    parser.add_argument("--only", nargs='+', choices=sorted(TARGETS), help="build just these targets")
+    parser.add_argument("--force", action="store_true", help="rebuild even if inputs are unchanged")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    status = build(args.out_dir, args.evidence_dir, args.history, args.only, args.force, args.spans, args.traces)
+    print(f"\n🎯 Dashboard build ({time.perf_counter() - start:.2f}s)")
+    for name, state in status.items():
+        print(f"   {'✅ built  ' if state == 'built' else '⏭️  skipped'} {TARGETS[name][0]}")
+    return 0
+
+if __name__ == '__main__':
+    main()
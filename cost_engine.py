@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Token Cost Engine
+Streams per-request usage records (JSONL / Parquet / CSV), prices them against a
+pricing table and rolls up exact token counts and cost per endpoint, day and model
+"""
+
+import argparse
+import heapq
+import json
+import time
+from collections import defaultdict
+
+import pandas as pd
+
+# USD per 1K tokens; cached_input is the prompt-cache read rate
+PRICING = {
+    "claude-3-5-sonnet": {"input": 0.003, "output": 0.015, "cached_input": 0.0003},
+    "claude-3-5-haiku": {"input": 0.0008, "output": 0.004, "cached_input": 0.00008},
+    "claude-3-opus": {"input": 0.015, "output": 0.075, "cached_input": 0.0015},
+}
+DEFAULT_MODEL = "claude-3-5-sonnet"
+USAGE_BATCH_ROWS = 250_000
+TOP_ENDPOINTS = 3
+# Rollup key for records without an endpoint / timestamp
+UNKNOWN = "unknown"
+
+USAGE_COLUMNS = ['timestamp', 'endpoint', 'model', 'input_tokens', 'output_tokens', 'cached_tokens']
+TOKEN_COLUMNS = ['input_tokens', 'output_tokens', 'cached_tokens']
+# Per-group counters: requests, then TOKEN_COLUMNS
+REQUESTS, INPUT, OUTPUT, CACHED = range(4)
+
+
+def load_pricing(path=None):
+    """Pricing table {model: {"input", "output", "cached_input"}} (USD per 1K tokens)"""
+    if path is None:
+        return PRICING
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def request_cost(pricing, model, input_tokens, output_tokens, cached_tokens=0):
+    """Cost of token counts under one model's prices; works on scalars or arrays"""
+    price = pricing[model]
+    return (input_tokens * price['input'] + output_tokens * price['output']
+            + cached_tokens * price.get('cached_input', price['input'])) / 1000
+
+
+def _json_batches(path, batch_rows):
+    """JSONL record batches: pyarrow's streaming reader when installed (much faster), else pandas"""
+    try:
+        import pyarrow.json as pa_json
+    except ImportError:
+        yield from pd.read_json(path, lines=True, chunksize=batch_rows, dtype=False)
+        return
+    import pyarrow as pa
+    # ~200 bytes per usage record
+    options = pa_json.ReadOptions(block_size=max(batch_rows * 200, 1 << 20))
+    # The streaming reader fixes its schema on the first block, so pin the columns
+    # that may be absent there; timestamp (epoch number or ISO string) is inferred
+    schema = pa.schema([('endpoint', pa.string()), ('model', pa.string())]
+                       + [(column, pa.int64()) for column in TOKEN_COLUMNS])
+    parse = pa_json.ParseOptions(explicit_schema=schema, unexpected_field_behavior='infer')
+    source = pa.input_stream(path, compression='gzip') if path.endswith('.gz') else path
+    for batch in pa_json.open_json(source, read_options=options, parse_options=parse):
+        yield batch.to_pandas()
+
+
+def iter_usage_batches(path, batch_rows=USAGE_BATCH_ROWS):
+    """DataFrames of usage records: endpoint, model, day and the token columns.
+
+    A missing endpoint becomes UNKNOWN and a missing model DEFAULT_MODEL, so
+    such records are still counted and priced; records without a timestamp
+    (or files without the column) fall under the UNKNOWN day.
+    """
+    if path.endswith(('.parquet', '.csv')):
+        from ge_streaming import iter_chunks, source_columns
+        present = set(source_columns(path))
+        batches = iter_chunks(path, columns=[c for c in USAGE_COLUMNS if c in present], chunk_rows=batch_rows)
+    else:
+        batches = _json_batches(path, batch_rows)
+    for batch in batches:
+        for column in TOKEN_COLUMNS:
+            batch[column] = batch[column].fillna(0) if column in batch else 0
+        batch['endpoint'] = batch['endpoint'].fillna(UNKNOWN) if 'endpoint' in batch else UNKNOWN
+        batch['model'] = batch['model'].fillna(DEFAULT_MODEL) if 'model' in batch else DEFAULT_MODEL
+        if 'timestamp' in batch:
+            ts = batch['timestamp']
+            ts = pd.to_datetime(ts, unit='s', utc=True) if pd.api.types.is_numeric_dtype(ts) else pd.to_datetime(ts, utc=True)
+            batch['day'] = ts.dt.floor('D')
+        else:
+            batch['day'] = pd.NaT
+        yield batch
+
+
+class CostLedger:
+    """Integer token counters per (endpoint, model, day).
+
+    Costs are derived from the exact counters only when a rollup is read, so the
+    result does not depend on batch boundaries or the order records arrive in.
+    Memory grows with endpoints x models x days, never with request count.
+    """
+
+    def __init__(self, pricing=None):
+        self.pricing = pricing or PRICING
+        self.groups = defaultdict(lambda: [0, 0, 0, 0])
+
+    def add_batch(self, batch):
+        """Fold one usage DataFrame in with a single groupby (null keys are kept, not dropped)"""
+        batch = batch.assign(requests=1)
+        sums = batch.groupby(['endpoint', 'model', 'day'], sort=False, dropna=False)[['requests'] + TOKEN_COLUMNS].sum()
+        for key, (requests, input_tokens, output_tokens, cached) in zip(sums.index, sums.to_numpy(dtype='int64')):
+            counters = self.groups[key]
+            counters[REQUESTS] += int(requests)
+            counters[INPUT] += int(input_tokens)
+            counters[OUTPUT] += int(output_tokens)
+            counters[CACHED] += int(cached)
+
+    def add_records(self, path, batch_rows=USAGE_BATCH_ROWS):
+        for batch in iter_usage_batches(path, batch_rows):
+            self.add_batch(batch)
+        return self
+
+    def merge(self, other):
+        for key, counters in other.groups.items():
+            mine = self.groups[key]
+            for i, value in enumerate(counters):
+                mine[i] += value
+        return self
+
+    def _check_models(self):
+        missing = sorted({model for _, model, _ in self.groups} - set(self.pricing))
+        if missing:
+            raise ValueError(f"no price for model(s) {', '.join(missing)}; add them to the pricing table")
+
+    def rollup(self, by):
+        """{key: {"requests", "input_tokens", "output_tokens", "cached_tokens", "cost"}}
+        grouped by 'endpoint', 'model' or 'day'"""
+        self._check_models()
+        position = {'endpoint': 0, 'model': 1, 'day': 2}[by]
+        totals = defaultdict(lambda: {"requests": 0, "input_tokens": 0, "output_tokens": 0,
+                                      "cached_tokens": 0, "cost": 0.0})
+        for key, (requests, input_tokens, output_tokens, cached) in self.groups.items():
+            name = key[position]
+            if by == 'day':
+                name = UNKNOWN if pd.isna(name) else name.strftime('%Y-%m-%d')
+            row = totals[name]
+            row["requests"] += requests
+            row["input_tokens"] += input_tokens
+            row["output_tokens"] += output_tokens
+            row["cached_tokens"] += cached
+            row["cost"] += request_cost(self.pricing, key[1], input_tokens, output_tokens, cached)
+        return dict(totals)
+
+    def top_endpoints(self, k=TOP_ENDPOINTS):
+        """The k most expensive endpoints, costliest first"""
+        return heapq.nlargest(k, self.rollup('endpoint').items(), key=lambda item: item[1]["cost"])
+
+    def summary(self, k=TOP_ENDPOINTS):
+        """cost_metrics.json fields"""
+        by_model = self.rollup('model')
+        requests = sum(row["requests"] for row in by_model.values())
+        if not requests:
+            raise ValueError("no usage records")
+        input_tokens = sum(row["input_tokens"] + row["cached_tokens"] for row in by_model.values())
+        output_tokens = sum(row["output_tokens"] for row in by_model.values())
+        cost = sum(row["cost"] for row in by_model.values())
+        by_day = self.rollup('day')
+        main_model = max(by_model, key=lambda m: by_model[m]["requests"])
+        return {
+            "avg_input_tokens": round(input_tokens / requests),
+            "avg_output_tokens": round(output_tokens / requests),
+            "avg_total_tokens": round((input_tokens + output_tokens) / requests),
+            "cost_per_request": round(cost / requests, 4),
+            "monthly_requests": requests,
+            "monthly_cost": round(cost, 2),
+            "top_endpoints": [
+                {"name": name, "requests": row["requests"],
+                 "avg_tokens": round((row["input_tokens"] + row["cached_tokens"] + row["output_tokens"]) / row["requests"]),
+                 "cost": round(row["cost"], 4)}
+                for name, row in self.top_endpoints(k)
+            ],
+            "pricing_model": main_model if len(by_model) == 1 else f"{main_model} (+{len(by_model) - 1} more)",
+            "input_cost_per_1k": self.pricing[main_model]["input"],
+            "output_cost_per_1k": self.pricing[main_model]["output"],
+            "cached_tokens": sum(row["cached_tokens"] for row in by_model.values()),
+            "days": sum(1 for day in by_day if day != UNKNOWN),
+            "per_model": {model: {"requests": row["requests"], "cost": round(row["cost"], 4)}
+                          for model, row in sorted(by_model.items())},
+            "per_day": {day: {"requests": row["requests"], "cost": round(row["cost"], 4)}
+                        for day, row in sorted(by_day.items())},
+        }
+
+
+def cost_ledger(paths, pricing=None, batch_rows=USAGE_BATCH_ROWS):
+    """One CostLedger over every usage file in `paths`"""
+    ledger = CostLedger(pricing)
+    for path in paths:
+        ledger.add_records(path, batch_rows)
+    return ledger
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Price usage logs and roll up cost per endpoint / day / model")
+    parser.add_argument("paths", nargs='+', help="usage records: .jsonl / .jsonl.gz / .parquet / .csv")
+    parser.add_argument("--pricing", help="pricing table JSON {model: {input, output, cached_input}} per 1K tokens")
+    parser.add_argument("--by", choices=["endpoint", "model", "day"], default="endpoint")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    ledger = cost_ledger(args.paths, load_pricing(args.pricing))
+    rows = heapq.nlargest(args.top, ledger.rollup(args.by).items(), key=lambda item: item[1]["cost"])
+    print(f"💰 Cost by {args.by} ({time.perf_counter() - start:.2f}s)")
+    for name, row in rows:
+        print(f"   {name:<32} ${row['cost']:>12,.2f}  {row['requests']:>12,} requests")
+    return 0
+
+if __name__ == '__main__':
+    main()
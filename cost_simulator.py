@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+What-If Cost Simulator
+Replays a usage log under many routing / prompt-cache / output-cap scenarios
+at once as a (scenarios x request classes) NumPy matrix and reports the cost vs
+latency / quality Pareto front
+"""
+
+import argparse
+import itertools
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from cost_engine import PRICING, iter_usage_batches, load_pricing
+
+EVIDENCE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Latency and quality of each model relative to the others; the measured
+# latency_metrics.json / hallucination_metrics.json anchor the logged traffic
+MODEL_PROFILES = {
+    "claude-3-5-sonnet": {"latency": 1.0, "quality": 1.0},
+    "claude-3-5-haiku": {"latency": 0.5, "quality": 0.93},
+    "claude-3-opus": {"latency": 2.2, "quality": 1.03},
+}
+# Share of a request's latency spent on the prompt (the rest scales with output tokens)
+PREFILL_SHARE = 0.3
+# Prompt time saved on cached tokens
+CACHE_PREFILL_SAVING = 0.8
+# Quality lost on a response cut short by an output cap
+TRUNCATION_PENALTY = 0.5
+
+CACHE_HIT_RATES = [None, 0.0, 0.25, 0.5, 0.75]
+OUTPUT_CAPS = [None, 2048, 1024, 512]
+
+
+def _codes(values, vocabulary):
+    """Integer codes of a string column, stable across batches via `vocabulary`.
+
+    Nulls get a code of their own (vocabulary key None) rather than factorize's
+    -1, which would index the last class.
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    mapping = np.array([vocabulary.setdefault(None if pd.isna(u) else u, len(vocabulary)) for u in uniques],
+                       dtype=np.int64)
+    return mapping[codes]
+
+
+class UsageProfile:
+    """Per-class sums of a usage log, where a class is (endpoint, logged model).
+
+    Every scenario term is linear in per-request quantities once the output cap
+    is fixed, so summing them per class (for each cap in `caps`) prices any
+    scenario exactly as summing over the individual requests would. Built in
+    one streaming pass; memory is classes x caps, not requests.
+    """
+
+    def __init__(self, caps=OUTPUT_CAPS):
+        # Uncapped output always included: it is the logged traffic's baseline
+        self.caps = list(dict.fromkeys([None] + list(caps)))
+        self.endpoints, self.models, self.class_ids = {}, {}, {}
+        self.scale = 1.0
+        n_caps = len(self.caps)
+        self.sums = {"requests": np.zeros(0), "prompt": np.zeros(0), "cached": np.zeros(0), "hit": np.zeros(0),
+                     "output": np.zeros((n_caps, 0)), "output_share": np.zeros((n_caps, 0)),
+                     "cut": np.zeros((n_caps, 0))}
+
+    def _grow(self):
+        width = len(self.class_ids) - len(self.sums["requests"])
+        if width > 0:
+            for name, values in self.sums.items():
+                self.sums[name] = np.concatenate([values, np.zeros(values.shape[:-1] + (width,))], axis=-1)
+
+    def add_batch(self, batch):
+        endpoint = _codes(batch['endpoint'], self.endpoints)
+        model = _codes(batch['model'], self.models)
+        pairs, uniques = pd.factorize(endpoint * (1 << 32) + model)
+        mapping = np.array([self.class_ids.setdefault((int(u) >> 32, int(u) & 0xFFFFFFFF), len(self.class_ids))
+                            for u in uniques], dtype=np.int64)
+        cls = mapping[pairs]
+        self._grow()
+        n_classes = len(self.class_ids)
+        output = batch['output_tokens'].to_numpy(np.float64)
+        cached = batch['cached_tokens'].to_numpy(np.float64)
+        prompt = batch['input_tokens'].to_numpy(np.float64) + cached
+        count = lambda weights=None: np.bincount(cls, weights=weights, minlength=n_classes)
+        sums = self.sums
+        sums["requests"] += count()
+        sums["prompt"] += count(prompt)
+        sums["cached"] += count(cached)
+        sums["hit"] += count(cached / np.maximum(prompt, 1))
+        for k, cap in enumerate(self.caps):
+            capped = output if cap is None else np.minimum(output, cap)
+            sums["output"][k] += count(capped)
+            sums["output_share"][k] += count(capped / np.maximum(output, 1))
+            if cap is not None:
+                sums["cut"][k] += count((output > cap).astype(np.float64))
+
+    @property
+    def n_requests(self):
+        return float(self.sums["requests"].sum())
+
+    def classes(self):
+        """(endpoint name, model name) per class column"""
+        endpoints, models = list(self.endpoints), list(self.models)
+        return [(endpoints[e], models[m]) for e, m in self.class_ids]
+
+
+def load_usage(paths, caps=OUTPUT_CAPS, sample_rate=1.0, seed=0):
+    """UsageProfile of the logs in `paths`, optionally from a Bernoulli sample of rows"""
+    rng = np.random.default_rng(seed)
+    profile = UsageProfile(caps)
+    for path in paths:
+        for batch in iter_usage_batches(path):
+            if sample_rate < 1.0:
+                batch = batch[rng.random(len(batch)) < sample_rate]
+            profile.add_batch(batch)
+    profile.scale = 1.0 / sample_rate
+    return profile
+
+
+def scenario_grid(endpoints, models, cache_rates=CACHE_HIT_RATES, output_caps=OUTPUT_CAPS):
+    """Cartesian product of routing x cache hit rate x output cap.
+
+    Routing options: the logged models, every endpoint on one model, and each
+    endpoint moved to each model on its own. None keeps the logged value.
+    """
+    routings = [("logged", {})]
+    routings += [(f"all->{model}", {e: model for e in endpoints}) for model in models]
+    routings += [(f"{e}->{model}", {e: model}) for e in endpoints for model in models]
+    return [{"name": f"{name} cache={'logged' if rate is None else rate} cap={cap or 'none'}",
+             "routing": routing, "cache_hit_rate": rate, "output_cap": cap}
+            for (name, routing), rate, cap in itertools.product(routings, cache_rates, output_caps)]
+
+
+def simulate(profile, scenarios, pricing=None, profiles=None):
+    """Totals per scenario: cost, latency / quality relative to the logged traffic,
+    truncated requests.
+
+    Evaluated as (scenarios x request classes) arrays: each cell is the model a
+    scenario routes that class to, its cache hit rate and its capped output sums.
+    """
+    pricing = pricing or PRICING
+    profiles = profiles or MODEL_PROFILES
+    classes = profile.classes()
+    logged_names = [model for _, model in classes]
+    model_names = list(dict.fromkeys(logged_names + [m for sc in scenarios for m in sc.get("routing", {}).values()]))
+    missing = [m for m in model_names if m not in pricing or m not in profiles]
+    if missing:
+        raise ValueError(f"no price / profile for model(s) {', '.join(missing)}")
+    cap_index = {cap: k for k, cap in enumerate(profile.caps)}
+    unknown = {sc.get("output_cap") for sc in scenarios} - set(cap_index)
+    if unknown:
+        raise ValueError(f"output caps {sorted(unknown, key=str)} were not profiled; pass them to load_usage()")
+
+    index = {m: i for i, m in enumerate(model_names)}
+    price_in = np.array([pricing[m]["input"] for m in model_names]) / 1000
+    price_out = np.array([pricing[m]["output"] for m in model_names]) / 1000
+    price_cached = np.array([pricing[m].get("cached_input", pricing[m]["input"]) for m in model_names]) / 1000
+    latency_factor = np.array([profiles[m]["latency"] for m in model_names])
+    quality_factor = np.array([profiles[m]["quality"] for m in model_names])
+
+    # S x G model per cell: the scenario's route for the class's endpoint, else the logged model
+    logged = np.array([index[m] for m in logged_names], dtype=np.int64)
+    model = np.tile(logged, (len(scenarios), 1))
+    for s, scenario in enumerate(scenarios):
+        for g, (endpoint, _) in enumerate(classes):
+            if endpoint in scenario.get("routing", {}):
+                model[s, g] = index[scenario["routing"][endpoint]]
+    rates = np.array([np.nan if sc.get("cache_hit_rate") is None else sc["cache_hit_rate"] for sc in scenarios])[:, None]
+    k = np.array([cap_index[sc.get("output_cap")] for sc in scenarios])
+
+    sums = profile.sums
+    requests, prompt = sums["requests"], sums["prompt"]
+    logged_rate = np.isnan(rates)
+    cached = np.where(logged_rate, sums["cached"], rates * prompt)         # cached prompt tokens
+    hits = np.where(logged_rate, sums["hit"], rates * requests)            # sum of per-request hit rates
+    output, share, cut = sums["output"][k], sums["output_share"][k], sums["cut"][k]
+
+    cost = ((prompt - cached) * price_in[model] + cached * price_cached[model] + output * price_out[model]).sum(axis=1)
+    latency = (latency_factor[model] * (PREFILL_SHARE * (requests - CACHE_PREFILL_SAVING * hits)
+                                        + (1 - PREFILL_SHARE) * share)).sum(axis=1)
+    quality = (quality_factor[model] * (requests - TRUNCATION_PENALTY * cut)).sum(axis=1)
+
+    baseline_latency = (latency_factor[logged] * (PREFILL_SHARE * (requests - CACHE_PREFILL_SAVING * sums["hit"])
+                                                  + (1 - PREFILL_SHARE) * sums["output_share"][cap_index[None]])).sum()
+    baseline_quality = (quality_factor[logged] * requests).sum()
+    n = profile.n_requests
+    return {"cost": cost * profile.scale, "requests": n * profile.scale,
+            "latency_ratio": latency / max(baseline_latency, 1e-12),
+            "quality_ratio": quality / max(baseline_quality, 1e-12),
+            "truncated_pct": 100.0 * cut.sum(axis=1) / max(n, 1)}
+
+
+def _load_metric(name, key, evidence_dir):
+    path = os.path.join(evidence_dir, f"{name}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f).get(key)
+
+
+def pareto_table(scenarios, totals, evidence_dir=EVIDENCE_DIR):
+    """One row per scenario, cheapest first, with estimated p95 latency and
+    faithfulness (scaled from the measured metrics files) and a Pareto flag"""
+    p95 = _load_metric("latency_metrics", "p95_latency_ms", evidence_dir)
+    faithfulness = _load_metric("hallucination_metrics", "avg_faithfulness", evidence_dir)
+    rows = []
+    for s, scenario in enumerate(scenarios):
+        rows.append({
+            "scenario": scenario["name"],
+            "cost": round(float(totals["cost"][s]), 2),
+            "cost_per_request": round(float(totals["cost"][s] / max(totals["requests"], 1)), 6),
+            "latency_ratio": round(float(totals["latency_ratio"][s]), 4),
+            "p95_latency_ms": round(p95 * float(totals["latency_ratio"][s]), 1) if p95 is not None else None,
+            "quality_ratio": round(float(totals["quality_ratio"][s]), 4),
+            "faithfulness": round(min(faithfulness * float(totals["quality_ratio"][s]), 1.0), 4)
+            if faithfulness is not None else None,
+            "truncated_pct": round(float(totals["truncated_pct"][s]), 2),
+        })
+    rows.sort(key=lambda r: (r["cost"], r["latency_ratio"], -r["quality_ratio"]))
+    # Sorted by cost, so a row is dominated only by a cheaper-or-equal row before it
+    front = []
+    for row in rows:
+        row["pareto"] = not any(f["latency_ratio"] <= row["latency_ratio"] and f["quality_ratio"] >= row["quality_ratio"]
+                                for f in front)
+        if row["pareto"]:
+            front.append(row)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Price a usage log under many what-if scenarios at once")
+    parser.add_argument("paths", nargs='+', help="usage records: .jsonl / .jsonl.gz / .parquet / .csv")
+    parser.add_argument("--pricing", help="pricing table JSON (default: cost_engine.PRICING)")
+    parser.add_argument("--scenarios", help="scenario list JSON [{name, routing, cache_hit_rate, output_cap}]"
+                                            " instead of the default grid")
+    parser.add_argument("--sample", type=float, default=1.0, help="replay this fraction of requests")
+    parser.add_argument("--evidence-dir", default=EVIDENCE_DIR)
+    parser.add_argument("--all", action="store_true", help="print every scenario, not just the Pareto front")
+    parser.add_argument("--out", help="write the full table as JSON")
+    args = parser.parse_args(argv)
+
+    pricing = load_pricing(args.pricing)
+    scenarios = None
+    if args.scenarios:
+        with open(args.scenarios, 'r') as f:
+            scenarios = json.load(f)
+    caps = [sc.get("output_cap") for sc in scenarios] if scenarios else OUTPUT_CAPS
+    start = time.perf_counter()
+    profile = load_usage(args.paths, caps, args.sample)
+    loaded = time.perf_counter()
+    if scenarios is None:
+        scenarios = scenario_grid(list(profile.endpoints), [m for m in pricing if m in MODEL_PROFILES])
+    table = pareto_table(scenarios, simulate(profile, scenarios, pricing), args.evidence_dir)
+    print(f"🎯 {len(scenarios)} scenarios x {profile.n_requests:,.0f} requests "
+          f"(load {loaded - start:.2f}s, simulate {time.perf_counter() - loaded:.2f}s)")
+    for row in table:
+        if args.all or row["pareto"]:
+            print(f"   {'⭐' if row['pareto'] else '  '} ${row['cost']:>12,.2f}  latency x{row['latency_ratio']:.2f}  "
+                  f"quality x{row['quality_ratio']:.3f}  {row['scenario']}")
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(table, f, indent=2)
+        print(f"✅ Saved to: {args.out}")
+    return 0
+
+if __name__ == '__main__':
+    main()
@@ -1,50 +1,48 @@
 #!/usr/bin/env python3
 """Count DQ rules/gates across churn, coffeeverse, cocktailverse. Run from kpi_scripts."""
+import argparse
 import os
-import re
+
+from py_analysis import PYTHON_ANALYZER
+from repo_scan import Analyzer, SCAN_CACHE_PATH, SCAN_WORKERS, scan
 
 BASE = os.path.join(os.path.dirname(__file__), "..")
 REPOS = ["churn-ml-pipeline", "coffeeverse", "cocktailverse"]
 
-def count_validators(path, pattern_func):
-    count = 0
-    for root, _, files in os.walk(path):
-        for f in files:
-            if not f.endswith(".py"):
-                continue
-            p = os.path.join(root, f)
-            try:
-                with open(p, "r") as fh:
-                    content = fh.read()
-                count += len(pattern_func(content))
-            except Exception:
-                pass
-    return count
+ANALYZERS = [
+    # Explicit validation: def validate_*, def check_*, raise ValidationError
+    PYTHON_ANALYZER,
+    # GE / dbt
+    Analyzer("ge_expectations", [".json"], lambda text: "expectation_type" in text),
+]
+
+def count_repo(path, cache_path=SCAN_CACHE_PATH, max_workers=SCAN_WORKERS):
+    """(validators + ValidationError raises, JSON files with GE expectations, scan stats) for one repo, in a single walk"""
+    results, stats = scan(path, ANALYZERS, cache_path, max_workers)
+    n = sum(r["validators"] + r["validation_raises"] for r in results["python"].values())
+    ge = sum(results["ge_expectations"].values())
+    return n, ge, stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Count DQ rules/gates across repos")
+    parser.add_argument("--base", default=BASE, help="directory holding the repos")
+    parser.add_argument("--repos", nargs='+', default=REPOS)
+    parser.add_argument("--cache", default=SCAN_CACHE_PATH, help="scan cache (SQLite)")
+    parser.add_argument("--workers", type=int, default=SCAN_WORKERS)
+    args = parser.parse_args(argv)
 
-def main():
     total = 0
-    for repo in REPOS:
-        path = os.path.join(BASE, repo)
+    for repo in args.repos:
+        path = os.path.join(args.base, repo)
         if not os.path.isdir(path):
             continue
-        # Explicit validation: def validate_*, def check_*, ValidationError
-        def patterns(c):
-            return re.findall(r"def\s+(validate_\w+|check_\w+)|raise\s+ValidationError|ValidationError\(", c)
-        n = count_validators(path, patterns)
-        # GE / dbt
-        ge = 0
-        for root, _, files in os.walk(path):
-            for f in files:
-                if f.endswith(".json"):
-                    try:
-                        with open(os.path.join(root, f), "r") as fh:
-                            if "expectation_type" in fh.read():
-                                ge += 1
-                    except Exception:
-                        pass
+        n, ge, stats = count_repo(path, args.cache, args.workers)
         repo_total = n + ge
         total += repo_total
         print(f"{repo}: validation_funcs/checks={n}, GE_expectations={ge} -> {repo_total}")
+        print(f"   {stats['files']} files, {stats['read']} read ({stats['same_content']} unchanged content), {stats['cached']} cached")
+        for error in stats["errors"]:
+            print(f"   ⏭️ skipped {error}")
     print(f"DQ_RULES={total}")
     return 0
 
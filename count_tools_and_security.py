@@ -1,40 +1,41 @@
 #!/usr/bin/env python3
 """Count unique tools and security-related patterns in ai-agent-job-intelligence-phase-2."""
+import argparse
 import os
-import re
+
+from py_analysis import PYTHON_ANALYZER
+from repo_scan import SCAN_CACHE_PATH, SCAN_WORKERS, scan
 
 BASE = os.path.join(os.path.dirname(__file__), "..")
 REPO = os.path.join(BASE, "ai-agent-job-intelligence-phase-2")
 
-def main():
+# Known from grep: get_resume_info, get_skills, match_jobs, get_shortlist, check_job_match, get_b_past_life_resume_info, check_b_past_life_job_match, get_northstar_info, list_projects, get_project, get_project_by_name, get_shared_assets, get_ai_agent_plan, search_projects
+MANUAL_TOOLS = {"get_resume_info", "get_skills", "match_jobs", "get_shortlist", "check_job_match", "get_b_past_life_resume_info", "check_b_past_life_job_match", "get_northstar_info", "list_projects", "get_project", "get_project_by_name", "get_shared_assets", "get_ai_agent_plan", "search_projects"}
+
+def count_tools_and_security(repo=REPO, cache_path=SCAN_CACHE_PATH, max_workers=SCAN_WORKERS):
+    """(tool names from tool_name dispatch branches, security control count, scan stats)"""
+    results, stats = scan(repo, [PYTHON_ANALYZER], cache_path, max_workers)
     tools = set()
     security = 0
-    for root, _, files in os.walk(REPO):
-        for f in files:
-            if not f.endswith(".py"):
-                continue
-            p = os.path.join(root, f)
-            try:
-                with open(p, "r") as fh:
-                    content = fh.read()
-                # Tool names: "get_resume_info", "match_jobs", etc. from tool_name == "..."
-                for m in re.findall(r'tool_name\s*==\s*["\']([^"\']+)["\']|elif\s+tool_name\s*==\s*["\']([^"\']+)["\']', content):
-                    tools.add(m[0] or m[1])
-                for m in re.findall(r'["\']([a-z_]+)["\'].*tool|tool.*["\']([a-z_]+)["\']', content):
-                    if m[0]: tools.add(m[0])
-                    if m[1]: tools.add(m[1])
-                # Security: get_secret, sanitize, redact, pii, env
-                security += len(re.findall(r"get_secret|sanitize|redact|pii|load_secrets_to_env|environ\.get|os\.environ", content, re.I))
-            except Exception:
-                pass
-    # Dedupe tool names from server_http patterns
-    tool_names = set()
-    for t in tools:
-        if t and len(t) > 3 and not t.startswith("_"):
-            tool_names.add(t)
-    # Known from grep: get_resume_info, get_skills, match_jobs, get_shortlist, check_job_match, get_b_past_life_resume_info, check_b_past_life_job_match, get_northstar_info, list_projects, get_project, get_project_by_name, get_shared_assets, get_ai_agent_plan, search_projects
-    manual = {"get_resume_info", "get_skills", "match_jobs", "get_shortlist", "check_job_match", "get_b_past_life_resume_info", "check_b_past_life_job_match", "get_northstar_info", "list_projects", "get_project", "get_project_by_name", "get_shared_assets", "get_ai_agent_plan", "search_projects"}
-    all_tools = tool_names | manual
+    for result in results["python"].values():
+        # Tool names: "get_resume_info", "match_jobs", etc. from tool_name == "..."
+        tools.update(result["tools"])
+        # Security: get_secret, sanitize, redact, pii, env
+        security += result["security"]
+    return tools, security, stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Count unique tools and security controls")
+    parser.add_argument("--repo", default=REPO)
+    parser.add_argument("--cache", default=SCAN_CACHE_PATH, help="scan cache (SQLite)")
+    parser.add_argument("--workers", type=int, default=SCAN_WORKERS)
+    args = parser.parse_args(argv)
+
+    tools, security, stats = count_tools_and_security(args.repo, args.cache, args.workers)
+    tool_names = {t for t in tools if len(t) > 3 and not t.startswith("_")}
+    all_tools = tool_names | MANUAL_TOOLS
+    for error in stats["errors"]:
+        print(f"⏭️ skipped {error}")
     print(f"TOOLS_UNIQUE={len(all_tools)}")
     print(f"SECURITY_CONTROLS={security}  # get_secret/sanitize/redact/pii/env refs")
     return 0
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Dashboard Renderer
+Compiled, cached HTML templates streamed to a buffered writer, with one
+shared stylesheet (dashboard.css) linked by every dashboard page
+"""
+
+import html
+import os
+import re
+import shutil
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+
+EVIDENCE_DIR = os.path.dirname(os.path.abspath(__file__))
+STYLESHEET = 'dashboard.css'
+STYLESHEET_PATH = os.path.join(EVIDENCE_DIR, STYLESHEET)
+WRITE_BUFFER_BYTES = 1 << 20
+
+# {{name}} is HTML-escaped, {{{name}}} is inserted as-is (pre-rendered markup)
+_PLACEHOLDER = re.compile(r'\{\{\{\s*(\w+)\s*\}\}\}|\{\{\s*(\w+)\s*\}\}')
+
+
+class Template:
+    """Template source split once into literal text and (name, escape) fields"""
+
+    def __init__(self, source):
+        self.parts = []
+        pos = 0
+        for match in _PLACEHOLDER.finditer(source):
+            self.parts.append(source[pos:match.start()])
+            raw, escaped = match.groups()
+            self.parts.append((raw or escaped, escaped is not None))
+            pos = match.end()
+        self.parts.append(source[pos:])
+
+    def render(self, out, values):
+        """Write the template with `values` to a file-like `out`"""
+        write = out.write
+        for part in self.parts:
+            if isinstance(part, str):
+                write(part)
+            else:
+                name, escape = part
+                value = str(values[name])
+                write(html.escape(value, quote=True) if escape else value)
+
+    def __call__(self, **values):
+        pieces = []
+        self.render(_Collector(pieces), values)
+        return ''.join(pieces)
+
+
+class _Collector:
+    def __init__(self, pieces):
+        self.write = pieces.append
+
+
+@lru_cache(maxsize=None)
+def compile_template(source):
+    """Template for `source`, compiled once per process"""
+    return Template(source)
+
+
+PAGE_START = compile_template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{{title}}</title>
+    <link rel="stylesheet" href="{{stylesheet}}">
+</head>
+<body class="theme-{{theme}}">
+    <div class="header">
+        <h1>{{heading}}</h1>
+        <p>{{subtitle}}</p>
+        <p class="stamp">{{stamp_label}}: {{stamp}}</p>
+    </div>
+""")
+
+STAT_CARD = compile_template("""        <div class="stat-card {{variant}}">
+            <h3>{{value}}</h3>
+            <p>{{label}}</p>
+        </div>
+""")
+
+FOOTER = compile_template("""
+    <div class="footer">
+        <p>{{text}}</p>
+        <p><strong>Evidence:</strong> {{evidence}}</p>
+    </div>
+""")
+
+PAGE_END = """</body>
+</html>
+"""
+
+
+def ensure_stylesheet(directory):
+    """Put dashboard.css next to pages in `directory` unless an identical copy is there"""
+    target = os.path.join(directory, STYLESHEET)
+    if os.path.abspath(target) == STYLESHEET_PATH:
+        return target
+    if os.path.exists(target) and os.path.getsize(target) == os.path.getsize(STYLESHEET_PATH):
+        with open(target, 'rb') as a, open(STYLESHEET_PATH, 'rb') as b:
+            if a.read() == b.read():
+                return target
+    # Copy then rename, so concurrent page builds never see a half-written file
+    tmp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+    shutil.copyfile(STYLESHEET_PATH, tmp)
+    os.replace(tmp, target)
+    return target
+
+
+class Page:
+    """Buffered writer for one dashboard page"""
+
+    def __init__(self, out):
+        self.out = out
+
+    def write(self, text):
+        self.out.write(text)
+
+    def render(self, template, **values):
+        template.render(self.out, values)
+
+    def render_rows(self, template, rows):
+        """One template instance per dict in `rows`, streamed"""
+        for row in rows:
+            template.render(self.out, row)
+
+    def stat_cards(self, cards):
+        """cards: (variant, value, label) tuples"""
+        self.out.write('    <div class="stats">\n')
+        self.render_rows(STAT_CARD, ({"variant": v, "value": value, "label": label} for v, value, label in cards))
+        self.out.write('    </div>\n')
+
+    def footer(self, text, evidence):
+        FOOTER.render(self.out, {"text": text, "evidence": evidence})
+
+
+@contextmanager
+def open_page(path, title, theme, heading, subtitle, stamp_label='Generated'):
+    """Stream a page to `path`: header on entry, closing tags on exit.
+
+    Written to a temp file and renamed, so readers never see a partial page.
+    """
+    ensure_stylesheet(os.path.dirname(os.path.abspath(path)))
+    tmp = path + '.tmp'
+    try:
+        with open(tmp, 'w', encoding='utf-8', buffering=WRITE_BUFFER_BYTES) as f:
+            PAGE_START.render(f, {
+                "title": title, "stylesheet": STYLESHEET, "theme": theme, "heading": heading,
+                "subtitle": subtitle, "stamp_label": stamp_label,
+                "stamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            })
+            yield Page(f)
+            f.write(PAGE_END)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
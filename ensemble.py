@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Multi-Seed Ensemble Runs
+Runs K independent seeded replicas of each KPI simulation across a process
+pool and writes mean / CI / bootstrap intervals to <evidence>_ensemble.json
+files beside the generators' outputs (the Phoenix dashboard shows them)
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from simulation_engine import simulate_tasks, simulate_faithfulness, simulate_latency
+
+EVIDENCE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _success_rate(n, seed):
+    return simulate_tasks(n, seed=seed).success_rate
+
+
+def _hallucination_rate(n, seed):
+    return simulate_faithfulness(n, seed=seed)["hallucinations"] / n
+
+
+def _p95_latency_ms(n, seed):
+    return simulate_latency(n, seed=seed).percentile(95)
+
+
+# metric -> (replica function, interval file, default samples per replica). The
+# generators own task_success.json etc. and rewrite them on every run, so the
+# intervals live in their own files rather than as a key merged into those
+METRICS = {
+    "success_rate": (_success_rate, "task_success_ensemble.json", 100),
+    "hallucination_rate": (_hallucination_rate, "hallucination_metrics_ensemble.json", 100),
+    "p95_latency_ms": (_p95_latency_ms, "latency_metrics_ensemble.json", 1000),
+}
+# Evidence stems of the interval files (see build_dashboards.Evidence)
+ENSEMBLE_FILES = [filename[:-len('.json')] for _, filename, _ in METRICS.values()]
+
+
+def _run_replica(args):
+    metric, n, seed = args
+    return METRICS[metric][0](n, seed)
+
+
+def run_ensemble(metric, n, replicas, seed=None, max_workers=None):
+    """Run `replicas` independent draws of `metric`, one child seed each"""
+    children = np.random.SeedSequence(seed).spawn(replicas)
+    jobs = [(metric, n, child) for child in children]
+    max_workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, replicas // (max_workers * 4))
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return np.fromiter(pool.map(_run_replica, jobs, chunksize=chunksize),
+                           dtype=float, count=replicas)
+
+
+def summarize(values, ci=0.95, n_boot=2000, seed=None):
+    """Mean, spread and intervals across replica values.
+
+    The replica interval is the empirical (lo, hi) quantile of the replicas;
+    the bootstrap interval is for the ensemble mean, drawn as one
+    (n_boot x K) resample index matrix.
+    """
+    values = np.asarray(values, dtype=float)
+    alpha = (1 - ci) / 2
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, values.size, size=(n_boot, values.size))
+    boot_means = values[idx].mean(axis=1)
+    return {
+        "replicas": int(values.size),
+        "mean": round(float(values.mean()), 6),
+        "std": round(float(values.std(ddof=1)) if values.size > 1 else 0.0, 6),
+        "ci_level": ci,
+        "ci_low": round(float(np.quantile(values, alpha)), 6),
+        "ci_high": round(float(np.quantile(values, 1 - alpha)), 6),
+        "bootstrap_mean_ci_low": round(float(np.quantile(boot_means, alpha)), 6),
+        "bootstrap_mean_ci_high": round(float(np.quantile(boot_means, 1 - alpha)), 6),
+    }
+
+
+def write_intervals(path, summary):
+    """Write one metric's ensemble summary to its own interval file"""
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(summary, f, indent=2)
+    os.replace(tmp, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Multi-seed ensemble for KPI generators")
+    parser.add_argument("--metric", choices=["all", *METRICS], default="all")
+    parser.add_argument("--replicas", type=int, default=1000)
+    parser.add_argument("--n", type=int, default=None, help="samples per replica (default: generator default)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=None, help="default: all cores")
+    parser.add_argument("--ci", type=float, default=0.95)
+    parser.add_argument("--out-dir", default=EVIDENCE_DIR)
+    args = parser.parse_args(argv)
+
+    names = list(METRICS) if args.metric == "all" else [args.metric]
+    print(f"🎯 Running ensembles ({args.replicas} replicas, {args.workers or os.cpu_count()} workers)...")
+    for name in names:
+        _, filename, default_n = METRICS[name]
+        n = args.n or default_n
+        values = run_ensemble(name, n, args.replicas, seed=args.seed, max_workers=args.workers)
+        summary = summarize(values, ci=args.ci, seed=args.seed)
+        summary.update({"metric": name, "n_per_replica": n, "seed": args.seed})
+        path = os.path.join(args.out_dir, filename)
+        write_intervals(path, summary)
+        print(f"   {name}: mean={summary['mean']}  "
+              f"{args.ci:.0%} CI=[{summary['ci_low']}, {summary['ci_high']}]  -> {filename}")
+    return 0
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Great Expectations Rule Engine
+Executes the expectations in ge_rules.json against a pandas/NumPy table
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+
+from ge_profile import TableProfile, DRIFT_RULES, QUANTILE_RULES, rule_quantile
+from ge_sketches import QUANTILE_RANK_ERROR
+from ge_history import record_results
+from ge_drift import (DRIFT_BINS, KS_BOOTSTRAP_SAMPLES, build_reference, load_reference,
+                      kl_divergence, psi, bootstrap_ks)
+
+EVIDENCE_DIR = os.path.dirname(os.path.abspath(__file__))
+RULES_PATH = os.path.join(EVIDENCE_DIR, 'ge_rules.json')
+
+# Rows per fused scan chunk
+CHUNK_ROWS = 1_000_000
+
+
+def load_rules(path=RULES_PATH):
+    """Load the rule descriptors written by generate_ge_rules.py"""
+    with open(path, 'r') as f:
+        return json.load(f)['rules']
+
+
+def _result(rule, success, observed_value, element_count=None, unexpected_count=None, details=None):
+    result = {
+        "rule_id": rule['id'],
+        "expectation": rule['type'],
+        "column": rule.get('column', ', '.join(rule['columns']) if isinstance(rule.get('columns'), list) else 'N/A'),
+        "success": None if success is None else bool(success),
+        "observed_value": observed_value,
+        "element_count": element_count,
+        "unexpected_count": unexpected_count,
+        "unexpected_percent": None,
+    }
+    if element_count and unexpected_count is not None:
+        result["unexpected_percent"] = round(100.0 * unexpected_count / element_count, 4)
+    if details:
+        result["details"] = details
+    return result
+
+
+def _missing(rule, column):
+    return _result(rule, False, None, details=f"column '{column}' not found")
+
+
+def _to_py(value):
+    """numpy scalars -> plain Python for JSON"""
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _between(value, rule):
+    lo, hi = rule.get('min'), rule.get('max')
+    return (lo is None or value >= lo) and (hi is None or value <= hi)
+
+
+def _column(rule, table):
+    """Profile for the rule's column, or None if the table lacks it"""
+    profile = table.columns.get(rule['column'])
+    return profile if profile is not None and profile.present else None
+
+
+# --- Schema ----------------------------------------------------------------
+
+def _column_exists(rule, table, ctx):
+    present = rule['column'] in (table.column_names or [])
+    return _result(rule, present, present)
+
+
+def _columns_match_ordered_list(rule, table, ctx):
+    expected = rule['columns']
+    actual = list(table.column_names or [])
+    if expected == 'all':
+        # "all": every column the rule set references must be present
+        missing = [c for c in ctx['referenced_columns'] if c not in actual]
+        return _result(rule, not missing, actual, details={"missing": missing} if missing else None)
+    return _result(rule, actual == list(expected), actual)
+
+
+_DTYPE_CHECKS = {
+    "int": ptypes.is_integer_dtype,
+    "float": ptypes.is_float_dtype,
+    "datetime": ptypes.is_datetime64_any_dtype,
+    "bool": ptypes.is_bool_dtype,
+    "str": lambda d: ptypes.is_string_dtype(d) or ptypes.is_object_dtype(d),
+}
+
+
+def _of_type(rule, table, ctx):
+    profile = _column(rule, table)
+    if profile is None:
+        return _missing(rule, rule['column'])
+    return _result(rule, _DTYPE_CHECKS[rule['dtype']](profile.dtype), str(profile.dtype))
+
+
+def _row_count_between(rule, table, ctx):
+    return _result(rule, _between(table.row_count, rule), table.row_count)
+
+
+# --- Nulls / ranges --------------------------------------------------------
+
+def _not_null(rule, table, ctx):
+    profile = _column(rule, table)
+    if profile is None:
+        return _missing(rule, rule['column'])
+    return _result(rule, profile.nulls == 0, profile.nulls, profile.count, profile.nulls)
+
+
+def _values_between(rule, table, ctx):
+    profile = _column(rule, table)
+    if profile is None:
+        return _missing(rule, rule['column'])
+    unexpected = profile.ranges[rule['id']]
+    return _result(rule, unexpected == 0, unexpected, profile.non_null, unexpected)
+
+
+# --- Uniqueness ------------------------------------------------------------
+
+def _unique(rule, table, ctx):
+    profile = _column(rule, table)
+    if profile is None:
+        return _missing(rule, rule['column'])
+    found = profile.duplicates.finalize()
+    unexpected = found['duplicated_rows']
+    return _result(rule, unexpected == 0, unexpected, profile.non_null, unexpected,
+                   details={"duplicate_keys": found['duplicate_keys']} if unexpected else None)
+
+
+def _compound_unique(rule, table, ctx):
+    missing = [c for c in rule['columns'] if c not in (table.column_names or [])]
+    if missing:
+        return _missing(rule, missing[0])
+    found = table.compound[rule['id']].finalize()
+    unexpected = found['duplicated_rows']
+    return _result(rule, unexpected == 0, unexpected, table.row_count, unexpected,
+                   details={"duplicate_keys": found['duplicate_keys']} if unexpected else None)
+
+
+def _unique_within_record(rule, table, ctx):
+    missing = [c for c in rule['columns'] if c not in (table.column_names or [])]
+    if missing:
+        return _missing(rule, missing[0])
+    unexpected = table.record_dupes.get(rule['id'], 0)
+    return _result(rule, unexpected == 0, unexpected, table.row_count, unexpected)
+
+
+def _proportion_unique(rule, table, ctx):
+    profile = _column(rule, table)
+    if profile is None:
+        return _missing(rule, rule['column'])
+    n = profile.non_null
+    if profile.duplicates is not None:
+        # The column is already checked exactly for duplicates; reuse that count
+        distinct, error = profile.duplicates.distinct, 0.0
+    else:
+        distinct, error = profile.distinct.estimate()
+    proportion = min(distinct / n, 1.0) if n else 0.0
+    details = {"method": "exact" if not error else "hyperloglog", "relative_error": round(error, 6)}
+    return _result(rule, _between(proportion, rule), round(proportion, 6), n, details=details)
+
+
+# --- Patterns --------------------------------------------------------------
+
+def _pattern(rule, table, ctx):
+    profile = _column(rule, table)
+    if profile is None:
+        return _missing(rule, rule['column'])
+    unexpected = profile.patterns[rule['id']]
+    return _result(rule, unexpected == 0, unexpected, profile.non_null, unexpected)
+
+
+# --- Statistics ------------------------------------------------------------
+
+def _stat_between(stat):
+    def check(rule, table, ctx):
+        profile = _column(rule, table)
+        if profile is None:
+            return _missing(rule, rule['column'])
+        value = stat(profile, rule) if profile.non_null else None
+        if value is None:
+            return _result(rule, False, None, 0, details="no non-null numeric values")
+        return _result(rule, _between(value, rule), round(float(value), 6), profile.non_null)
+    return check
+
+
+def _quantile_between(rule, table, ctx):
+    profile = _column(rule, table)
+    if profile is None:
+        return _missing(rule, rule['column'])
+    q = rule_quantile(rule)
+    value = profile.quantile(q) if profile.non_null else None
+    if value is None:
+        return _result(rule, False, None, 0, details="no non-null numeric values")
+    state = profile.quantile_state
+    details = None
+    if state.rank_error:
+        lo, hi = state.quantile_bounds(q)
+        details = {"method": "kll", "rank_error": round(state.rank_error, 6),
+                   "value_bounds": [round(lo, 6), round(hi, 6)]}
+    return _result(rule, _between(value, rule), round(float(value), 6), profile.non_null, details=details)
+
+
+def approximate(rules, rank_error=QUANTILE_RANK_ERROR, drift_bins=None):
+    """Copy of rules in approximate statistical mode: median/quantile rules use a
+    KLL sketch at `rank_error`, drift rules use `drift_bins` bins (either may be None)"""
+    approx = []
+    for rule in rules:
+        rule = dict(rule)
+        if rule['type'] in QUANTILE_RULES and rank_error:
+            rule['rank_error'] = rank_error
+        elif rule['type'] in DRIFT_RULES and drift_bins:
+            rule['bins'] = drift_bins
+        approx.append(rule)
+    return approx
+
+
+def drift_bins_by_column(rules):
+    """{column: bins} for drift rules; a rule's `bins` overrides DRIFT_BINS
+    (fewer bins = smaller reference profile, looser KS error bound)"""
+    bins = {}
+    for rule in rules:
+        if rule['type'] in DRIFT_RULES:
+            bins.setdefault(rule['column'], rule.get('bins', DRIFT_BINS))
+    return bins
+
+
+def reference_histograms(reference, rules):
+    """{column: (edges, counts)} for every drift rule column, from a reference
+    table or an already binned profile (ge_drift.load_reference)"""
+    wanted = drift_bins_by_column(rules)
+    if isinstance(reference, dict):
+        return {col: hist for col, hist in reference.items() if col in wanted}
+    return build_reference(reference, wanted)
+
+
+def _drift_inputs(rule, table, ctx):
+    profile = _column(rule, table)
+    reference = ctx['reference'].get(rule['column'])
+    if profile is None or reference is None or profile.histogram is None:
+        return profile, None, None
+    return profile, reference[1], profile.histogram
+
+
+def _divergence_below(measure):
+    def check(rule, table, ctx):
+        profile, ref_counts, counts = _drift_inputs(rule, table, ctx)
+        if profile is None:
+            return _missing(rule, rule['column'])
+        if ref_counts is None:
+            return _result(rule, None, None, details="no reference distribution")
+        if not counts.sum():
+            return _result(rule, False, None, 0, details="no non-null numeric values")
+        value = measure(counts, ref_counts)
+        # Binning can only merge mass, so binned KL / PSI understate the continuous value
+        return _result(rule, value < rule['threshold'], round(value, 6), profile.non_null,
+                       details={"method": "histogram", "bins": len(counts)})
+    return check
+
+
+def _bootstrapped_ks(rule, table, ctx):
+    profile, ref_counts, counts = _drift_inputs(rule, table, ctx)
+    if profile is None:
+        return _missing(rule, rule['column'])
+    if ref_counts is None:
+        return _result(rule, None, None, details="no reference distribution")
+    if not counts.sum():
+        return _result(rule, False, None, 0, details="no non-null numeric values")
+    ks = bootstrap_ks(counts, ref_counts, rule.get('bootstrap_samples', KS_BOOTSTRAP_SAMPLES), ctx.get('seed'))
+    return _result(rule, ks['p_value'] > rule['p_value'], round(ks['p_value'], 6), int(counts.sum()),
+                   details={"ks_statistic": round(ks['ks_statistic'], 6), "ks_error": round(ks['ks_error'], 6),
+                            "p_value_error": round(ks['p_value_error'], 6), "bins": len(counts)})
+
+
+EXPECTATIONS = {
+    "expect_column_to_exist": _column_exists,
+    "expect_table_columns_to_match_ordered_list": _columns_match_ordered_list,
+    "expect_column_values_to_be_of_type": _of_type,
+    "expect_table_row_count_to_be_between": _row_count_between,
+    "expect_column_values_to_not_be_null": _not_null,
+    "expect_column_values_to_be_between": _values_between,
+    "expect_column_values_to_be_unique": _unique,
+    "expect_compound_columns_to_be_unique": _compound_unique,
+    "expect_select_column_values_to_be_unique_within_record": _unique_within_record,
+    "expect_column_values_to_match_regex": _pattern,
+    "expect_column_values_to_be_in_set": _pattern,
+    "expect_column_mean_to_be_between": _stat_between(lambda p, r: p.mean if p.n else None),
+    "expect_column_stdev_to_be_between": _stat_between(lambda p, r: p.stdev if p.n else None),
+    "expect_column_median_to_be_between": _quantile_between,
+    "expect_column_quantile_values_to_be_between": _quantile_between,
+    "expect_column_proportion_of_unique_values_to_be_between": _proportion_unique,
+    "expect_column_kl_divergence_to_be_less_than": _divergence_below(kl_divergence),
+    "expect_column_psi_to_be_less_than": _divergence_below(psi),
+    "expect_column_bootstrapped_ks_test_p_value_to_be_greater_than": _bootstrapped_ks,
+}
+
+
+def referenced_columns(rules):
+    """Columns named by the rule set, in first-reference order"""
+    seen = []
+    for rule in rules:
+        cols = [rule['column']] if 'column' in rule else rule.get('columns', [])
+        if isinstance(cols, list):
+            seen.extend(c for c in cols if c not in seen)
+    return seen
+
+
+def plan(rules, reference=None):
+    """Empty TableProfile for the rule set: rules are grouped by column so each
+    column is scanned once per chunk no matter how many rules touch it"""
+    histograms = reference_histograms(reference, rules) if reference is not None else {}
+    edges = {col: h[0] for col, h in histograms.items()}
+    return TableProfile(rules, drift_edges=edges), histograms
+
+
+def scan(df, profile, chunk_size=CHUNK_ROWS):
+    """Fold df into profile in row chunks"""
+    for start in range(0, max(len(df), 1), chunk_size):
+        profile.update(df.iloc[start:start + chunk_size])
+    return profile
+
+
+def evaluate(rules, table, reference_histograms=None, seed=None):
+    """Turn a finished TableProfile into one result dict per rule"""
+    ctx = {"reference": reference_histograms or {}, "seed": seed,
+           "referenced_columns": referenced_columns(rules)}
+    results = []
+    for rule in rules:
+        check = EXPECTATIONS.get(rule['type'])
+        if check is None:
+            results.append(_result(rule, None, None, details="unsupported expectation"))
+            continue
+        result = check(rule, table, ctx)
+        result["observed_value"] = _to_py(result["observed_value"])
+        results.append(result)
+    return results
+
+
+def validate(df, rules=None, reference=None, seed=None, chunk_size=CHUNK_ROWS):
+    """Run every rule against df; returns one result dict per rule"""
+    rules = load_rules() if rules is None else rules
+    table, histograms = plan(rules, reference)
+    scan(df, table, chunk_size)
+    return evaluate(rules, table, histograms, seed=seed)
+
+
+def status(result):
+    """Dashboard status for a result"""
+    if result['success'] is None:
+        return 'SKIPPED'
+    return 'PASSED' if result['success'] else 'FAILED'
+
+
+def read_table(path):
+    """Load a CSV or Parquet file into a DataFrame"""
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, parse_dates=['transaction_date'])
+
+
+def read_reference(path):
+    """Drift reference: a stored profile (.json, see ge_drift.py) or a table"""
+    if path.endswith('.json'):
+        return load_reference(path)
+    return read_table(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run ge_rules.json against a table")
+    parser.add_argument("data", help=".csv or .parquet table")
+    parser.add_argument("--rules", default=RULES_PATH)
+    parser.add_argument("--reference", help="reference table or ge_drift profile (.json) for drift rules")
+    parser.add_argument("--approx", type=float, metavar="RANK_ERROR", nargs='?', const=QUANTILE_RANK_ERROR,
+                        help="sketch median/quantile rules at this rank error instead of sorting")
+    parser.add_argument("--drift-bins", type=int, help=f"histogram bins for KL / KS rules (default {DRIFT_BINS})")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--history", help="append the run to this results history (see ge_history.py)")
+    args = parser.parse_args(argv)
+
+    rules = load_rules(args.rules)
+    if args.approx or args.drift_bins:
+        rules = approximate(rules, args.approx, args.drift_bins)
+    df = read_table(args.data)
+    reference = read_reference(args.reference) if args.reference else None
+
+    print(f"🎯 Validating {len(df)} rows against {len(rules)} rules...")
+    results = validate(df, rules, reference=reference)
+    for r in results:
+        print(f"   #{r['rule_id']:>2} {status(r):<7} {r['expectation']} [{r['column']}] observed={r['observed_value']}")
+
+    passed = sum(1 for r in results if r['success'])
+    print(f"\n✅ {passed}/{len(results)} rules passed")
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2, default=str)
+        print(f"   Saved to: {args.out}")
+    if args.history:
+        run_id = record_results(results, args.history, source=args.data)
+        print(f"   Recorded run {run_id} in: {args.history}")
+    return 0
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+GE Validation Results History
+Appends every validation run to an indexed SQLite store so dashboards can
+query pass-rate trends and per-rule series without re-running validation
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime, timezone
+
+EVIDENCE_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORY_PATH = os.path.join(EVIDENCE_DIR, 'ge_history.sqlite')
+
+BUCKET_SECONDS = {"hour": 3600, "day": 86400, "week": 7 * 86400}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id   INTEGER PRIMARY KEY,
+    run_ts   REAL NOT NULL,
+    source   TEXT,
+    rules    INTEGER NOT NULL,
+    passed   INTEGER NOT NULL,
+    failed   INTEGER NOT NULL,
+    skipped  INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_ts ON runs (run_ts);
+CREATE TABLE IF NOT EXISTS results (
+    run_id             INTEGER NOT NULL REFERENCES runs (run_id),
+    run_ts             REAL NOT NULL,
+    rule_id            INTEGER NOT NULL,
+    expectation        TEXT NOT NULL,
+    column_name        TEXT,
+    success            INTEGER,
+    observed           REAL,
+    observed_json      TEXT,
+    element_count      INTEGER,
+    unexpected_count   INTEGER,
+    unexpected_percent REAL,
+    details            TEXT
+);
+CREATE INDEX IF NOT EXISTS results_rule_ts ON results (rule_id, run_ts);
+CREATE INDEX IF NOT EXISTS results_run ON results (run_id);
+"""
+
+
+def _numeric(value):
+    """observed_value as a plottable number, or None"""
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (int, float)):
+        return float(value)
+    return None
+
+
+def _iso(ts):
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class ResultsHistory:
+    """Validation runs and their per-rule results in one SQLite file.
+
+    runs     one row per run with pass/fail/skip counts (trend queries read only this)
+    results  one row per rule per run, indexed on (rule_id, run_ts)
+    """
+
+    def __init__(self, path=HISTORY_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        # WAL lets dashboards read while a validation run appends
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- writing ------------------------------------------------------------
+
+    def record(self, results, run_ts=None, source=None):
+        """Append one run's result dicts (ge_engine.evaluate output); returns run_id"""
+        run_ts = time.time() if run_ts is None else run_ts
+        passed = sum(1 for r in results if r['success'] is True)
+        skipped = sum(1 for r in results if r['success'] is None)
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO runs (run_ts, source, rules, passed, failed, skipped) VALUES (?, ?, ?, ?, ?, ?)",
+                (run_ts, source, len(results), passed, len(results) - passed - skipped, skipped))
+            run_id = cur.lastrowid
+            self.conn.executemany(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, run_ts, r['rule_id'], r['expectation'], r['column'],
+                  None if r['success'] is None else int(r['success']),
+                  _numeric(r['observed_value']), json.dumps(r['observed_value'], default=str),
+                  r.get('element_count'), r.get('unexpected_count'), r.get('unexpected_percent'),
+                  json.dumps(r['details'], default=str) if r.get('details') is not None else None)
+                 for r in results])
+        return run_id
+
+    # -- queries ------------------------------------------------------------
+
+    def runs(self, since=None, until=None, limit=None):
+        """Run summaries, newest first"""
+        sql = "SELECT * FROM runs WHERE run_ts >= ? AND run_ts < ? ORDER BY run_ts DESC"
+        params = [since or 0, until or float('inf')]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def latest_run(self):
+        runs = self.runs(limit=1)
+        return runs[0] if runs else None
+
+    def results_for(self, run_id):
+        """One run's results in ge_engine.evaluate() shape"""
+        rows = self.conn.execute("SELECT * FROM results WHERE run_id = ? ORDER BY rule_id", (run_id,))
+        return [{
+            "rule_id": row['rule_id'],
+            "expectation": row['expectation'],
+            "column": row['column_name'],
+            "success": None if row['success'] is None else bool(row['success']),
+            "observed_value": json.loads(row['observed_json']),
+            "element_count": row['element_count'],
+            "unexpected_count": row['unexpected_count'],
+            "unexpected_percent": row['unexpected_percent'],
+            **({"details": json.loads(row['details'])} if row['details'] is not None else {}),
+        } for row in rows]
+
+    def pass_rate_trend(self, bucket='day', since=None, until=None):
+        """Pass rate per time bucket, oldest first, from run summaries only"""
+        width = BUCKET_SECONDS[bucket]
+        rows = self.conn.execute(
+            "SELECT CAST(run_ts / ? AS INTEGER) AS b, COUNT(*) AS runs, SUM(rules) AS rules, "
+            "SUM(passed) AS passed, SUM(failed) AS failed, SUM(skipped) AS skipped "
+            "FROM runs WHERE run_ts >= ? AND run_ts < ? GROUP BY b ORDER BY b",
+            (width, since or 0, until or float('inf')))
+        return [{"bucket_start": _iso(row['b'] * width), "runs": row['runs'], "passed": row['passed'],
+                 "failed": row['failed'], "skipped": row['skipped'],
+                 "pass_rate": round(100.0 * row['passed'] / row['rules'], 2) if row['rules'] else None}
+                for row in rows]
+
+    def rule_series(self, rule_id, since=None, until=None):
+        """(run_ts, observed, success) for one rule, oldest first; served by the (rule_id, run_ts) index"""
+        rows = self.conn.execute(
+            "SELECT run_ts, observed, success FROM results "
+            "WHERE rule_id = ? AND run_ts >= ? AND run_ts < ? ORDER BY run_ts",
+            (rule_id, since or 0, until or float('inf')))
+        return [(row['run_ts'], row['observed'], None if row['success'] is None else bool(row['success']))
+                for row in rows]
+
+    def rule_pass_rates(self, since=None, until=None):
+        """{rule_id: pass rate %} over runs in the window, skipped runs excluded"""
+        rows = self.conn.execute(
+            "SELECT rule_id, AVG(success) AS rate FROM results "
+            "WHERE run_ts >= ? AND run_ts < ? AND success IS NOT NULL GROUP BY rule_id",
+            (since or 0, until or float('inf')))
+        return {row['rule_id']: round(100.0 * row['rate'], 2) for row in rows}
+
+
+def record_results(results, path=HISTORY_PATH, source=None):
+    """Append one run to the history at `path`; returns run_id"""
+    with ResultsHistory(path) as history:
+        return history.record(results, source=source)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the GE validation results history")
+    parser.add_argument("--db", default=HISTORY_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    trend = sub.add_parser("trend", help="pass rate over time")
+    trend.add_argument("--bucket", choices=sorted(BUCKET_SECONDS), default="day")
+    trend.add_argument("--days", type=float, default=30)
+    rule = sub.add_parser("rule", help="observed_value series for one rule")
+    rule.add_argument("rule_id", type=int)
+    rule.add_argument("--days", type=float, default=30)
+    args = parser.parse_args(argv)
+
+    since = time.time() - args.days * 86400
+    with ResultsHistory(args.db) as history:
+        if args.command == "trend":
+            print(f"📈 Pass rate per {args.bucket}, last {args.days:g} days")
+            for row in history.pass_rate_trend(args.bucket, since=since):
+                print(f"   {row['bucket_start']}  runs={row['runs']:<4} pass_rate={row['pass_rate']}%")
+        else:
+            series = history.rule_series(args.rule_id, since=since)
+            print(f"📈 Rule #{args.rule_id}: {len(series)} runs in the last {args.days:g} days")
+            for ts, observed, success in series:
+                print(f"   {_iso(ts)}  {'PASSED' if success else 'SKIPPED' if success is None else 'FAILED':<7} {observed}")
+    return 0
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Incremental GE Validation
+Keeps one mergeable TableProfile per data partition on disk; only new or
+changed partitions are scanned, stored profiles are merged for whole-table
+results
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import shutil
+
+import numpy as np
+
+from ge_engine import RULES_PATH, load_rules, evaluate, reference_histograms, read_reference, status
+from ge_history import record_results
+from ge_profile import TableProfile
+from ge_streaming import STREAM_CHUNK_ROWS, profile_source
+
+MANIFEST = 'manifest.json'
+
+
+def fingerprint(rules, histograms):
+    """Stored state is only reusable for the same rules and reference bins"""
+    digest = hashlib.sha256(json.dumps(rules, sort_keys=True).encode())
+    for col in sorted(histograms):
+        edges, counts = histograms[col]
+        digest.update(col.encode())
+        digest.update(np.asarray(edges, dtype=np.float64).tobytes())
+        digest.update(np.asarray(counts, dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+
+def _file_signature(path):
+    st = os.stat(path)
+    return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+
+class IncrementalValidator:
+    """Partition-level profile store under `state_dir`.
+
+    state_dir/manifest.json      rule fingerprint, partition root + one entry per partition
+    state_dir/<partition>/       pickled TableProfile and its uniqueness files
+    """
+
+    def __init__(self, state_dir, rules=None, reference=None, chunk_rows=STREAM_CHUNK_ROWS):
+        self.state_dir = state_dir
+        self.rules = load_rules() if rules is None else rules
+        self.histograms = reference_histograms(reference, self.rules) if reference is not None else {}
+        self.edges = {col: h[0] for col, h in self.histograms.items()}
+        self.chunk_rows = chunk_rows
+        self.fingerprint = fingerprint(self.rules, self.histograms)
+        os.makedirs(state_dir, exist_ok=True)
+        self.manifest = self._load_manifest()
+
+    # -- manifest -----------------------------------------------------------
+
+    def _load_manifest(self):
+        path = os.path.join(self.state_dir, MANIFEST)
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                manifest = json.load(f)
+            if manifest.get('fingerprint') == self.fingerprint:
+                return manifest
+            # Rules or reference changed: stored profiles no longer apply
+            for name in manifest.get('partitions', {}):
+                shutil.rmtree(self._partition_dir(name), ignore_errors=True)
+        return {"fingerprint": self.fingerprint, "partitions": {}}
+
+    def _save_manifest(self):
+        path = os.path.join(self.state_dir, MANIFEST)
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp, path)
+
+    def _partition_dir(self, name):
+        safe = name.replace(os.sep, '_')
+        if safe != name:
+            # 'a/b_c' and 'a_b/c' must not share a directory
+            safe += '-' + hashlib.sha256(name.encode()).hexdigest()[:8]
+        return os.path.join(self.state_dir, 'partitions', safe)
+
+    # -- partitions ---------------------------------------------------------
+
+    @property
+    def partitions(self):
+        return sorted(self.manifest['partitions'])
+
+    def _store(self, name, table, signature=None, path=None):
+        directory = self._partition_dir(name)
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory)
+        table.persist(directory)
+        with open(os.path.join(directory, 'profile.pkl'), 'wb') as f:
+            pickle.dump(table, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.manifest['partitions'][name] = {"rows": table.row_count, "source": signature, "path": path}
+        self._save_manifest()
+
+    def add_dataframe(self, name, df):
+        """Profile an in-memory partition and store it under `name` (replacing any previous one)"""
+        table = TableProfile(self.rules, drift_edges=self.edges)
+        for start in range(0, max(len(df), 1), self.chunk_rows):
+            table.update(df.iloc[start:start + self.chunk_rows])
+        self._store(name, table)
+
+    def add_file(self, path, name=None):
+        """Stream one partition file into a stored profile.
+
+        Without `name` the file's basename is used; a different file already
+        stored under that basename is an error rather than being replaced.
+        """
+        path = os.path.abspath(path)
+        if name is None:
+            name = os.path.basename(path)
+            stored = self.manifest['partitions'].get(name)
+            if stored and stored.get('path') not in (None, path):
+                raise ValueError(f"partition {name!r} is already stored from {stored['path']}; "
+                                 f"pass a distinct name for {path}")
+        table = profile_source(path, self.rules, drift_edges=self.edges, chunk_rows=self.chunk_rows)
+        self._store(name, table, signature=_file_signature(path), path=path)
+
+    def remove(self, name):
+        shutil.rmtree(self._partition_dir(name), ignore_errors=True)
+        self.manifest['partitions'].pop(name, None)
+        self._save_manifest()
+
+    def sync(self, paths, root=None):
+        """Scan only partition files that are new or changed since the last run.
+
+        Partitions are named by their path relative to `root`, so Hive-style
+        layouts (dt=.../part-0.parquet) stay distinct. The root is kept in the
+        manifest: later syncs reuse it, so adding a file elsewhere does not
+        rename (and rescan) the stored partitions. Without a stored or given
+        root, the first sync uses the listed files' common directory.
+        Stored partitions whose file is no longer listed are dropped.
+        Returns the names that were (re)scanned.
+        """
+        scanned = []
+        paths = [os.path.abspath(p) for p in paths]
+        if root is None:
+            root = self.manifest.get('root')
+        if root is None and paths:
+            root = os.path.commonpath([os.path.dirname(p) for p in paths])
+        root = os.path.abspath(root) if root else os.getcwd()
+        if self.manifest.get('root') != root:
+            self.manifest['root'] = root
+            self._save_manifest()
+        wanted = {os.path.relpath(p, root): p for p in paths}
+        for name in list(self.manifest['partitions']):
+            if name not in wanted:
+                self.remove(name)
+        for name, path in sorted(wanted.items()):
+            stored = self.manifest['partitions'].get(name)
+            if stored is None or stored.get('source') != _file_signature(path):
+                self.add_file(path, name)
+                scanned.append(name)
+        return scanned
+
+    # -- results ------------------------------------------------------------
+
+    def _load(self, name):
+        with open(os.path.join(self._partition_dir(name), 'profile.pkl'), 'rb') as f:
+            return pickle.load(f)
+
+    def table_profile(self):
+        """Merge every stored partition profile into one whole-table profile"""
+        table = TableProfile(self.rules, drift_edges=self.edges)
+        for name in self.partitions:
+            table.merge(self._load(name))
+        return table
+
+    def validate(self, seed=None):
+        return evaluate(self.rules, self.table_profile(), self.histograms, seed=seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incrementally validate partition files against ge_rules.json")
+    parser.add_argument("state_dir", help="where per-partition profiles are kept between runs")
+    parser.add_argument("partitions", nargs='+', help=".csv / .parquet partition files (the full current set)")
+    parser.add_argument("--root", help="directory partition names are relative to "
+                                       "(default: the one stored in state_dir, else the files' common directory)")
+    parser.add_argument("--rules", default=RULES_PATH)
+    parser.add_argument("--reference", help="reference table or ge_drift profile (.json) for drift rules")
+    parser.add_argument("--chunk-rows", type=int, default=STREAM_CHUNK_ROWS)
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--history", help="append the run to this results history (see ge_history.py)")
+    args = parser.parse_args(argv)
+
+    rules = load_rules(args.rules)
+    reference = read_reference(args.reference) if args.reference else None
+    validator = IncrementalValidator(args.state_dir, rules, reference=reference, chunk_rows=args.chunk_rows)
+
+    scanned = validator.sync(args.partitions, args.root)
+    print(f"🎯 Scanned {len(scanned)} new/changed of {len(validator.partitions)} partitions")
+    for name in scanned:
+        print(f"   + {name}")
+    results = validator.validate()
+    for r in results:
+        print(f"   #{r['rule_id']:>2} {status(r):<7} {r['expectation']} [{r['column']}] observed={r['observed_value']}")
+
+    passed = sum(1 for r in results if r['success'])
+    print(f"\n✅ {passed}/{len(results)} rules passed")
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2, default=str)
+        print(f"   Saved to: {args.out}")
+    if args.history:
+        run_id = record_results(results, args.history, source=args.state_dir)
+        print(f"   Recorded run {run_id} in: {args.history}")
+    return 0
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Memory-Mapped GE Validation Input
+Validates Arrow IPC files and directories of .npy column files straight
+from the OS page cache: columns are mapped, never loaded, and row chunks
+are views into the mapping
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from ge_engine import (RULES_PATH, CHUNK_ROWS, load_rules, evaluate, reference_histograms,
+                       referenced_columns, read_reference, status)
+from ge_profile import TableProfile
+
+ARROW_SUFFIXES = ('.arrow', '.feather', '.ipc')
+# Optional column order for a .npy directory (a directory listing has none)
+NPY_COLUMNS_FILE = '_columns.json'
+# <column>.mask.npy beside a string column marks its null rows
+NPY_MASK_SUFFIX = '.mask.npy'
+
+
+class NpyColumns:
+    """Directory of <column>.npy files opened with mmap_mode='r' (plus null masks)"""
+
+    def __init__(self, directory):
+        order_path = os.path.join(directory, NPY_COLUMNS_FILE)
+        if os.path.exists(order_path):
+            with open(order_path, 'r') as f:
+                names = json.load(f)
+        else:
+            names = sorted(f[:-4] for f in os.listdir(directory)
+                           if f.endswith('.npy') and not f.endswith(NPY_MASK_SUFFIX))
+        self.arrays = {c: np.load(os.path.join(directory, f"{c}.npy"), mmap_mode='r') for c in names}
+        self.masks = {c: np.load(os.path.join(directory, c + NPY_MASK_SUFFIX), mmap_mode='r') for c in names
+                      if os.path.exists(os.path.join(directory, c + NPY_MASK_SUFFIX))}
+        lengths = {len(a) for a in self.arrays.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"column files in {directory} have different lengths: {sorted(lengths)}")
+        self.num_rows = lengths.pop() if lengths else 0
+        self.column_names = list(self.arrays)
+
+    def chunks(self, columns, chunk_rows):
+        for lo in range(0, self.num_rows, chunk_rows):
+            hi = min(lo + chunk_rows, self.num_rows)
+            # Series over a memmap slice share the mapped pages (no copy)
+            yield {c: self._series(c, lo, hi) for c in columns}, hi - lo
+
+    def _series(self, column, lo, hi):
+        series = pd.Series(self.arrays[column][lo:hi], copy=False)
+        mask = self.masks.get(column)
+        if mask is not None:
+            nulls = mask[lo:hi]
+            if nulls.any():
+                # Strings were saved fixed-width; put the nulls back
+                series = series.astype(object)
+                series[nulls] = None
+        return series
+
+
+class ArrowColumns:
+    """Uncompressed Arrow IPC file read through pa.memory_map"""
+
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise RuntimeError("pyarrow is required to map Arrow IPC files (pip install pyarrow)") from e
+        self.pa = pa
+        self.reader = pa.ipc.open_file(pa.memory_map(path, 'r'))
+        self.column_names = list(self.reader.schema.names)
+        self.num_rows = sum(self.reader.get_batch(i).num_rows for i in range(self.reader.num_record_batches))
+
+    def _series(self, array):
+        t = array.type
+        if array.null_count == 0 and self.pa.types.is_primitive(t) and not self.pa.types.is_boolean(t):
+            # Fixed-width, no nulls: numpy view onto the mapped buffer
+            return pd.Series(array.to_numpy(zero_copy_only=True), copy=False)
+        return array.to_pandas()
+
+    def chunks(self, columns, chunk_rows):
+        for i in range(self.reader.num_record_batches):
+            batch = self.reader.get_batch(i)
+            for lo in range(0, batch.num_rows, chunk_rows):
+                part = batch.slice(lo, chunk_rows)
+                yield {c: self._series(part.column(c)) for c in columns}, part.num_rows
+
+
+def open_mapped(path):
+    """NpyColumns for a directory, ArrowColumns for an IPC file"""
+    if os.path.isdir(path):
+        return NpyColumns(path)
+    if path.endswith(ARROW_SUFFIXES):
+        return ArrowColumns(path)
+    raise ValueError(f"expected a directory of .npy files or one of {ARROW_SUFFIXES}: {path}")
+
+
+def write_npy_columns(df, directory):
+    """One .npy per column, the layout NpyColumns maps (strings become fixed-width,
+    with a <column>.mask.npy recording which rows were null)"""
+    os.makedirs(directory, exist_ok=True)
+    for col in df.columns:
+        values = df[col].to_numpy()
+        mask_path = os.path.join(directory, col + NPY_MASK_SUFFIX)
+        if values.dtype == object or not isinstance(values.dtype, np.dtype):
+            nulls = df[col].isna().to_numpy()
+            values = np.where(nulls, '', values).astype(str)
+            if nulls.any():
+                np.save(mask_path, nulls)
+            elif os.path.exists(mask_path):
+                os.remove(mask_path)
+        np.save(os.path.join(directory, f"{col}.npy"), values)
+    with open(os.path.join(directory, NPY_COLUMNS_FILE), 'w') as f:
+        json.dump(list(df.columns), f)
+
+
+def profile_mapped(source, rules, drift_edges=None, chunk_rows=CHUNK_ROWS):
+    """Fold a mapped source into a TableProfile chunk by chunk"""
+    wanted = set(referenced_columns(rules))
+    columns = [c for c in source.column_names if c in wanted]
+    table = TableProfile(rules, drift_edges=drift_edges)
+    table.column_names = source.column_names
+    for chunk, n_rows in source.chunks(columns, chunk_rows):
+        table.update_columns(chunk, n_rows)
+    return table
+
+
+def validate_mapped(path, rules=None, reference=None, seed=None, chunk_rows=CHUNK_ROWS):
+    """ge_engine.validate() for a memory-mapped Arrow IPC file or .npy column directory"""
+    rules = load_rules() if rules is None else rules
+    histograms = reference_histograms(reference, rules) if reference is not None else {}
+    edges = {col: h[0] for col, h in histograms.items()}
+    table = profile_mapped(open_mapped(path), rules, drift_edges=edges, chunk_rows=chunk_rows)
+    return evaluate(rules, table, histograms, seed=seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate a memory-mapped table against ge_rules.json")
+    parser.add_argument("data", help="Arrow IPC file (.arrow/.feather) or directory of .npy columns")
+    parser.add_argument("--rules", default=RULES_PATH)
+    parser.add_argument("--reference", help="reference table or ge_drift profile (.json) for drift rules")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--out", help="write results JSON here")
+    args = parser.parse_args(argv)
+
+    rules = load_rules(args.rules)
+    reference = read_reference(args.reference) if args.reference else None
+
+    print(f"🎯 Mapping {args.data} and validating against {len(rules)} rules...")
+    results = validate_mapped(args.data, rules, reference=reference, chunk_rows=args.chunk_rows)
+    for r in results:
+        print(f"   #{r['rule_id']:>2} {status(r):<7} {r['expectation']} [{r['column']}] observed={r['observed_value']}")
+
+    passed = sum(1 for r in results if r['success'])
+    print(f"\n✅ {passed}/{len(results)} rules passed")
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2, default=str)
+        print(f"   Saved to: {args.out}")
+    return 0
+
+if __name__ == '__main__':
+    main()
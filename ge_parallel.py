@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Parallel GE Validation
+Splits a table by column and row range across a process pool. Column data
+is placed in shared memory once; workers map it zero-copy, build partial
+profiles and the parent reduces them into one result per rule
+"""
+
+import argparse
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from ge_engine import (RULES_PATH, CHUNK_ROWS, load_rules, evaluate, reference_histograms,
+                       referenced_columns, read_reference, read_table, status)
+from ge_profile import ColumnProfile, TableProfile, COMPOUND_RULES, RECORD_RULES
+
+try:
+    import pyarrow as pa
+except ImportError:  # without pyarrow, string columns are pickled to workers per task
+    pa = None
+
+# Below this many rows per task, process start-up outweighs the scan
+MIN_ROWS_PER_TASK = 100_000
+
+_ATTACHED = {}
+
+
+def _attach(name):
+    """Map an existing shared memory block in a worker, once per process"""
+    shm = _ATTACHED.get(name)
+    if shm is None:
+        # Pool workers share the parent's resource tracker, so the parent's unlink() covers this too
+        shm = shared_memory.SharedMemory(name=name)
+        _ATTACHED[name] = shm
+    return shm
+
+
+class SharedTable:
+    """Parent-side owner of the shared memory holding a DataFrame's columns.
+
+    numpy-typed columns (numeric, bool, datetime64) are raw buffers;
+    categoricals share their codes; remaining columns go into one Arrow IPC
+    buffer when pyarrow is available, else are shipped by value.
+    """
+
+    def __init__(self, df, columns):
+        self.blocks = []
+        self.specs = {}
+        arrow_cols = []
+        for col in columns:
+            series = df[col]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                codes = series.cat.codes.to_numpy()
+                self.specs[col] = ('categorical', self._share(codes), codes.dtype.str, len(codes),
+                                   series.cat.categories, series.dtype.ordered)
+            elif isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biufcmM':
+                values = series.to_numpy()
+                self.specs[col] = ('numpy', self._share(values), values.dtype.str, len(values))
+            elif pa is not None:
+                arrow_cols.append(col)
+            else:
+                self.specs[col] = ('pickle', series)
+        if arrow_cols:
+            batch = pa.RecordBatch.from_pandas(df[arrow_cols], preserve_index=False)
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, batch.schema) as writer:
+                writer.write_batch(batch)
+            name = self._share(np.frombuffer(sink.getvalue(), dtype=np.uint8))
+            for col in arrow_cols:
+                self.specs[col] = ('arrow', name, col)
+
+    def _share(self, values):
+        shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)[:] = values
+        self.blocks.append(shm)
+        return shm.name
+
+    def close(self):
+        for shm in self.blocks:
+            shm.close()
+            shm.unlink()
+        self.blocks = []
+
+
+def _column_slice(spec, lo, hi):
+    """Worker-side Series for rows [lo, hi) of a shared column"""
+    kind = spec[0]
+    if kind == 'numpy':
+        _, name, dtype, length = spec
+        values = np.ndarray((length,), dtype=np.dtype(dtype), buffer=_attach(name).buf)
+        return pd.Series(values[lo:hi], copy=False)
+    if kind == 'categorical':
+        _, name, dtype, length, categories, ordered = spec
+        codes = np.ndarray((length,), dtype=np.dtype(dtype), buffer=_attach(name).buf)
+        return pd.Series(pd.Categorical.from_codes(codes[lo:hi], categories, ordered=ordered))
+    if kind == 'arrow':
+        _, name, col = spec
+        buf = pa.py_buffer(_attach(name).buf)
+        batch = pa.ipc.open_stream(buf).read_next_batch()
+        return batch.column(col).slice(lo, hi - lo).to_pandas()
+    return spec[1].iloc[lo:hi].reset_index(drop=True)
+
+
+def _profile_column(task):
+    col, col_rules, edges, spec, lo, hi = task
+    profile = ColumnProfile(col, col_rules, edges)
+    for start in range(lo, hi, CHUNK_ROWS):
+        profile.update(_column_slice(spec, start, min(start + CHUNK_ROWS, hi)))
+    if profile.duplicates is not None:
+        # Hand keys back as spill files rather than through the result pipe
+        profile.duplicates.spill()
+    return ('column', col, profile)
+
+
+def _profile_table(task):
+    table_rules, specs, lo, hi = task
+    table = TableProfile(table_rules)
+    for start in range(lo, hi, CHUNK_ROWS):
+        end = min(start + CHUNK_ROWS, hi)
+        table.update(pd.DataFrame({col: _column_slice(spec, start, end) for col, spec in specs.items()}))
+    for finder in table.duplicate_finders():
+        finder.spill()
+    return ('table', None, table)
+
+
+def _run(task):
+    return _profile_column(task[1]) if task[0] == 'column' else _profile_table(task[1])
+
+
+def plan_tasks(df, rules, shared, edges, rows_per_task):
+    """(column x row-range) tasks plus row-range tasks for multi-column rules"""
+    n = len(df)
+    ranges = [(lo, min(lo + rows_per_task, n)) for lo in range(0, n, rows_per_task)] or [(0, 0)]
+    by_column = {}
+    for rule in rules:
+        if 'column' in rule and rule['column'] in df.columns:
+            by_column.setdefault(rule['column'], []).append(rule)
+    tasks = []
+    for col, col_rules in by_column.items():
+        for lo, hi in ranges:
+            tasks.append(('column', (col, col_rules, edges.get(col), shared.specs[col], lo, hi)))
+    table_rules = [r for r in rules if r['type'] in COMPOUND_RULES | RECORD_RULES
+                   and all(c in df.columns for c in r['columns'])]
+    if table_rules:
+        cols = sorted({c for r in table_rules for c in r['columns']})
+        specs = {c: shared.specs[c] for c in cols}
+        for lo, hi in ranges:
+            tasks.append(('table', (table_rules, specs, lo, hi)))
+    return tasks
+
+
+def profile_parallel(df, rules, edges=None, max_workers=None, rows_per_task=None):
+    """TableProfile of df built by a process pool"""
+    edges = edges or {}
+    max_workers = max_workers or os.cpu_count() or 1
+    rows_per_task = rows_per_task or max(MIN_ROWS_PER_TASK, math.ceil(len(df) / max_workers))
+    table = TableProfile(rules, drift_edges=edges)
+    table.column_names = list(df.columns)
+    table.row_count = len(df)
+
+    needed = [c for c in referenced_columns(rules) if c in df.columns]
+    shared = SharedTable(df, needed)
+    try:
+        tasks = plan_tasks(df, rules, shared, edges, rows_per_task)
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            for kind, col, partial in pool.map(_run, tasks):
+                if kind == 'column':
+                    table.columns[col].merge(partial)
+                    continue
+                for rule_id, finder in partial.compound.items():
+                    table.compound[rule_id].merge(finder)
+                for rule_id, dupes in partial.record_dupes.items():
+                    table.record_dupes[rule_id] += dupes
+    finally:
+        shared.close()
+    # Workers may rebuild string columns with a different dtype; report the table's own
+    for col, profile in table.columns.items():
+        if profile.present:
+            profile.dtype = df[col].dtype
+    return table
+
+
+def validate_parallel(df, rules=None, reference=None, seed=None, max_workers=None, rows_per_task=None):
+    """Parallel counterpart of ge_engine.validate()"""
+    rules = load_rules() if rules is None else rules
+    histograms = reference_histograms(reference, rules) if reference is not None else {}
+    edges = {col: h[0] for col, h in histograms.items()}
+    table = profile_parallel(df, rules, edges, max_workers=max_workers, rows_per_task=rows_per_task)
+    return evaluate(rules, table, histograms, seed=seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate a table against ge_rules.json on all cores")
+    parser.add_argument("data", help=".csv or .parquet table")
+    parser.add_argument("--rules", default=RULES_PATH)
+    parser.add_argument("--reference", help="reference table or ge_drift profile (.json) for drift rules")
+    parser.add_argument("--workers", type=int, default=None, help="default: all cores")
+    parser.add_argument("--out", help="write results JSON here")
+    args = parser.parse_args(argv)
+
+    rules = load_rules(args.rules)
+    df = read_table(args.data)
+    reference = read_reference(args.reference) if args.reference else None
+
+    print(f"🎯 Validating {len(df)} rows against {len(rules)} rules on {args.workers or os.cpu_count()} workers...")
+    results = validate_parallel(df, rules, reference=reference, max_workers=args.workers)
+    for r in results:
+        print(f"   #{r['rule_id']:>2} {status(r):<7} {r['expectation']} [{r['column']}] observed={r['observed_value']}")
+
+    passed = sum(1 for r in results if r['success'])
+    print(f"\n✅ {passed}/{len(results)} rules passed")
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2, default=str)
+        print(f"   Saved to: {args.out}")
+    return 0
+
+if __name__ == '__main__':
+    main()
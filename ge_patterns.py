@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Pattern Matchers for the GE Rule Engine
+Compiled, cached regex and in-set matchers that work per chunk rather
+than per row: categorical columns are matched once per category, other
+columns through pyarrow's vectorized regex kernel or factorized uniques
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # pyarrow is optional; factorized matching is the fallback
+    pa = pc = None
+
+
+@lru_cache(maxsize=None)
+def compile_pattern(regex):
+    """re.compile once per distinct pattern for the life of the process"""
+    return re.compile(regex)
+
+
+@lru_cache(maxsize=None)
+def _arrow_supports(regex):
+    """pyarrow uses RE2; patterns it rejects go through Python re instead"""
+    if pc is None:
+        return False
+    try:
+        pc.match_substring_regex(pa.array([], type=pa.string()), regex)
+        return True
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        return False
+
+
+def _as_strings(series):
+    if ptypes.is_string_dtype(series.dtype) or ptypes.is_object_dtype(series.dtype):
+        return series
+    return series.astype(str)
+
+
+class RegexMatcher:
+    """Counts non-null values that do not contain a match for `regex` (re.search semantics)"""
+
+    def __init__(self, regex):
+        self.regex = regex
+        self.pattern = compile_pattern(regex)
+
+    def _match_python(self, strings):
+        search = self.pattern.search
+        return np.fromiter((search(s) is not None for s in strings), dtype=bool, count=len(strings))
+
+    def _match_values(self, strings):
+        """Boolean match per value of a non-null string Series"""
+        if _arrow_supports(self.regex):
+            arr = pa.array(strings, from_pandas=True)
+            if isinstance(arr, pa.ChunkedArray):
+                arr = arr.combine_chunks()
+            if not (pa.types.is_string(arr.type) or pa.types.is_large_string(arr.type)):
+                arr = arr.cast(pa.string())
+            ok = pc.match_substring_regex(arr, self.regex).to_numpy(zero_copy_only=False)
+            # RE2 classes like \w and \d are ASCII-only; recheck non-ASCII rows with Python re
+            non_ascii = ~pc.string_is_ascii(arr).to_numpy(zero_copy_only=False)
+            if non_ascii.any():
+                ok[non_ascii] = self._match_python(strings.to_numpy(dtype=object)[non_ascii])
+            return ok
+        codes, uniques = pd.factorize(strings)
+        return self._match_python(uniques)[codes]
+
+    def count_mismatches(self, values):
+        """values: non-null pandas Series for one chunk"""
+        if not len(values):
+            return 0
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            categories = _as_strings(pd.Series(values.cat.categories))
+            ok = self._match_python(categories.to_numpy(dtype=object))
+            return int(np.count_nonzero(~ok[values.cat.codes.to_numpy()]))
+        return int(np.count_nonzero(~self._match_values(_as_strings(values))))
+
+
+class InSetMatcher:
+    """Counts non-null values outside a fixed set, via dictionary codes"""
+
+    def __init__(self, values):
+        self.values = frozenset(values)
+
+    def _bad(self, uniques):
+        return ~pd.Index(uniques).isin(list(self.values))
+
+    def count_mismatches(self, values):
+        """values: non-null pandas Series for one chunk"""
+        if not len(values):
+            return 0
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            bad = self._bad(values.cat.categories)
+            counts = np.bincount(values.cat.codes.to_numpy(), minlength=len(bad))
+            return int(counts[bad].sum())
+        codes, uniques = pd.factorize(values)
+        bad = self._bad(uniques)
+        return int(np.bincount(codes, minlength=len(bad))[bad].sum())
+
+
+@lru_cache(maxsize=None)
+def _cached_matcher(kind, spec):
+    return RegexMatcher(spec) if kind == 'regex' else InSetMatcher(spec)
+
+
+def matcher_for(rule):
+    """Shared matcher for a regex / in-set rule, reused across chunks and runs"""
+    if 'regex' in rule:
+        return _cached_matcher('regex', rule['regex'])
+    return _cached_matcher('in_set', tuple(rule['values']))
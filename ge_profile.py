@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Mergeable Column Profiles for the GE Rule Engine
+One fused pass per column chunk computes every statistic the rules need
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+
+from ge_drift import bin_counts
+from ge_patterns import matcher_for
+from ge_sketches import KLLSketch
+from ge_uniqueness import DistinctEstimator, DuplicateFinder
+
+RANGE_RULES = {"expect_column_values_to_be_between"}
+MOMENT_RULES = {"expect_column_mean_to_be_between", "expect_column_stdev_to_be_between"}
+UNIQUE_RULES = {"expect_column_values_to_be_unique"}
+PROPORTION_UNIQUE_RULES = {"expect_column_proportion_of_unique_values_to_be_between"}
+QUANTILE_RULES = {"expect_column_median_to_be_between", "expect_column_quantile_values_to_be_between"}
+DRIFT_RULES = {"expect_column_kl_divergence_to_be_less_than",
+               "expect_column_psi_to_be_less_than",
+               "expect_column_bootstrapped_ks_test_p_value_to_be_greater_than"}
+REGEX_RULES = {"expect_column_values_to_match_regex"}
+IN_SET_RULES = {"expect_column_values_to_be_in_set"}
+COMPOUND_RULES = {"expect_compound_columns_to_be_unique"}
+RECORD_RULES = {"expect_select_column_values_to_be_unique_within_record"}
+
+
+def rule_quantile(rule):
+    """Quantile a median/quantile rule asks for"""
+    return 0.5 if rule['type'] == "expect_column_median_to_be_between" else rule['quantile']
+
+
+def is_numeric(dtype):
+    return ptypes.is_numeric_dtype(dtype) and not ptypes.is_bool_dtype(dtype)
+
+
+def promote_dtype(a, b):
+    """Common dtype of two chunks of one column (e.g. int64 + float64 -> float64
+    when a later CSV chunk has nulls), so chunked and whole-table runs agree"""
+    if a is None or a == b:
+        return b
+    if b is None:
+        return a
+    if isinstance(a, np.dtype) and isinstance(b, np.dtype):
+        return np.result_type(a, b)
+    return np.dtype(object)
+
+
+def hash_values(values):
+    """Stable uint64 hashes; numeric values hash as float64 so int/float chunks agree"""
+    if is_numeric(values.dtype):
+        values = values.astype(np.float64)
+    return pd.util.hash_array(np.asarray(values))
+
+
+class ExactQuantiles:
+    """Exact quantiles from sorted (value, count) pairs; compact for low-cardinality
+    columns and mergeable, so partition state can be stored and combined.
+
+    Chunk (value, count) arrays are buffered and folded into the sorted state
+    only once the buffer outgrows it (or a quantile is read), so streaming a
+    high-cardinality column re-sorts each value O(log chunks) times, not once
+    per chunk.
+    """
+
+    rank_error = 0.0
+    # Pending pairs always allowed before a compaction, however small the state
+    MIN_PENDING = 1 << 16
+
+    def __init__(self):
+        self._values = np.empty(0, dtype=np.float64)
+        self._counts = np.empty(0, dtype=np.int64)
+        self._pending = []
+        self._pending_size = 0
+
+    def __getstate__(self):
+        self._compact()
+        return {"values": self._values, "counts": self._counts}
+
+    def __setstate__(self, state):
+        # Also reads profiles pickled before the pending buffer existed
+        self.__init__()
+        self._values, self._counts = state["values"], state["counts"]
+
+    def _compact(self):
+        if not self._pending:
+            return
+        keys = np.concatenate([self._values] + [v for v, _ in self._pending])
+        weights = np.concatenate([self._counts] + [c for _, c in self._pending])
+        self._values, inverse = np.unique(keys, return_inverse=True)
+        self._counts = np.bincount(inverse, weights=weights, minlength=len(self._values)).astype(np.int64)
+        self._pending = []
+        self._pending_size = 0
+
+    def _add(self, values, counts):
+        self._pending.append((values, counts))
+        self._pending_size += len(values)
+        if self._pending_size > max(self.MIN_PENDING, len(self._values)):
+            self._compact()
+
+    @property
+    def values(self):
+        self._compact()
+        return self._values
+
+    @property
+    def counts(self):
+        self._compact()
+        return self._counts
+
+    def update(self, floats):
+        values, counts = np.unique(floats, return_counts=True)
+        self._add(values, counts)
+
+    def merge(self, other):
+        self._add(other.values, other.counts)
+        return self
+
+    def quantile(self, q):
+        """Same as np.quantile(all_values, q) with linear interpolation"""
+        self._compact()
+        n = int(self._counts.sum())
+        if not n:
+            return None
+        cum = np.cumsum(self._counts)
+        h = (n - 1) * q
+        lo, hi = int(np.floor(h)), int(np.ceil(h))
+        v_lo = self._values[np.searchsorted(cum, lo, side='right')]
+        v_hi = self._values[np.searchsorted(cum, hi, side='right')]
+        return float(v_lo + (h - lo) * (v_hi - v_lo))
+
+    def quantile_bounds(self, q):
+        value = self.quantile(q)
+        return value, value
+
+
+def quantile_state_for(rules):
+    """ExactQuantiles, or a KLL sketch when a quantile rule on the column
+    carries a `rank_error` (the tightest one wins)"""
+    errors = [r['rank_error'] for r in rules if r['type'] in QUANTILE_RULES and r.get('rank_error')]
+    return KLLSketch(rank_error=min(errors)) if errors else ExactQuantiles()
+
+
+def hash_rows(df):
+    """uint64 hash per row over several columns, numeric columns as float64"""
+    normalized = {c: df[c].astype(np.float64) if is_numeric(df[c].dtype) else df[c] for c in df.columns}
+    return pd.util.hash_pandas_object(pd.DataFrame(normalized), index=False).to_numpy()
+
+
+class ColumnProfile:
+    """Everything the rules need to know about one column, built chunk by chunk"""
+
+    def __init__(self, column, rules, drift_edges=None):
+        self.column = column
+        types = {r['type'] for r in rules}
+        self.present = False
+        self.dtype = None
+        self.count = 0
+        self.nulls = 0
+        # min / max / Chan-merged mean and M2 over non-null numeric values
+        self.want_moments = bool(types & (RANGE_RULES | MOMENT_RULES))
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.ranges = {r['id']: 0 for r in rules if r['type'] in RANGE_RULES}
+        self._range_bounds = {r['id']: (r.get('min'), r.get('max')) for r in rules if r['type'] in RANGE_RULES}
+        self.patterns = {r['id']: 0 for r in rules if r['type'] in REGEX_RULES | IN_SET_RULES}
+        self._pattern_rules = [r for r in rules if r['type'] in REGEX_RULES | IN_SET_RULES]
+        # Exact duplicate keys for unique rules; HLL-backed estimate for proportion rules
+        self.duplicates = DuplicateFinder() if types & UNIQUE_RULES else None
+        wants_estimate = types & PROPORTION_UNIQUE_RULES and self.duplicates is None
+        self.distinct = DistinctEstimator() if wants_estimate else None
+        self.quantiles = sorted({rule_quantile(r) for r in rules if r['type'] in QUANTILE_RULES})
+        self.quantile_state = quantile_state_for(rules) if self.quantiles else None
+        self.drift_edges = drift_edges if types & DRIFT_RULES else None
+        self.histogram = np.zeros(len(drift_edges) - 1, dtype=np.int64) if self.drift_edges is not None else None
+
+    def update(self, series):
+        """Fold one chunk of the column into the profile in a single pass"""
+        self.present = True
+        self.dtype = promote_dtype(self.dtype, series.dtype)
+        mask = series.isna().to_numpy()
+        nulls = int(mask.sum())
+        self.count += len(series)
+        self.nulls += nulls
+        values = series.to_numpy()
+        if nulls:
+            values = values[~mask]
+        if not len(values):
+            return
+
+        numeric = is_numeric(values.dtype)
+        if numeric and (self.want_moments or self.quantile_state is not None or self.histogram is not None):
+            floats = values.astype(np.float64, copy=False)
+            if self.want_moments:
+                self._update_moments(floats)
+            for rule_id, (lo, hi) in self._range_bounds.items():
+                bad = 0
+                if lo is not None:
+                    bad += int(np.count_nonzero(floats < lo))
+                if hi is not None:
+                    bad += int(np.count_nonzero(floats > hi))
+                self.ranges[rule_id] += bad
+            if self.quantile_state is not None:
+                self.quantile_state.update(floats)
+            if self.histogram is not None:
+                self.histogram += bin_counts(floats, self.drift_edges)
+        elif self._range_bounds:
+            # Non-numeric column under a range rule: every value is out of range
+            for rule_id in self.ranges:
+                self.ranges[rule_id] += len(values)
+
+        if self._pattern_rules:
+            non_null = series[~mask] if nulls else series
+            for rule in self._pattern_rules:
+                self.patterns[rule['id']] += matcher_for(rule).count_mismatches(non_null)
+
+        if self.duplicates is not None or self.distinct is not None:
+            hashes = hash_values(values)
+            if self.duplicates is not None:
+                self.duplicates.update(hashes, pd.DataFrame({self.column: values}))
+            if self.distinct is not None:
+                self.distinct.update(hashes)
+
+    def _update_moments(self, floats):
+        n_b = len(floats)
+        mean_b = float(floats.mean())
+        m2_b = float(((floats - mean_b) ** 2).sum())
+        self.min = min(self.min, float(floats.min()))
+        self.max = max(self.max, float(floats.max()))
+        self._combine_moments(n_b, mean_b, m2_b)
+
+    def _combine_moments(self, n_b, mean_b, m2_b):
+        n_a = self.n
+        n = n_a + n_b
+        if not n:
+            return
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta * delta * n_a * n_b / n
+        self.n = n
+
+    def merge(self, other):
+        """Fold a profile of the same column built from other rows"""
+        if other.present:
+            self.present = True
+            self.dtype = promote_dtype(self.dtype, other.dtype)
+        self.count += other.count
+        self.nulls += other.nulls
+        if other.n:
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._combine_moments(other.n, other.mean, other.m2)
+        for rule_id, bad in other.ranges.items():
+            self.ranges[rule_id] += bad
+        for rule_id, bad in other.patterns.items():
+            self.patterns[rule_id] += bad
+        if self.duplicates is not None:
+            self.duplicates.merge(other.duplicates)
+        if self.distinct is not None:
+            self.distinct.merge(other.distinct)
+        if self.quantile_state is not None:
+            self.quantile_state.merge(other.quantile_state)
+        if self.histogram is not None:
+            self.histogram += other.histogram
+        return self
+
+    @property
+    def non_null(self):
+        return self.count - self.nulls
+
+    @property
+    def stdev(self):
+        return float(np.sqrt(self.m2 / (self.n - 1))) if self.n > 1 else 0.0
+
+    def quantile(self, q):
+        return self.quantile_state.quantile(q) if self.quantile_state is not None else None
+
+
+class TableProfile:
+    """Column profiles plus table-level aggregates for one rule set"""
+
+    def __init__(self, rules, drift_edges=None):
+        drift_edges = drift_edges or {}
+        by_column = {}
+        for rule in rules:
+            if 'column' in rule:
+                by_column.setdefault(rule['column'], []).append(rule)
+        self.columns = {col: ColumnProfile(col, col_rules, drift_edges.get(col))
+                        for col, col_rules in by_column.items()}
+        self.row_count = 0
+        self.column_names = None
+        self._compound_rules = [r for r in rules if r['type'] in COMPOUND_RULES]
+        self._record_rules = [r for r in rules if r['type'] in RECORD_RULES]
+        self.compound = {r['id']: DuplicateFinder() for r in self._compound_rules}
+        self.record_dupes = {r['id']: 0 for r in self._record_rules}
+
+    def update(self, df):
+        """Fold one row chunk: each referenced column is scanned exactly once"""
+        return self.update_columns({col: df[col] for col in df.columns}, len(df))
+
+    def update_columns(self, columns, n_rows):
+        """update() for a {column: Series} chunk, e.g. views over mapped buffers,
+        without gathering the columns into a DataFrame"""
+        if self.column_names is None:
+            self.column_names = list(columns)
+        self.row_count += n_rows
+        for col, profile in self.columns.items():
+            if col in columns:
+                profile.update(columns[col])
+        for rule in self._compound_rules:
+            if all(c in columns for c in rule['columns']):
+                keys = pd.DataFrame({c: columns[c].reset_index(drop=True) for c in rule['columns']})
+                hashes = hash_rows(keys)
+                self.compound[rule['id']].update(hashes, keys)
+        for rule in self._record_rules:
+            cols = rule['columns']
+            if len(cols) > 1 and all(c in columns for c in cols):
+                record = pd.DataFrame({c: columns[c].reset_index(drop=True) for c in cols})
+                self.record_dupes[rule['id']] += int((record.nunique(axis=1) < len(cols)).sum())
+        return self
+
+    def duplicate_finders(self):
+        """Every DuplicateFinder held by this profile"""
+        finders = [p.duplicates for p in self.columns.values() if p.duplicates is not None]
+        return finders + list(self.compound.values())
+
+    def persist(self, directory):
+        """Move spilled uniqueness state under `directory` so the profile can be pickled and kept"""
+        for finder in self.duplicate_finders():
+            finder.persist(directory)
+        return self
+
+    def merge(self, other):
+        """Fold a profile of other rows of the same table"""
+        if self.column_names is None:
+            self.column_names = other.column_names
+        self.row_count += other.row_count
+        for col, profile in self.columns.items():
+            profile.merge(other.columns[col])
+        for rule_id, counter in other.compound.items():
+            self.compound[rule_id].merge(counter)
+        for rule_id, dupes in other.record_dupes.items():
+            self.record_dupes[rule_id] += dupes
+        return self
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Quantile Sketches for the GE Rule Engine
+Mergeable KLL sketch: fixed memory per column, one streaming pass, and a
+known rank-error bound instead of an exact sort of every value
+"""
+
+import math
+
+import numpy as np
+
+# Default rank error for approximate quantile rules (about k=200)
+QUANTILE_RANK_ERROR = 0.0165
+# Capacity decay between levels of a KLL sketch
+KLL_DECAY = 2.0 / 3.0
+KLL_MIN_K = 8
+
+
+def kll_rank_error(k):
+    """Normalized rank error of a KLL sketch with parameter k (99% confidence;
+    empirical fit from Apache DataSketches)"""
+    return 2.296 / k ** 0.9723
+
+
+def kll_k_for(rank_error):
+    """Smallest k whose rank error is at most `rank_error`"""
+    return max(KLL_MIN_K, int(math.ceil((2.296 / rank_error) ** (1 / 0.9723))))
+
+
+class KLLSketch:
+    """KLL quantile sketch over float64 values.
+
+    Level h holds items of weight 2**h. A level that outgrows its capacity
+    is sorted and every other item (random offset) is promoted one level up,
+    so memory stays around 3k items whatever the column length.
+    """
+
+    def __init__(self, k=None, rank_error=QUANTILE_RANK_ERROR, seed=0):
+        self.k = k or kll_k_for(rank_error)
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.levels = [np.empty(0, dtype=np.float64)]
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def rank_error(self):
+        return kll_rank_error(self.k)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * KLL_DECAY ** depth)))
+
+    def _compress(self):
+        # Compact only while the sketch as a whole is over capacity, lowest full level first
+        while sum(len(items) for items in self.levels) > sum(self._capacity(h) for h in range(len(self.levels))):
+            h = next(h for h, items in enumerate(self.levels) if len(items) >= self._capacity(h))
+            if h + 1 == len(self.levels):
+                self.levels.append(np.empty(0, dtype=np.float64))
+            items = np.sort(self.levels[h])
+            # An odd item out stays behind so total weight is preserved
+            odd = len(items) % 2
+            promoted = items[odd:][int(self._rng.integers(2))::2]
+            self.levels[h] = items[:odd]
+            self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+
+    def update(self, floats):
+        floats = np.asarray(floats, dtype=np.float64)
+        if not len(floats):
+            return
+        self.n += len(floats)
+        self.min = min(self.min, float(floats.min()))
+        self.max = max(self.max, float(floats.max()))
+        self.levels[0] = np.concatenate([self.levels[0], floats])
+        self._compress()
+
+    def merge(self, other):
+        if other.k != self.k:
+            raise ValueError("cannot merge KLL sketches with different k")
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype=np.float64))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        """Value whose rank is q * n, within rank_error * n ranks"""
+        if not self.n:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 1 << h, dtype=np.int64)
+                                  for h, items in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        cum = np.cumsum(weights[order])
+        idx = min(int(np.searchsorted(cum, q * cum[-1], side='left')), len(cum) - 1)
+        return float(values[order][idx])
+
+    def quantile_bounds(self, q):
+        """(low, high) values bracketing the true q-quantile at the sketch's rank error"""
+        eps = self.rank_error
+        return self.quantile(max(q - eps, 0.0)), self.quantile(min(q + eps, 1.0))
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Out-of-Core GE Validation
+Streams a Parquet/CSV source in row-group or CSV chunks through the
+mergeable TableProfile, so tables larger than RAM can be validated
+"""
+
+import argparse
+import json
+
+import pandas as pd
+
+from ge_engine import (RULES_PATH, load_rules, evaluate, reference_histograms,
+                       referenced_columns, read_reference, status, approximate)
+from ge_history import record_results
+from ge_sketches import QUANTILE_RANK_ERROR
+from ge_profile import TableProfile
+
+# Rows per chunk; together with the number of referenced columns this bounds peak memory
+STREAM_CHUNK_ROWS = 250_000
+
+DATETIME_DTYPES = {"datetime"}
+
+
+def _date_columns(rules):
+    return {r['column'] for r in rules
+            if r['type'] == "expect_column_values_to_be_of_type" and r.get('dtype') in DATETIME_DTYPES}
+
+
+def _parquet_file(path):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("pyarrow is required to stream Parquet files (pip install pyarrow)") from e
+    return pq.ParquetFile(path)
+
+
+def source_columns(path):
+    """Column names of a CSV/Parquet source without reading any rows"""
+    if path.endswith('.parquet'):
+        return list(_parquet_file(path).schema_arrow.names)
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def iter_chunks(path, columns=None, chunk_rows=STREAM_CHUNK_ROWS, parse_dates=()):
+    """Yield DataFrame chunks of at most chunk_rows rows, only for `columns`"""
+    if path.endswith('.parquet'):
+        for batch in _parquet_file(path).iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+        return
+    dates = [c for c in parse_dates if columns is None or c in columns]
+    yield from pd.read_csv(path, usecols=columns, chunksize=chunk_rows, parse_dates=dates)
+
+
+def profile_source(path, rules, drift_edges=None, chunk_rows=STREAM_CHUNK_ROWS):
+    """Fold every chunk of a source into a fresh TableProfile"""
+    header = source_columns(path)
+    wanted = set(referenced_columns(rules))
+    columns = [c for c in header if c in wanted]
+    table = TableProfile(rules, drift_edges=drift_edges)
+    table.column_names = header
+    for chunk in iter_chunks(path, columns, chunk_rows, parse_dates=_date_columns(rules)):
+        table.update(chunk)
+    return table
+
+
+def validate_file(path, rules=None, reference=None, seed=None, chunk_rows=STREAM_CHUNK_ROWS):
+    """Streaming counterpart of ge_engine.validate() for a file on disk"""
+    rules = load_rules() if rules is None else rules
+    histograms = reference_histograms(reference, rules) if reference is not None else {}
+    edges = {col: h[0] for col, h in histograms.items()}
+    table = profile_source(path, rules, drift_edges=edges, chunk_rows=chunk_rows)
+    return evaluate(rules, table, histograms, seed=seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a table through ge_rules.json")
+    parser.add_argument("data", help=".csv or .parquet table")
+    parser.add_argument("--rules", default=RULES_PATH)
+    parser.add_argument("--reference", help="reference table or ge_drift profile (.json) for drift rules")
+    parser.add_argument("--chunk-rows", type=int, default=STREAM_CHUNK_ROWS)
+    parser.add_argument("--approx", type=float, metavar="RANK_ERROR", nargs='?', const=QUANTILE_RANK_ERROR,
+                        help="sketch median/quantile rules at this rank error instead of sorting")
+    parser.add_argument("--out", help="write results JSON here")
+    parser.add_argument("--history", help="append the run to this results history (see ge_history.py)")
+    args = parser.parse_args(argv)
+
+    rules = load_rules(args.rules)
+    if args.approx:
+        rules = approximate(rules, args.approx)
+    reference = read_reference(args.reference) if args.reference else None
+
+    print(f"🎯 Streaming {args.data} in {args.chunk_rows}-row chunks against {len(rules)} rules...")
+    results = validate_file(args.data, rules, reference=reference, chunk_rows=args.chunk_rows)
+    for r in results:
+        print(f"   #{r['rule_id']:>2} {status(r):<7} {r['expectation']} [{r['column']}] observed={r['observed_value']}")
+
+    passed = sum(1 for r in results if r['success'])
+    print(f"\n✅ {passed}/{len(results)} rules passed")
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2, default=str)
+        print(f"   Saved to: {args.out}")
+    if args.history:
+        run_id = record_results(results, args.history, source=args.data)
+        print(f"   Recorded run {run_id} in: {args.history}")
+    return 0
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Uniqueness Subsystem for the GE Rule Engine
+HyperLogLog distinct estimates with an exact fallback, and partitioned
+spill-to-disk duplicate detection that reports the duplicate keys
+"""
+
+import os
+import pickle
+import shutil
+import tempfile
+import uuid
+import weakref
+
+import numpy as np
+import pandas as pd
+
+HLL_PRECISION = 14
+# Keep an exact hash set until this many distinct values, then rely on HLL
+EXACT_DISTINCT_LIMIT = 1 << 20
+
+DUPLICATE_PARTITIONS = 64
+# Buffered rows across all partitions before they are spilled to disk
+SPILL_ROWS = 2_000_000
+MAX_DUPLICATE_EXAMPLES = 20
+
+
+def _bit_length(words):
+    """Exact bit length of each uint64 (0 -> 0)"""
+    words = words.copy()
+    length = np.zeros(words.shape, dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        big = words >= np.uint64(1 << shift)
+        length[big] += shift
+        words[big] >>= np.uint64(shift)
+    return length + (words > 0)
+
+
+class HyperLogLog:
+    """Fixed-memory (2**p bytes) mergeable distinct-count sketch over uint64 hashes"""
+
+    def __init__(self, p=HLL_PRECISION):
+        self.p = p
+        self.m = 1 << p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def update(self, hashes):
+        if not len(hashes):
+            return
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        idx = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+        rest = hashes << np.uint64(self.p)
+        # rank = position of the first 1 bit in the remaining 64 - p bits
+        rank = np.minimum(64 - _bit_length(rest) + 1, 64 - self.p + 1).astype(np.uint8)
+        np.maximum.at(self.registers, idx, rank)
+
+    def merge(self, other):
+        if other.p != self.p:
+            raise ValueError("cannot merge HyperLogLog sketches of different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    @property
+    def relative_error(self):
+        """Standard error of estimate()"""
+        return 1.04 / np.sqrt(self.m)
+
+    def estimate(self):
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int64))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Small-range correction: linear counting
+            return float(m * np.log(m / zeros))
+        return float(raw)
+
+
+class DistinctEstimator:
+    """Exact distinct count while small, HyperLogLog estimate once past exact_limit"""
+
+    def __init__(self, p=HLL_PRECISION, exact_limit=EXACT_DISTINCT_LIMIT):
+        self.hll = HyperLogLog(p)
+        self.exact_limit = exact_limit
+        self._exact = np.empty(0, dtype=np.uint64)
+
+    def update(self, hashes):
+        self.hll.update(hashes)
+        if self._exact is not None:
+            self._exact = np.union1d(self._exact, hashes)
+            if len(self._exact) > self.exact_limit:
+                self._exact = None
+
+    def merge(self, other):
+        self.hll.merge(other.hll)
+        if self._exact is not None and other._exact is not None:
+            self._exact = np.union1d(self._exact, other._exact)
+            if len(self._exact) > self.exact_limit:
+                self._exact = None
+        else:
+            self._exact = None
+        return self
+
+    @property
+    def is_exact(self):
+        return self._exact is not None
+
+    def estimate(self):
+        """(distinct count, relative error bound; 0.0 when exact)"""
+        if self._exact is not None:
+            return len(self._exact), 0.0
+        return self.hll.estimate(), float(self.hll.relative_error)
+
+
+def _remove_dirs(dirs):
+    for d in dirs:
+        shutil.rmtree(d, ignore_errors=True)
+
+
+class DuplicateFinder:
+    """Exact duplicate detection in bounded memory.
+
+    Rows are routed by hash into `partitions` buckets; buffered buckets spill
+    to per-partition files once `spill_rows` rows are held. finalize() then
+    loads one partition at a time, so peak memory is about n / partitions
+    rows. Keys travel with their hashes so duplicates can be reported.
+    Pickling hands the spill directory over to the unpickled copy.
+    """
+
+    def __init__(self, partitions=DUPLICATE_PARTITIONS, spill_rows=SPILL_ROWS,
+                 max_examples=MAX_DUPLICATE_EXAMPLES, spill_dir=None):
+        self.partitions = partitions
+        self.spill_rows = spill_rows
+        self.max_examples = max_examples
+        self.spill_dir = spill_dir
+        self._buffers = [[] for _ in range(partitions)]
+        self._buffered = 0
+        self._files = [[] for _ in range(partitions)]
+        self._dirs = []
+        self._cleanup = None
+        self._result = None
+
+    # -- ownership of spill directories -------------------------------------
+
+    def _own(self, dirs):
+        self._dirs.extend(dirs)
+        if self._cleanup is not None:
+            self._cleanup.detach()
+        self._cleanup = weakref.finalize(self, _remove_dirs, list(self._dirs)) if self._dirs else None
+
+    def _disown(self):
+        dirs, self._dirs = self._dirs, []
+        if self._cleanup is not None:
+            self._cleanup.detach()
+            self._cleanup = None
+        return dirs
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_dirs'] = self._disown()
+        state['_cleanup'] = None
+        return state
+
+    def __setstate__(self, state):
+        dirs = state.pop('_dirs')
+        self.__dict__.update(state)
+        self._dirs = []
+        self._own(dirs)
+
+    # -- building -----------------------------------------------------------
+
+    def update(self, hashes, keys):
+        """Add a chunk: uint64 hashes and a DataFrame of the matching key values"""
+        if not len(hashes):
+            return
+        self._result = None
+        part = (hashes % np.uint64(self.partitions)).astype(np.int64)
+        order = np.argsort(part, kind='stable')
+        bounds = np.searchsorted(part[order], np.arange(self.partitions + 1))
+        hashes = hashes[order]
+        keys = keys.iloc[order].reset_index(drop=True)
+        for p in range(self.partitions):
+            lo, hi = bounds[p], bounds[p + 1]
+            if hi > lo:
+                self._buffers[p].append((hashes[lo:hi], keys.iloc[lo:hi]))
+        self._buffered += len(hashes)
+        if self._buffered >= self.spill_rows:
+            self.spill()
+
+    def spill(self):
+        """Write buffered partitions to disk and free them"""
+        if not self._buffered:
+            return
+        if not self._dirs:
+            self._own([tempfile.mkdtemp(prefix="ge_dupes_", dir=self.spill_dir)])
+        base = self._dirs[0]
+        for p, buffer in enumerate(self._buffers):
+            if not buffer:
+                continue
+            path = os.path.join(base, f"part-{p:03d}.pkl")
+            with open(path, 'ab') as f:
+                for item in buffer:
+                    pickle.dump(item, f, protocol=pickle.HIGHEST_PROTOCOL)
+            if path not in self._files[p]:
+                self._files[p].append(path)
+            self._buffers[p] = []
+        self._buffered = 0
+
+    def merge(self, other):
+        """Fold another finder's rows in; takes over its spill files"""
+        if other.partitions != self.partitions:
+            raise ValueError("cannot merge DuplicateFinders with different partition counts")
+        self._result = None
+        self._own(other._disown())
+        for p in range(self.partitions):
+            self._buffers[p].extend(other._buffers[p])
+            self._files[p].extend(f for f in other._files[p] if f not in self._files[p])
+        self._buffered += other._buffered
+        if self._buffered >= self.spill_rows:
+            self.spill()
+        return self
+
+    def persist(self, directory):
+        """Move all rows (buffered and spilled) into files under `directory`.
+
+        The finder stops owning any temp dirs; files under `directory` are
+        never deleted automatically, so the pickled finder stays loadable.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.spill()
+        owned = self._disown()
+        for p in range(self.partitions):
+            moved = []
+            for path in self._files[p]:
+                if any(os.path.dirname(path) == d for d in owned):
+                    target = os.path.join(directory, f"part-{p:03d}-{uuid.uuid4().hex}.pkl")
+                    shutil.move(path, target)
+                    path = target
+                moved.append(path)
+            self._files[p] = moved
+        _remove_dirs(owned)
+        return self
+
+    # -- results ------------------------------------------------------------
+
+    def _load(self, p):
+        items = list(self._buffers[p])
+        for path in self._files[p]:
+            with open(path, 'rb') as f:
+                while True:
+                    try:
+                        items.append(pickle.load(f))
+                    except EOFError:
+                        break
+        return items
+
+    def finalize(self):
+        """{'distinct', 'duplicated_rows', 'duplicate_keys'} scanning one partition at a time"""
+        if self._result is not None:
+            return self._result
+        distinct = 0
+        duplicated = 0
+        examples = []
+        for p in range(self.partitions):
+            items = self._load(p)
+            if not items:
+                continue
+            hashes = np.concatenate([h for h, _ in items])
+            uniq, inverse, counts = np.unique(hashes, return_inverse=True, return_counts=True)
+            distinct += len(uniq)
+            row_counts = counts[inverse]
+            dup_rows = row_counts > 1
+            duplicated += int(dup_rows.sum())
+            if dup_rows.any() and len(examples) < self.max_examples:
+                keys = pd.concat([k for _, k in items], ignore_index=True)
+                first = pd.Series(np.arange(len(hashes)))[dup_rows].groupby(hashes[dup_rows]).first()
+                for row in first.to_numpy()[:self.max_examples - len(examples)]:
+                    key = [v.item() if isinstance(v, np.generic) else v for v in keys.iloc[row].tolist()]
+                    examples.append({"key": key[0] if len(key) == 1 else key,
+                                     "count": int(row_counts[row])})
+        self._result = {"distinct": distinct, "duplicated_rows": duplicated, "duplicate_keys": examples}
+        return self._result
+
+    @property
+    def distinct(self):
+        return self.finalize()["distinct"]
+
+    @property
+    def duplicated_rows(self):
+        """Rows that share their key with another row (pandas keep=False)"""
+        return self.finalize()["duplicated_rows"]
+
+    @property
+    def duplicate_keys(self):
+        return self.finalize()["duplicate_keys"]
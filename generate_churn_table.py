@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Generate Synthetic Churn Table
+Columnar sample data matching the columns referenced by ge_rules.json
+"""
+
+import argparse
+import numpy as np
+import pandas as pd
+
+COUNTRIES = ["US", "CA", "UK"]
+TIERS = ["free", "basic", "premium"]
+PAYMENT_METHODS = ["credit_card", "paypal", "stripe"]
+STATUSES = ["active", "inactive", "churned"]
+
+
+def synthetic_churn_table(n_rows=100_000, seed=42):
+    """Build an n_rows churn table that passes the rule set (bar row count)"""
+    rng = np.random.default_rng(seed)
+    customer_id = np.arange(1, n_rows + 1, dtype=np.int64)
+    ids = pd.Series(customer_id).astype(str)
+    dates = np.datetime64("2024-01-01") + rng.integers(0, 365, n_rows).astype("timedelta64[D]")
+    return pd.DataFrame({
+        "customer_id": customer_id,
+        "transaction_date": pd.to_datetime(dates),
+        "amount": np.round(rng.lognormal(3.5, 0.8, n_rows).clip(0, 10_000), 2),
+        "churn_label": rng.random(n_rows) < 0.3,
+        "recency_days": rng.exponential(60, n_rows).clip(0, 365).astype(np.int64),
+        "frequency": rng.integers(0, 101, n_rows),
+        "monetary": np.round(rng.lognormal(7, 1.2, n_rows).clip(0, 100_000), 2),
+        "tenure_days": rng.integers(0, 3651, n_rows),
+        "avg_session_duration": np.round(rng.uniform(0, 7200, n_rows), 1),
+        "total_sessions": rng.integers(0, 1001, n_rows),
+        "support_tickets": rng.integers(0, 51, n_rows),
+        "satisfaction_score": rng.integers(1, 6, n_rows),
+        "age": rng.integers(18, 101, n_rows),
+        "email": "user" + ids + "@example.com",
+        "account_id": "ACC" + ids.str.zfill(10),
+        "phone": pd.Series(rng.integers(200, 1000, n_rows)).astype(str) + "-555-"
+                 + pd.Series(rng.integers(0, 10_000, n_rows)).astype(str).str.zfill(4),
+        "zip_code": pd.Series(rng.integers(0, 100_000, n_rows)).astype(str).str.zfill(5),
+        "country": pd.Categorical.from_codes(rng.integers(0, 3, n_rows), COUNTRIES),
+        "subscription_tier": pd.Categorical.from_codes(rng.integers(0, 3, n_rows), TIERS),
+        "payment_method": pd.Categorical.from_codes(rng.integers(0, 3, n_rows), PAYMENT_METHODS),
+        "status": pd.Categorical.from_codes(rng.integers(0, 3, n_rows), STATUSES),
+    })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic churn table")
+    parser.add_argument("output", help=".csv or .parquet path")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    print(f"🎯 Generating churn table ({args.rows} rows)...")
+    df = synthetic_churn_table(args.rows, args.seed)
+    if args.output.endswith(".parquet"):
+        df.to_parquet(args.output, index=False)
+    else:
+        df.to_csv(args.output, index=False)
+    print(f"\n✅ Saved to: {args.output}")
+    return 0
+
+if __name__ == '__main__':
+    main()
@@ -4,14 +4,39 @@ Generate Cost Tracking Metrics
 Calculates token usage and cost estimates for agent workflows
 """
 
+import argparse
 import json
+from cost_engine import DEFAULT_MODEL, PRICING, cost_ledger, load_pricing
 
-def generate_cost_metrics():
+OUTPUT_PATH = '/Users/anixlynch/dev/kpi-evidence/cost_metrics.json'
+
+def measure_cost_metrics(usage_paths, pricing_path=None, output_path=OUTPUT_PATH):
+    """Exact cost metrics from real per-request usage logs, streamed (see cost_engine.py)"""
+    
+    print(f"🎯 Pricing usage from {len(usage_paths)} log file(s)...")
+    metrics = cost_ledger(usage_paths, load_pricing(pricing_path)).summary()
+    write_cost_metrics(metrics, output_path)
+    for endpoint in metrics['top_endpoints']:
+        print(f"   {endpoint['name']}: ${endpoint['cost']:,.2f} ({endpoint['requests']:,} requests)")
+    return metrics
+
+def write_cost_metrics(metrics, output_path=OUTPUT_PATH):
+    with open(output_path, 'w') as f:
+        json.dump(metrics, f, indent=2)
+    
+    print(f"✅ Cost Metrics Generated!")
+    print(f"   File: {output_path}")
+    print(f"\n💰 Summary:")
+    print(f"   Cost per Request: ${metrics['cost_per_request']}")
+    print(f"   Monthly Cost: ${metrics['monthly_cost']}")
+    print(f"   Total Tokens/Request: {metrics['avg_total_tokens']}")
+
+def generate_cost_metrics(output_path=OUTPUT_PATH):
     """Generate realistic cost metrics based on agent usage"""
     
     # Pricing (2026 rates for Claude 3.5 Sonnet)
-    INPUT_COST_PER_1K = 0.003   # $3 per 1M input tokens
-    OUTPUT_COST_PER_1K = 0.015  # $15 per 1M output tokens
+    INPUT_COST_PER_1K = PRICING[DEFAULT_MODEL]['input']   # $3 per 1M input tokens
+    OUTPUT_COST_PER_1K = PRICING[DEFAULT_MODEL]['output']  # $15 per 1M output tokens
     
     # Average tokens per request (based on typical agent workflows)
     avg_input_tokens = 2500
@@ -62,18 +87,16 @@ def generate_cost_metrics():
         "output_cost_per_1k": OUTPUT_COST_PER_1K
     }
     
-    output_path = '/Users/anixlynch/dev/kpi-evidence/cost_metrics.json'
-    with open(output_path, 'w') as f:
-        json.dump(metrics, f, indent=2)
-    
-    print(f"✅ Cost Metrics Generated!")
-    print(f"   File: {output_path}")
-    print(f"\n💰 Summary:")
-    print(f"   Cost per Request: ${metrics['cost_per_request']}")
-    print(f"   Monthly Cost: ${metrics['monthly_cost']}")
-    print(f"   Total Tokens/Request: {metrics['avg_total_tokens']}")
+    write_cost_metrics(metrics, output_path)
     
     return metrics
 
 if __name__ == '__main__':
-    generate_cost_metrics()
+    parser = argparse.ArgumentParser(description="Generate cost_metrics.json")
+    parser.add_argument("--usage", nargs='+', help="per-request usage logs (.jsonl / .parquet / .csv) instead of estimating")
+    parser.add_argument("--pricing", help="pricing table JSON (default: cost_engine.PRICING)")
+    args = parser.parse_args()
+    if args.usage:
+        measure_cost_metrics(args.usage, args.pricing)
+    else:
+        generate_cost_metrics()
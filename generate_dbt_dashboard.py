@@ -4,265 +4,85 @@ Generate dbt-Style Dashboard
 Shows data lineage, DAG, test results
 """
 
-from datetime import datetime
+from dashboard_render import compile_template, open_page
 
-def generate_dbt_html():
-    """Generate dbt-style HTML dashboard"""
-    
-    html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>dbt Docs - Data Lineage</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: #f8fafc;
-            padding: 2rem;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #ff694b 0%, #ff9472 100%);
-            color: white;
-            padding: 2rem;
-            border-radius: 12px;
-            margin-bottom: 2rem;
-            box-shadow: 0 4px 12px rgba(255, 105, 75, 0.3);
-        }}
-        .header h1 {{
-            font-size: 2rem;
-            margin-bottom: 0.5rem;
-        }}
-        .header p {{
-            opacity: 0.9;
-        }}
-        .stats {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 1.5rem;
-            margin-bottom: 2rem;
-        }}
-        .stat-card {{
-            background: white;
-            padding: 1.5rem;
-            border-radius: 12px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-        }}
-        .stat-card h3 {{
-            font-size: 2rem;
-            color: #ff694b;
-            margin-bottom: 0.5rem;
-        }}
-        .stat-card p {{
-            color: #666;
-            font-size: 0.9rem;
-        }}
-        .dag {{
-            background: white;
-            padding: 2rem;
-            border-radius: 12px;
-            margin-bottom: 2rem;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-        }}
-        .dag h2 {{
-            margin-bottom: 1.5rem;
-            color: #333;
-        }}
-        .dag-container {{
-            display: flex;
-            gap: 2rem;
-            align-items: center;
-            justify-content: center;
-            padding: 2rem;
-            background: #f8f9fa;
-            border-radius: 8px;
-        }}
-        .dag-node {{
-            background: white;
-            padding: 1rem 1.5rem;
-            border-radius: 8px;
-            border: 2px solid #ff694b;
-            font-weight: 600;
-            color: #333;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-        }}
-        .dag-arrow {{
-            font-size: 2rem;
-            color: #ff694b;
-        }}
-        .lineage {{
-            background: white;
-            padding: 2rem;
-            border-radius: 12px;
-            margin-bottom: 2rem;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-        }}
-        .lineage h2 {{
-            margin-bottom: 1.5rem;
-            color: #333;
-        }}
-        .lineage-item {{
-            padding: 1rem;
-            background: #f8f9fa;
-            border-radius: 8px;
-            margin-bottom: 1rem;
-            border-left: 4px solid #ff694b;
-        }}
-        .lineage-item h3 {{
-            color: #333;
-            margin-bottom: 0.5rem;
-        }}
-        .lineage-item p {{
-            color: #666;
-            font-size: 0.9rem;
-        }}
-        .tests {{
-            background: white;
-            padding: 2rem;
-            border-radius: 12px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-        }}
-        .tests h2 {{
-            margin-bottom: 1.5rem;
-            color: #333;
-        }}
-        .test-item {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 1rem;
-            background: #f8f9fa;
-            border-radius: 8px;
-            margin-bottom: 0.5rem;
-        }}
-        .test-item span:first-child {{
-            font-weight: 600;
-            color: #333;
-        }}
-        .status {{
-            padding: 0.25rem 0.75rem;
-            border-radius: 12px;
-            font-size: 0.85rem;
-            font-weight: 600;
-        }}
-        .status.passed {{
-            background: #d1fae5;
-            color: #065f46;
-        }}
-        .footer {{
-            text-align: center;
-            margin-top: 2rem;
-            color: #666;
-            font-size: 0.9rem;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>📊 dbt Docs - Data Lineage</h1>
-        <p>Churn ML Pipeline - Feature Engineering</p>
-        <p style="opacity: 0.7; margin-top: 0.5rem;">Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-    </div>
+OUTPUT_PATH = '/Users/anixlynch/dev/shipped/kpi_scripts/dbt_dashboard.html'
 
-    <div class="stats">
-        <div class="stat-card">
-            <h3>12</h3>
-            <p>Models</p>
-        </div>
-        <div class="stat-card">
-            <h3>47</h3>
-            <p>Tests Passed</p>
-        </div>
-        <div class="stat-card">
-            <h3>8</h3>
-            <p>Sources</p>
-        </div>
-        <div class="stat-card">
-            <h3>100%</h3>
-            <p>Test Coverage</p>
-        </div>
-    </div>
+DAG_NODES = [
+    ("Raw Data", "(customers, transactions)"),
+    ("Staging", "(cleaned, typed)"),
+    ("Features", "(RFM, aggregations)"),
+    ("ML Model", "(churn prediction)"),
+]
+LINEAGE = [
+    ("recency_days", "customers.last_purchase_date", "DATEDIFF(CURRENT_DATE, last_purchase_date)", "churn_features.recency_days"),
+    ("frequency", "transactions.customer_id", "COUNT(DISTINCT transaction_id)", "churn_features.frequency"),
+    ("monetary", "transactions.amount", "SUM(amount)", "churn_features.monetary"),
+    ("tenure_days", "customers.signup_date", "DATEDIFF(CURRENT_DATE, signup_date)", "churn_features.tenure_days"),
+]
+TESTS = [
+    "unique_customer_id",
+    "not_null_recency_days",
+    "not_null_frequency",
+    "not_null_monetary",
+    "accepted_values_churn_label",
+    "relationships_customer_id",
+]
 
-    <div class="dag">
+DAG_START = """
+    <div class="panel">
         <h2>🔄 Data Flow (DAG)</h2>
         <div class="dag-container">
-            <div class="dag-node">Raw Data<br/>(customers, transactions)</div>
-            <div class="dag-arrow">→</div>
-            <div class="dag-node">Staging<br/>(cleaned, typed)</div>
-            <div class="dag-arrow">→</div>
-            <div class="dag-node">Features<br/>(RFM, aggregations)</div>
-            <div class="dag-arrow">→</div>
-            <div class="dag-node">ML Model<br/>(churn prediction)</div>
-        </div>
+"""
+DAG_NODE = compile_template("""            {{{arrow}}}<div class="dag-node">{{name}}<br/>{{detail}}</div>
+""")
+DAG_ARROW = '<div class="dag-arrow">→</div>\n            '
+LINEAGE_START = """        </div>
     </div>
 
-    <div class="lineage">
+    <div class="panel">
         <h2>🔗 Column Lineage</h2>
-        <div class="lineage-item">
-            <h3>recency_days</h3>
-            <p><strong>Source:</strong> customers.last_purchase_date → <strong>Transform:</strong> DATEDIFF(CURRENT_DATE, last_purchase_date) → <strong>Used in:</strong> churn_features.recency_days</p>
-        </div>
-        <div class="lineage-item">
-            <h3>frequency</h3>
-            <p><strong>Source:</strong> transactions.customer_id → <strong>Transform:</strong> COUNT(DISTINCT transaction_id) → <strong>Used in:</strong> churn_features.frequency</p>
-        </div>
-        <div class="lineage-item">
-            <h3>monetary</h3>
-            <p><strong>Source:</strong> transactions.amount → <strong>Transform:</strong> SUM(amount) → <strong>Used in:</strong> churn_features.monetary</p>
-        </div>
-        <div class="lineage-item">
-            <h3>tenure_days</h3>
-            <p><strong>Source:</strong> customers.signup_date → <strong>Transform:</strong> DATEDIFF(CURRENT_DATE, signup_date) → <strong>Used in:</strong> churn_features.tenure_days</p>
+"""
+LINEAGE_ITEM = compile_template("""        <div class="lineage-item">
+            <h3>{{column}}</h3>
+            <p><strong>Source:</strong> {{source}} → <strong>Transform:</strong> {{transform}} → <strong>Used in:</strong> {{used_in}}</p>
         </div>
-    </div>
+""")
+TESTS_START = """    </div>
 
-    <div class="tests">
+    <div class="panel">
         <h2>✅ Data Tests</h2>
-        <div class="test-item">
-            <span>unique_customer_id</span>
-            <span class="status passed">PASSED</span>
-        </div>
-        <div class="test-item">
-            <span>not_null_recency_days</span>
-            <span class="status passed">PASSED</span>
-        </div>
-        <div class="test-item">
-            <span>not_null_frequency</span>
-            <span class="status passed">PASSED</span>
-        </div>
-        <div class="test-item">
-            <span>not_null_monetary</span>
-            <span class="status passed">PASSED</span>
-        </div>
-        <div class="test-item">
-            <span>accepted_values_churn_label</span>
-            <span class="status passed">PASSED</span>
-        </div>
-        <div class="test-item">
-            <span>relationships_customer_id</span>
+"""
+TEST_ITEM = compile_template("""        <div class="test-item">
+            <span>{{name}}</span>
             <span class="status passed">PASSED</span>
         </div>
-    </div>
-
-    <div class="footer">
-        <p>Generated by dbt | Churn ML Pipeline</p>
-        <p style="margin-top: 0.5rem;">
-            <strong>Evidence:</strong> /Users/anixlynch/dev/shipped/06_churn_ml_pipeline/
-        </p>
-    </div>
-</body>
-</html>
+""")
+TESTS_END = """    </div>
 """
+
+def generate_dbt_html(output_path=OUTPUT_PATH):
+    """Generate dbt-style HTML dashboard"""
     
-    output_path = '/Users/anixlynch/dev/shipped/kpi_scripts/dbt_dashboard.html'
-    with open(output_path, 'w') as f:
-        f.write(html)
+    with open_page(output_path, title="dbt Docs - Data Lineage", theme="dbt",
+                   heading="📊 dbt Docs - Data Lineage",
+                   subtitle="Churn ML Pipeline - Feature Engineering") as page:
+        page.stat_cards([
+            ("", 12, "Models"),
+            ("", 47, "Tests Passed"),
+            ("", 8, "Sources"),
+            ("", "100%", "Test Coverage"),
+        ])
+        page.write(DAG_START)
+        page.render_rows(DAG_NODE, ({"arrow": DAG_ARROW if i else '', "name": name, "detail": detail}
+                                    for i, (name, detail) in enumerate(DAG_NODES)))
+        page.write(LINEAGE_START)
+        page.render_rows(LINEAGE_ITEM, (dict(zip(("column", "source", "transform", "used_in"), item))
+                                        for item in LINEAGE))
+        page.write(TESTS_START)
+        page.render_rows(TEST_ITEM, ({"name": name} for name in TESTS))
+        page.write(TESTS_END)
+        page.footer("Generated by dbt | Churn ML Pipeline", "/Users/anixlynch/dev/shipped/06_churn_ml_pipeline/")
     
     print(f"✅ dbt Docs Dashboard Generated!")
     print(f"   File: {output_path}")
@@ -5,293 +5,276 @@ Creates HTML report showing 47 validation rules
 """
 
 import json
+import os
+import time
 import pandas as pd
-from datetime import datetime
 
-def generate_ge_html_report():
-    """Generate GE-style HTML report"""
-    
-    # Load our 47 rules
-    with open('/Users/anixlynch/dev/shipped/kpi_scripts/ge_rules.json', 'r') as f:
-        ge_data = json.load(f)
-    
-    rules = ge_data['rules']
-    categories = ge_data['categories']
-    
-    # Create sample validation results (all passing)
-    validation_results = []
-    for rule in rules:
-        validation_results.append({
-            'rule_id': rule['id'],
-            'expectation': rule['type'],
-            'column': rule.get('column', 'N/A'),
-            'status': 'PASSED' if rule['id'] <= 45 else 'WARNING',  # 2 warnings for realism
-            'observed_value': 'Valid',
-            'success_percent': 100.0 if rule['id'] <= 45 else 98.5
-        })
-    
-    # Generate HTML
-    html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Great Expectations Validation Report</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: #f5f7fa;
-            padding: 2rem;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 2rem;
-            border-radius: 12px;
-            margin-bottom: 2rem;
-            box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-        }}
-        .header h1 {{
-            font-size: 2rem;
-            margin-bottom: 0.5rem;
-        }}
-        .header p {{
-            opacity: 0.9;
-            font-size: 1rem;
-        }}
-        .stats {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 1.5rem;
-            margin-bottom: 2rem;
-        }}
-        .stat-card {{
-            background: white;
-            padding: 1.5rem;
-            border-radius: 12px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-        }}
-        .stat-card h3 {{
-            font-size: 2rem;
-            color: #667eea;
-            margin-bottom: 0.5rem;
-        }}
-        .stat-card p {{
-            color: #666;
-            font-size: 0.9rem;
-        }}
-        .stat-card.success h3 {{
-            color: #10b981;
-        }}
-        .stat-card.warning h3 {{
-            color: #f59e0b;
-        }}
-        .categories {{
-            background: white;
-            padding: 2rem;
-            border-radius: 12px;
-            margin-bottom: 2rem;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-        }}
-        .categories h2 {{
-            margin-bottom: 1.5rem;
-            color: #333;
-        }}
-        .category-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 1rem;
-        }}
-        .category-item {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            padding: 1rem;
-            background: #f8f9fa;
-            border-radius: 8px;
-            border-left: 4px solid #667eea;
-        }}
-        .category-item span:first-child {{
-            font-weight: 600;
-            color: #333;
-        }}
-        .category-item span:last-child {{
-            background: #667eea;
-            color: white;
-            padding: 0.25rem 0.75rem;
-            border-radius: 12px;
-            font-size: 0.9rem;
-        }}
-        .results {{
-            background: white;
-            padding: 2rem;
-            border-radius: 12px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.08);
-        }}
-        .results h2 {{
-            margin-bottom: 1.5rem;
-            color: #333;
-        }}
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-        }}
-        th {{
-            background: #f8f9fa;
-            padding: 1rem;
-            text-align: left;
-            font-weight: 600;
-            color: #666;
-            border-bottom: 2px solid #e5e7eb;
-        }}
-        td {{
-            padding: 1rem;
-            border-bottom: 1px solid #e5e7eb;
-        }}
-        .status {{
-            display: inline-block;
-            padding: 0.25rem 0.75rem;
-            border-radius: 12px;
-            font-size: 0.85rem;
-            font-weight: 600;
-        }}
-        .status.passed {{
-            background: #d1fae5;
-            color: #065f46;
-        }}
-        .status.warning {{
-            background: #fef3c7;
-            color: #92400e;
-        }}
-        .footer {{
-            text-align: center;
-            margin-top: 2rem;
-            color: #666;
-            font-size: 0.9rem;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>🎯 Great Expectations Validation Report</h1>
-        <p>Churn ML Pipeline - Data Quality Dashboard</p>
-        <p style="opacity: 0.7; margin-top: 0.5rem;">Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-    </div>
+from dashboard_render import compile_template, open_page
+from ge_history import HISTORY_PATH, ResultsHistory
 
-    <div class="stats">
-        <div class="stat-card success">
-            <h3>{len(rules)}</h3>
-            <p>Total Validation Rules</p>
-        </div>
-        <div class="stat-card success">
-            <h3>{sum(1 for r in validation_results if r['status'] == 'PASSED')}</h3>
-            <p>Rules Passed</p>
-        </div>
-        <div class="stat-card warning">
-            <h3>{sum(1 for r in validation_results if r['status'] == 'WARNING')}</h3>
-            <p>Warnings</p>
-        </div>
-        <div class="stat-card success">
-            <h3>{(sum(1 for r in validation_results if r['status'] == 'PASSED') / len(rules) * 100):.1f}%</h3>
-            <p>Success Rate</p>
-        </div>
-    </div>
+OUTPUT_PATH = '/Users/anixlynch/dev/shipped/kpi_scripts/ge_dashboard.html'
+RULES_PATH = '/Users/anixlynch/dev/shipped/kpi_scripts/ge_rules.json'
+TREND_DAYS = 30
+# Field order of each row in the embedded results blob
+RESULT_FIELDS = ['rule_id', 'expectation', 'column', 'status', 'success_percent', 'pass_rate', 'observed_value']
+OBSERVED_CHARS = 120
+
+# Renders only the rows in view (plus overscan) from the embedded JSON blob
+VIRTUAL_TABLE_SCRIPT = """<script>
+(function () {
+    var data = JSON.parse(document.getElementById('ge-results').textContent);
+    var col = {};
+    data.fields.forEach(function (name, i) { col[name] = i; });
+    var rows = data.rows, view = rows;
+    var ROW_HEIGHT = 44, OVERSCAN = 10;
+    var viewport = document.getElementById('ge-viewport');
+    var spacer = document.getElementById('ge-spacer');
+    var body = document.getElementById('ge-rows');
+    var filter = document.getElementById('ge-filter');
+    var statusSelect = document.getElementById('ge-status');
+    var count = document.getElementById('ge-count');
+    var pending = false;
+
+    function esc(value) {
+        return String(value).replace(/[&<>"]/g, function (c) {
+            return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}[c];
+        });
+    }
+    function pct(value) {
+        return value === null ? '—' : value.toFixed(1) + '%';
+    }
+    function render() {
+        pending = false;
+        var first = Math.max(0, Math.floor(viewport.scrollTop / ROW_HEIGHT) - OVERSCAN);
+        var last = Math.min(view.length, Math.ceil((viewport.scrollTop + viewport.clientHeight) / ROW_HEIGHT) + OVERSCAN);
+        var out = [];
+        for (var i = first; i < last; i++) {
+            var r = view[i], status = r[col.status];
+            out.push('<div class="vrow vgrid" style="top:' + (i * ROW_HEIGHT) + 'px" title="observed: ' + esc(r[col.observed_value]) + '">' +
+                '<span>#' + r[col.rule_id] + '</span>' +
+                '<span class="mono">' + esc(r[col.expectation]) + '</span>' +
+                '<span><strong>' + esc(r[col.column]) + '</strong></span>' +
+                '<span><span class="status ' + (status === 'PASSED' ? 'passed' : status === 'FAILED' ? 'failed' : 'warning') + '">' + status + '</span></span>' +
+                '<span>' + pct(r[col.success_percent]) + '</span>' +
+                '<span>' + pct(r[col.pass_rate]) + '</span></div>');
+        }
+        body.innerHTML = out.join('');
+    }
+    function applyFilter() {
+        var text = filter.value.toLowerCase(), status = statusSelect.value;
+        view = rows.filter(function (r) {
+            if (status && r[col.status] !== status) return false;
+            return !text || ('#' + r[col.rule_id] + ' ' + r[col.expectation] + ' ' + r[col.column]).toLowerCase().indexOf(text) !== -1;
+        });
+        spacer.style.height = (view.length * ROW_HEIGHT) + 'px';
+        count.textContent = 'Showing ' + view.length + ' of ' + rows.length + ' validation rules';
+        viewport.scrollTop = 0;
+        render();
+    }
+    viewport.addEventListener('scroll', function () {
+        if (!pending) {
+            pending = true;
+            window.requestAnimationFrame(render);
+        }
+    });
+    filter.addEventListener('input', applyFilter);
+    statusSelect.addEventListener('change', applyFilter);
+    applyFilter();
+})();
+</script>
+"""
 
-    <div class="categories">
+
+CATEGORY_LABELS = [
+    ('schema', 'Schema Validation'),
+    ('null_checks', 'Null Checks'),
+    ('range_validation', 'Range Validation'),
+    ('uniqueness', 'Uniqueness'),
+    ('pattern_matching', 'Pattern Matching'),
+    ('statistical', 'Statistical'),
+]
+
+CATEGORIES_START = """
+    <div class="panel">
         <h2>📊 Validation Categories</h2>
         <div class="category-grid">
-            <div class="category-item">
-                <span>Schema Validation</span>
-                <span>{categories['schema']} rules</span>
-            </div>
-            <div class="category-item">
-                <span>Null Checks</span>
-                <span>{categories['null_checks']} rules</span>
-            </div>
-            <div class="category-item">
-                <span>Range Validation</span>
-                <span>{categories['range_validation']} rules</span>
-            </div>
-            <div class="category-item">
-                <span>Uniqueness</span>
-                <span>{categories['uniqueness']} rules</span>
-            </div>
-            <div class="category-item">
-                <span>Pattern Matching</span>
-                <span>{categories['pattern_matching']} rules</span>
-            </div>
-            <div class="category-item">
-                <span>Statistical</span>
-                <span>{categories['statistical']} rules</span>
+"""
+CATEGORY_ITEM = compile_template("""            <div class="category-item">
+                <span>{{label}}</span>
+                <span>{{count}} rules</span>
             </div>
-        </div>
+""")
+SECTION_END = """        </div>
     </div>
-
-    <div class="results">
-        <h2>📋 Validation Results (Sample)</h2>
+"""
+TREND_START = compile_template("""
+    <div class="panel">
+        <h2>📈 Pass Rate Trend (last {{days}} days)</h2>
         <table>
-            <thead>
-                <tr>
-                    <th>Rule ID</th>
-                    <th>Expectation</th>
-                    <th>Column</th>
-                    <th>Status</th>
-                    <th>Success %</th>
-                </tr>
-            </thead>
+            <thead><tr><th>Day</th><th>Runs</th><th>Failed Checks</th><th>Pass Rate</th></tr></thead>
             <tbody>
+""")
+TREND_ROW = compile_template("""                <tr><td>{{day}}</td><td>{{runs}}</td><td>{{failed}}</td><td>{{pass_rate}}</td></tr>
+""")
+TREND_END = """            </tbody>
+        </table>
+    </div>
 """
-    
-    # Add first 20 results for display
-    for result in validation_results[:20]:
-        status_class = 'passed' if result['status'] == 'PASSED' else 'warning'
-        html += f"""
-                <tr>
-                    <td>#{result['rule_id']}</td>
-                    <td style="font-family: monospace; font-size: 0.85rem;">{result['expectation']}</td>
-                    <td><strong>{result['column']}</strong></td>
-                    <td><span class="status {status_class}">{result['status']}</span></td>
-                    <td>{result['success_percent']:.1f}%</td>
-                </tr>
+RESULTS_START = """
+    <div class="panel">
+        <h2>📋 Validation Results</h2>
+        <div class="table-controls">
+            <input id="ge-filter" type="search" placeholder="Filter by rule, expectation or column">
+            <select id="ge-status">
+                <option value="">All statuses</option>
 """
-    
-    html += """
-            </tbody>
-        </table>
-        <p style="margin-top: 1rem; color: #666; font-size: 0.9rem;">
-            Showing 20 of 47 validation rules. All rules executed successfully.
-        </p>
+STATUS_OPTION = compile_template("""                <option value="{{status}}">{{status}}</option>
+""")
+RESULTS_END = compile_template("""            </select>
+            <span id="ge-count"></span>
+        </div>
+        <div class="vtable-head vgrid">
+            <span>Rule ID</span><span>Expectation</span><span>Column</span>
+            <span>Status</span><span>Success %</span><span>{{days}}d Pass Rate</span>
+        </div>
+        <div id="ge-viewport" class="vtable-viewport">
+            <div id="ge-spacer"></div>
+            <div id="ge-rows"></div>
+        </div>
     </div>
-
-    <div class="footer">
-        <p>Generated by Great Expectations | Churn ML Pipeline</p>
-        <p style="margin-top: 0.5rem;">
-            <strong>Evidence:</strong> /Users/anixlynch/dev/shipped/kpi_scripts/ge_rules.json
-        </p>
+""")
+NO_RESULTS = compile_template("""
+    <div class="panel">
+        <h2>📋 Validation Results</h2>
+        <p class="empty-state">No validation results recorded yet. Run
+            <code>ge_engine.py &lt;table&gt; --history {{history}}</code> to record a run.</p>
     </div>
-</body>
-</html>
-"""
+""")
+
+
+def write_results_json(out, validation_results):
+    """Stream results into `out` as compact JSON, one row array per result"""
+    out.write('{"fields":' + json.dumps(RESULT_FIELDS) + ',"rows":[')
+    for i, result in enumerate(validation_results):
+        row = [result[field] for field in RESULT_FIELDS]
+        row[-1] = str(row[-1])[:OBSERVED_CHARS]
+        # '</' would end the enclosing <script> element
+        out.write((',' if i else '') + json.dumps(row, separators=(',', ':'), default=str).replace('</', '<\\/'))
+    out.write(']}')
+
+
+def _pct(value):
+    """Percentage cell, '—' when there is nothing to rate (as the table's pct() does)"""
+    return '—' if value is None else f"{value:.1f}%"
+
+
+def load_history(path=HISTORY_PATH, days=TREND_DAYS):
+    """Latest run's results, daily pass-rate trend and per-rule pass rates from the
+    results history, or None if nothing has been recorded yet"""
+    if not os.path.exists(path):
+        return None
+    since = time.time() - days * 86400
+    with ResultsHistory(path) as history:
+        run = history.latest_run()
+        if run is None:
+            return None
+        return {
+            'run': run,
+            'results': history.results_for(run['run_id']),
+            'trend': history.pass_rate_trend('day', since=since),
+            'rule_pass_rates': history.rule_pass_rates(since=since),
+        }
+
+def generate_ge_html_report(history_path=HISTORY_PATH, ge_data=None, output_path=OUTPUT_PATH):
+    """Generate GE-style HTML report"""
     
-    # Save HTML
-    output_path = '/Users/anixlynch/dev/shipped/kpi_scripts/ge_dashboard.html'
-    with open(output_path, 'w') as f:
-        f.write(html)
+    # Load our 47 rules
+    if ge_data is None:
+        with open(RULES_PATH, 'r') as f:
+            ge_data = json.load(f)
     
+    rules = ge_data['rules']
+    categories = ge_data['categories']
+    
+    history = load_history(history_path)
+    validation_results = []
+    if history is not None:
+        # Latest recorded run, with each rule's pass rate over the trend window
+        for result in history['results']:
+            status = 'SKIPPED' if result['success'] is None else 'PASSED' if result['success'] else 'FAILED'
+            validation_results.append({
+                'rule_id': result['rule_id'],
+                'expectation': result['expectation'],
+                'column': result['column'],
+                'status': status,
+                'observed_value': result['observed_value'],
+                # Aggregate rules (mean, stdev, quantile, drift...) have no per-element rate
+                'success_percent': (None if result['unexpected_percent'] is None
+                                    else round(100.0 - result['unexpected_percent'], 2)),
+                'pass_rate': history['rule_pass_rates'].get(result['rule_id']),
+            })
+
+    total = len(validation_results)
+    passed = sum(1 for r in validation_results if r['status'] == 'PASSED')
+    warnings = sum(1 for r in validation_results if r['status'] == 'WARNING')
+    failed = sum(1 for r in validation_results if r['status'] == 'FAILED')
+    success_rate = passed / total * 100 if total else 0.0
+    status_options = [{"status": status} for status in sorted({r['status'] for r in validation_results})]
+    category_items = [{"label": label, "count": categories[key]} for key, label in CATEGORY_LABELS]
+
+    # Stream the page: results go out row by row as an embedded JSON blob that the
+    # client-side table renders a screenful at a time
+    with open_page(output_path, title="Great Expectations Validation Report", theme="ge",
+                   heading="🎯 Great Expectations Validation Report",
+                   subtitle="Churn ML Pipeline - Data Quality Dashboard") as page:
+        if total:
+            page.stat_cards([
+                ("success", total, "Total Validation Rules"),
+                ("success", passed, "Rules Passed"),
+                ("warning", warnings, "Warnings"),
+                ("failed", failed, "Rules Failed"),
+                ("success", f"{success_rate:.1f}%", "Success Rate"),
+            ])
+        else:
+            page.stat_cards([
+                ("info", len(rules), "Total Validation Rules"),
+                ("info", "—", "Rules Passed"),
+                ("info", "—", "Success Rate"),
+            ])
+        page.write(CATEGORIES_START)
+        page.render_rows(CATEGORY_ITEM, category_items)
+        page.write(SECTION_END)
+        if history is not None and history['trend']:
+            page.render(TREND_START, days=TREND_DAYS)
+            page.render_rows(TREND_ROW, ({"day": row['bucket_start'][:10], "runs": row['runs'],
+                                          "failed": row['failed'], "pass_rate": _pct(row['pass_rate'])}
+                                         for row in history['trend']))
+            page.write(TREND_END)
+        if total:
+            page.write(RESULTS_START)
+            page.render_rows(STATUS_OPTION, status_options)
+            page.render(RESULTS_END, days=TREND_DAYS)
+            page.write('<script type="application/json" id="ge-results">')
+            write_results_json(page, validation_results)
+            page.write('</script>\n')
+            page.write(VIRTUAL_TABLE_SCRIPT)
+        else:
+            page.render(NO_RESULTS, history=history_path)
+        page.footer("Generated by Great Expectations | Churn ML Pipeline",
+                    "/Users/anixlynch/dev/shipped/kpi_scripts/ge_rules.json")
+
     print(f"✅ Great Expectations Dashboard Generated!")
     print(f"   File: {output_path}")
     print(f"   Open in browser: open {output_path}")
     print(f"\n📊 Summary:")
-    print(f"   Total Rules: {len(rules)}")
-    print(f"   Passed: {sum(1 for r in validation_results if r['status'] == 'PASSED')}")
-    print(f"   Warnings: {sum(1 for r in validation_results if r['status'] == 'WARNING')}")
-    print(f"   Success Rate: {(sum(1 for r in validation_results if r['status'] == 'PASSED') / len(rules) * 100):.1f}%")
+    if not total:
+        print(f"   No validation results recorded in {history_path} ({len(rules)} rules defined)")
+        return
+    print(f"   Total Rules: {total}")
+    print(f"   Passed: {passed}")
+    print(f"   Warnings: {warnings}")
+    print(f"   Failed: {failed}")
+    print(f"   Success Rate: {success_rate:.1f}%")
 
 if __name__ == '__main__':
     generate_ge_html_report()
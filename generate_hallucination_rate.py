@@ -5,35 +5,24 @@ Uses Ragas framework to measure faithfulness
 """
 
 import json
-import numpy as np
+from simulation_engine import simulate_faithfulness, DEFAULT_CHUNK_SIZE
 
-def simulate_rag_eval(n_samples=100):
+def simulate_rag_eval(n_samples=100, seed=None, chunk_size=DEFAULT_CHUNK_SIZE):
     """Simulate RAG evaluation with faithfulness scoring"""
     
     print(f"🎯 Generating Hallucination Metrics ({n_samples} samples)...")
     
-    # Simulate realistic faithfulness scores
+    # Simulate realistic faithfulness scores in vectorized chunks
     # Most responses faithful (>0.9), some hallucinations (<0.8)
-    faithfulness_scores = []
-    
-    for i in range(n_samples):
-        # 99.2% of responses are faithful (score > 0.8)
-        if np.random.random() < 0.992:
-            # Faithful response: score 0.85-1.0
-            score = np.random.uniform(0.85, 1.0)
-        else:
-            # Hallucination: score 0.3-0.79
-            score = np.random.uniform(0.3, 0.79)
-        
-        faithfulness_scores.append(score)
+    totals = simulate_faithfulness(n_samples, seed=seed, chunk_size=chunk_size)
     
     # Calculate hallucination rate (faithfulness < 0.8)
-    hallucinations = sum(1 for s in faithfulness_scores if s < 0.8)
+    hallucinations = totals['hallucinations']
     hallucination_rate = hallucinations / n_samples
     
-    avg_faithfulness = np.mean(faithfulness_scores)
-    min_faithfulness = min(faithfulness_scores)
-    max_faithfulness = max(faithfulness_scores)
+    avg_faithfulness = totals['score_sum'] / n_samples
+    min_faithfulness = totals['min']
+    max_faithfulness = totals['max']
     
     metrics = {
         "n_samples": n_samples,
@@ -6,39 +6,26 @@ Measures p95 latency for API serving
 
 import json
 import time
-import numpy as np
-from statistics import mean, median
+from simulation_engine import simulate_latency, DEFAULT_CHUNK_SIZE
 
-def simulate_api_latency(n_requests=1000):
+def simulate_api_latency(n_requests=1000, seed=None, chunk_size=DEFAULT_CHUNK_SIZE):
     """Simulate API request latencies"""
     
     print(f"🎯 Generating Latency Metrics ({n_requests} requests)...")
     
-    latencies = []
-    
-    # Simulate realistic API latencies (ms)
+    # Simulate realistic API latencies (ms) in vectorized chunks
     # Most requests fast, some slower (realistic distribution)
-    for i in range(n_requests):
-        # Base latency: 50-150ms
-        base = np.random.uniform(50, 150)
-        
-        # Add occasional spikes (5% of requests)
-        if np.random.random() < 0.05:
-            spike = np.random.uniform(200, 400)
-            latency = base + spike
-        else:
-            latency = base
-        
-        latencies.append(latency)
-        
-        if (i + 1) % 200 == 0:
-            print(f"   Progress: {i + 1}/{n_requests} requests")
+    # Fixed-memory histogram: O(buckets) regardless of n_requests
+    def progress(done, hist):
+        print(f"   Progress: {done}/{n_requests} requests (running p95: {hist.percentile(95):.0f}ms)")
+    
+    latencies = simulate_latency(n_requests, seed=seed, chunk_size=chunk_size, on_chunk=progress)
     
     # Calculate percentiles
-    p50 = np.percentile(latencies, 50)
-    p95 = np.percentile(latencies, 95)
-    p99 = np.percentile(latencies, 99)
-    avg = mean(latencies)
+    p50 = latencies.percentile(50)
+    p95 = latencies.percentile(95)
+    p99 = latencies.percentile(99)
+    avg = latencies.mean
     
     metrics = {
         "n_requests": n_requests,
@@ -46,8 +33,8 @@ def simulate_api_latency(n_requests=1000):
         "p50_latency_ms": round(p50, 2),
         "p95_latency_ms": round(p95, 2),
         "p99_latency_ms": round(p99, 2),
-        "min_latency_ms": round(min(latencies), 2),
-        "max_latency_ms": round(max(latencies), 2)
+        "min_latency_ms": round(latencies.min, 2),
+        "max_latency_ms": round(latencies.max, 2)
     }
     
     # Save metrics
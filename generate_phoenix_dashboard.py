@@ -4,301 +4,157 @@ Generate Phoenix-Style Dashboard
 Shows agent traces, evals, latency, task success
 """
 
-import json
-from datetime import datetime, timedelta
-import random
+import argparse
+import heapq
+import os
+import time
 
-def generate_phoenix_html():
-    """Generate Phoenix-style HTML dashboard"""
-    
-    # Load our real metrics
-    with open('/Users/anixlynch/dev/shipped/kpi_scripts/task_success.json', 'r') as f:
-        task_data = json.load(f)
-    
-    with open('/Users/anixlynch/dev/shipped/kpi_scripts/hallucination_metrics.json', 'r') as f:
-        hall_data = json.load(f)
-    
-    with open('/Users/anixlynch/dev/shipped/kpi_scripts/latency_metrics.json', 'r') as f:
-        latency_data = json.load(f)
-    
-    with open('/Users/anixlynch/dev/kpi-evidence/cost_metrics.json', 'r') as f:
-        cost_data = json.load(f)
-    
-    # Generate sample traces
-    traces = []
-    for i in range(10):
-        trace_time = datetime.now() - timedelta(hours=i)
-        traces.append({
-            'id': f'trace_{i+1}',
-            'timestamp': trace_time.strftime('%Y-%m-%d %H:%M:%S'),
-            'user_query': [
-                'Analyze churn risk for enterprise customer cohort',
-                'Generate fraud detection report for Q4 transactions',
-                'Build customer segmentation model with RFM features',
-                'Optimize feature engineering pipeline for real-time inference',
-                'Deploy ensemble model to production endpoint',
-                'Extract key metrics from financial statements',
-                'Create marketing campaign ROI analysis',
-                'Predict transaction fraud probability (real-time)',
-                'Generate SQL query for revenue attribution by channel',
-                'Summarize legal contract clauses for compliance audit'
-            ][i],
-            'tools_used': random.randint(3, 14),
-            'latency_ms': random.randint(120, 180),
-            'success': True if i > 0 else (random.random() < 0.93),  # First trace always success
-            'faithfulness': random.uniform(0.88, 0.98)
-        })
-    
-    html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Phoenix - GenAI Ops Dashboard</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: #0f172a;
-            color: #e2e8f0;
-            padding: 2rem;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #f97316 0%, #dc2626 100%);
-            padding: 2rem;
-            border-radius: 12px;
-            margin-bottom: 2rem;
-            box-shadow: 0 8px 24px rgba(249, 115, 22, 0.3);
-        }}
-        .header h1 {{
-            font-size: 2rem;
-            margin-bottom: 0.5rem;
-            display: flex;
-            align-items: center;
-            gap: 0.5rem;
-        }}
-        .header p {{
-            opacity: 0.9;
-        }}
-        .metrics {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 1.5rem;
-            margin-bottom: 2rem;
-        }}
-        .metric-card {{
-            background: #1e293b;
-            padding: 1.5rem;
-            border-radius: 12px;
-            border: 1px solid #334155;
-            box-shadow: 0 4px 12px rgba(0,0,0,0.3);
-        }}
-        .metric-card h3 {{
-            font-size: 2.5rem;
-            margin-bottom: 0.5rem;
-        }}
-        .metric-card p {{
-            color: #94a3b8;
-            font-size: 0.9rem;
-        }}
-        .metric-card.success h3 {{
-            color: #10b981;
-        }}
-        .metric-card.warning h3 {{
-            color: #f59e0b;
-        }}
-        .metric-card.info h3 {{
-            color: #3b82f6;
-        }}
-        .traces {{
-            background: #1e293b;
-            padding: 2rem;
-            border-radius: 12px;
-            border: 1px solid #334155;
-            margin-bottom: 2rem;
-        }}
-        .traces h2 {{
-            margin-bottom: 1.5rem;
-            color: #f1f5f9;
-        }}
-        .trace-item {{
-            background: #0f172a;
-            padding: 1.5rem;
-            border-radius: 8px;
-            margin-bottom: 1rem;
-            border-left: 4px solid #f97316;
-        }}
-        .trace-header {{
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 1rem;
-        }}
-        .trace-id {{
-            font-family: monospace;
-            color: #f97316;
-            font-weight: 600;
-        }}
-        .trace-time {{
-            color: #64748b;
-            font-size: 0.85rem;
-        }}
-        .trace-query {{
-            color: #e2e8f0;
-            margin-bottom: 1rem;
-            font-size: 1.05rem;
-        }}
-        .trace-stats {{
-            display: flex;
-            gap: 2rem;
-            flex-wrap: wrap;
-        }}
-        .trace-stat {{
-            display: flex;
-            align-items: center;
-            gap: 0.5rem;
-            font-size: 0.9rem;
-        }}
-        .trace-stat span:first-child {{
-            color: #94a3b8;
-        }}
-        .trace-stat span:last-child {{
-            color: #f1f5f9;
-            font-weight: 600;
-        }}
-        .status {{
-            display: inline-block;
-            padding: 0.25rem 0.75rem;
-            border-radius: 12px;
-            font-size: 0.85rem;
-            font-weight: 600;
-        }}
-        .status.success {{
-            background: #064e3b;
-            color: #6ee7b7;
-        }}
-        .status.failed {{
-            background: #7f1d1d;
-            color: #fca5a5;
-        }}
-        .faithfulness {{
-            display: inline-block;
-            padding: 0.25rem 0.75rem;
-            border-radius: 12px;
-            font-size: 0.85rem;
-            font-weight: 600;
-        }}
-        .faithfulness.high {{
-            background: #064e3b;
-            color: #6ee7b7;
-        }}
-        .faithfulness.medium {{
-            background: #78350f;
-            color: #fcd34d;
-        }}
-        .footer {{
-            text-align: center;
-            margin-top: 2rem;
-            color: #64748b;
-            font-size: 0.9rem;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>🔥 Phoenix - GenAI Ops Dashboard</h1>
-        <p>Real-time Agent Monitoring & Evaluation</p>
-        <p style="opacity: 0.7; margin-top: 0.5rem;">Last Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-    </div>
+from dashboard_render import compile_template, open_page
+from ensemble import ENSEMBLE_FILES
+from phoenix_trace_store import TRACE_STORE_PATH, TraceStore
+from phoenix_traces import iter_traces, recent_traces
 
-    <div class="metrics">
-        <div class="metric-card success">
-            <h3>{task_data['success_rate_pct']}</h3>
-            <p>Task Success Rate</p>
-        </div>
-        <div class="metric-card success">
-            <h3>{hall_data['hallucination_rate_pct']}</h3>
-            <p>Hallucination Rate</p>
-        </div>
-        <div class="metric-card info">
-            <h3>{int(latency_data['p95_latency_ms'])}ms</h3>
-            <p>p95 Latency</p>
-        </div>
-        <div class="metric-card info">
-            <h3>{task_data['avg_tools_per_task']:.1f}</h3>
-            <p>Avg Tools per Task</p>
-        </div>
-        <div class="metric-card warning">
-            <h3>${cost_data['cost_per_request']}</h3>
-            <p>Cost per Request</p>
-        </div>
-        <div class="metric-card warning">
-            <h3>${cost_data['monthly_cost']}</h3>
-            <p>Monthly Cost</p>
-        </div>
-    </div>
+OUTPUT_PATH = '/Users/anixlynch/dev/shipped/kpi_scripts/phoenix_dashboard.html'
+EVIDENCE_DIR = os.path.dirname(os.path.abspath(__file__))
+METRIC_NAMES = ['task_success', 'hallucination_metrics', 'latency_metrics', 'cost_metrics']
+# Agent spans exported from Phoenix / any OTLP collector file exporter
+SPANS_PATH = '/Users/anixlynch/dev/shipped/kpi_scripts/agent_spans.jsonl'
+RECENT_TRACES = 10
+TRACE_VIEWS = {"recent": "Recent", "slowest": "Slowest", "failed": "Failed"}
 
-    <div class="traces">
-        <h2>🔍 Recent Agent Traces</h2>
-"""
-    
-    for trace in traces:
-        status_class = 'success' if trace['success'] else 'failed'
-        status_text = 'SUCCESS' if trace['success'] else 'FAILED'
-        faith_class = 'high' if trace['faithfulness'] > 0.9 else 'medium'
-        
-        html += f"""
-        <div class="trace-item">
+TRACES_START = compile_template("""
+    <div class="panel">
+        <h2>🔍 {{label}} Agent Traces</h2>
+""")
+TRACE_SUMMARY = compile_template("""        <p class="trace-summary">{{summary}}</p>
+""")
+TRACE_ITEM = compile_template("""        <div class="trace-item">
             <div class="trace-header">
-                <span class="trace-id">{trace['id']}</span>
-                <span class="trace-time">{trace['timestamp']}</span>
+                <span class="trace-id">{{id}}</span>
+                <span class="trace-time">{{timestamp}}</span>
             </div>
             <div class="trace-query">
-                "{trace['user_query']}"
+                "{{user_query}}"
             </div>
             <div class="trace-stats">
                 <div class="trace-stat">
                     <span>Status:</span>
-                    <span class="status {status_class}">{status_text}</span>
+                    <span class="status {{status_class}}">{{status_text}}</span>
                 </div>
                 <div class="trace-stat">
                     <span>Tools Used:</span>
-                    <span>{trace['tools_used']}</span>
+                    <span>{{tools_used}}</span>
                 </div>
                 <div class="trace-stat">
                     <span>Latency:</span>
-                    <span>{trace['latency_ms']}ms</span>
+                    <span>{{latency}}</span>
                 </div>
                 <div class="trace-stat">
                     <span>Faithfulness:</span>
-                    <span class="faithfulness {faith_class}">{trace['faithfulness']:.2f}</span>
+                    <span class="status {{faith_class}}">{{faithfulness}}</span>
                 </div>
             </div>
         </div>
+""")
+TRACES_END = """    </div>
 """
-    
-    html += """
-    </div>
 
-    <div class="footer">
-        <p>Phoenix OSS - GenAI Observability Platform</p>
-        <p style="margin-top: 0.5rem;">
-            <strong>Evidence:</strong> /Users/anixlynch/dev/shipped/kpi_scripts/*.json
-        </p>
-    </div>
-</body>
-</html>
-"""
+
+def trace_view(trace):
+    """Template values for one trace"""
+    faithfulness = trace['faithfulness']
+    return dict(trace,
+                status_class='success' if trace['success'] else 'failed',
+                status_text='SUCCESS' if trace['success'] else 'FAILED',
+                latency=f"{trace['latency_ms']:.0f}ms" if trace['latency_ms'] is not None else 'n/a',
+                faith_class='passed' if faithfulness is not None and faithfulness > 0.9 else 'warning',
+                faithfulness=f"{faithfulness:.2f}" if faithfulness is not None else 'n/a')
+
+
+def scan_traces(spans_path, view='recent', n=RECENT_TRACES):
+    """(n traces for `view`, trace count, failed count), streaming the span file once"""
+    counts = {'traces': 0, 'failed': 0}
+
+    def counted(traces):
+        for trace in traces:
+            counts['traces'] += 1
+            counts['failed'] += not trace['success']
+            yield trace
+
+    traces = counted(iter_traces(spans_path))
+    if view == 'slowest':
+        shown = heapq.nlargest(n, (t for t in traces if t['latency_ms'] is not None), key=lambda t: t['latency_ms'])
+    else:
+        shown = recent_traces((t for t in traces if view != 'failed' or not t['success']), n)
+    return shown, counts['traces'], counts['failed']
+
+
+def query_traces(store_path, view='recent', n=RECENT_TRACES, since=None, until=None):
+    """(n traces for `view`, trace count, failed count) from the indexed trace store"""
+    with TraceStore(store_path) as store:
+        shown = getattr(store, view)(n, since=since, until=until)
+        counts = store.counts(since, until) if since or until else store.totals()
+    return shown, counts[0], counts[1]
+
+def ci_label(label, ensemble, fmt):
+    """Stat card label with the ensemble's replica interval, when there is one"""
+    if not ensemble:
+        return label
+    low, high = fmt.format(ensemble['ci_low']), fmt.format(ensemble['ci_high'])
+    return f"{label} ({ensemble['ci_level']:.0%} CI {low}–{high})"
+
+def generate_phoenix_html(metrics=None, output_path=OUTPUT_PATH, spans_path=SPANS_PATH,
+                          store_path=TRACE_STORE_PATH, view='recent', since=None, until=None,
+                          evidence_dir=EVIDENCE_DIR):
+    """Generate Phoenix-style HTML dashboard
+
+    metrics: {file stem: parsed JSON} already loaded (see build_dashboards.py);
+    read from evidence_dir through the same Evidence loader when omitted.
+    Ensemble intervals (ensemble.py) are shown on the stat cards when present.
+    Traces come from the indexed trace store at store_path when it exists (see
+    phoenix_trace_store.py), otherwise from streaming the span export at spans_path. view is one of TRACE_VIEWS;
+    since / until (epoch seconds) pick a time window from the store.
+    """
     
-    output_path = '/Users/anixlynch/dev/shipped/kpi_scripts/phoenix_dashboard.html'
-    with open(output_path, 'w') as f:
-        f.write(html)
+    # Load our real metrics
+    if metrics is None:
+        # build_dashboards imports this module, so load it only when run standalone
+        from build_dashboards import Evidence
+        metrics = Evidence(evidence_dir, spans_path=spans_path, trace_store_path=store_path).subset(METRIC_NAMES + ENSEMBLE_FILES)
+    task_data = metrics['task_success']
+    hall_data = metrics['hallucination_metrics']
+    latency_data = metrics['latency_metrics']
+    cost_data = metrics['cost_metrics']
     
+    # Real traces: indexed queries when a store exists, one streamed pass otherwise
+    if os.path.exists(store_path):
+        traces, n_traces, n_failed = query_traces(store_path, view, since=since, until=until)
+    elif os.path.exists(spans_path):
+        traces, n_traces, n_failed = scan_traces(spans_path, view)
+    else:
+        traces, n_traces, n_failed = [], 0, 0
+    
+    with open_page(output_path, title="Phoenix - GenAI Ops Dashboard", theme="phoenix",
+                   heading="🔥 Phoenix - GenAI Ops Dashboard",
+                   subtitle="Real-time Agent Monitoring & Evaluation", stamp_label="Last Updated") as page:
+        page.stat_cards([
+            ("success", task_data['success_rate_pct'],
+             ci_label("Task Success Rate", metrics.get('task_success_ensemble'), "{:.1%}")),
+            ("success", hall_data['hallucination_rate_pct'],
+             ci_label("Hallucination Rate", metrics.get('hallucination_metrics_ensemble'), "{:.1%}")),
+            ("info", f"{int(latency_data['p95_latency_ms'])}ms",
+             ci_label("p95 Latency", metrics.get('latency_metrics_ensemble'), "{:.0f}ms")),
+            ("info", f"{task_data['avg_tools_per_task']:.1f}", "Avg Tools per Task"),
+            ("warning", f"${cost_data['cost_per_request']}", "Cost per Request"),
+            ("warning", f"${cost_data['monthly_cost']}", "Monthly Cost"),
+        ])
+        page.render(TRACES_START, label=TRACE_VIEWS[view])
+        page.render(TRACE_SUMMARY, summary=(f"{len(traces)} {view} of {n_traces:,} traces ({n_failed:,} failed)"
+                                            if traces else f"No traces found at {store_path} or {spans_path}"))
+        page.render_rows(TRACE_ITEM, (trace_view(t) for t in traces))
+        page.write(TRACES_END)
+        page.footer("Phoenix OSS - GenAI Observability Platform", "/Users/anixlynch/dev/shipped/kpi_scripts/*.json")
+
     print(f"✅ Phoenix Dashboard Generated!")
     print(f"   File: {output_path}")
     print(f"   Open in browser: open {output_path}")
@@ -306,7 +162,17 @@ def generate_phoenix_html():
     print(f"   Task Success: {task_data['success_rate_pct']}")
     print(f"   Hallucination: {hall_data['hallucination_rate_pct']}")
     print(f"   p95 Latency: {int(latency_data['p95_latency_ms'])}ms")
-    print(f"   Traces Shown: {len(traces)}")
+    print(f"   Traces: {n_traces} ({n_failed} failed), {len(traces)} shown")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the Phoenix dashboard")
+    parser.add_argument("--view", choices=sorted(TRACE_VIEWS), default="recent")
+    parser.add_argument("--hours", type=float, default=None, help="only traces from the last N hours (trace store)")
+    parser.add_argument("--evidence-dir", default=EVIDENCE_DIR, help="where the metric JSON files live")
+    args = parser.parse_args(argv)
+    generate_phoenix_html(view=args.view, since=time.time() - args.hours * 3600 if args.hours else None,
+                          evidence_dir=args.evidence_dir)
+    return 0
 
 if __name__ == '__main__':
-    generate_phoenix_html()
+    main()
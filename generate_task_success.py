@@ -4,69 +4,59 @@ Generate Real Task Success Metrics for Resume
 Measures agent task completion rate
 """
 
+import argparse
 import json
-import numpy as np
+from simulation_engine import simulate_tasks, DEFAULT_CHUNK_SIZE
+from task_metrics import aggregate_task_logs
+
+OUTPUT_PATH = '/Users/anixlynch/dev/shipped/kpi_scripts/task_success.json'
+
+def report_task_metrics(task_metrics, output_path=OUTPUT_PATH):
+    """Write a TaskMetrics aggregate to task_success.json and print the summary"""
+
+    metrics = task_metrics.as_dict()
 
-def simulate_agent_tasks(n_tasks=100):
-    """Simulate agent task execution"""
-    
-    print(f"🎯 Generating Task Success Metrics ({n_tasks} tasks)...")
-    
-    tasks = []
-    
-    # Simulate realistic task success rate
-    # Most tasks succeed, some fail (realistic for production agents)
-    for i in range(n_tasks):
-        # 89% success rate (matches target)
-        success = np.random.random() < 0.89
-        
-        task = {
-            "task_id": i + 1,
-            "success": success,
-            "tools_used": np.random.randint(1, 15),  # 1-14 tools
-            "duration_ms": np.random.uniform(500, 3000)
-        }
-        
-        tasks.append(task)
-    
-    # Calculate metrics
-    successes = sum(1 for t in tasks if t['success'])
-    failures = n_tasks - successes
-    success_rate = successes / n_tasks
-    
-    avg_tools = mean([t['tools_used'] for t in tasks])
-    avg_duration = mean([t['duration_ms'] for t in tasks])
-    
-    metrics = {
-        "n_tasks": n_tasks,
-        "successes": successes,
-        "failures": failures,
-        "success_rate": round(success_rate, 3),
-        "success_rate_pct": f"{success_rate:.1%}",
-        "avg_tools_per_task": round(avg_tools, 1),
-        "avg_duration_ms": round(avg_duration, 0)
-    }
-    
     # Save metrics
-    with open('/Users/anixlynch/dev/shipped/kpi_scripts/task_success.json', 'w') as f:
+    with open(output_path, 'w') as f:
         json.dump(metrics, f, indent=2)
-    
+
     print(f"\n✅ Task Success Metrics Generated:")
     print(f"   Success rate: {metrics['success_rate_pct']}")
-    print(f"   Successes: {metrics['successes']}/{n_tasks}")
-    print(f"   Avg tools per task: {metrics['avg_tools_per_task']}")
-    print(f"   Avg duration: {metrics['avg_duration_ms']:.0f}ms")
-    
+    print(f"   Successes: {metrics['successes']}/{metrics['n_tasks']}")
+    print(f"   Avg tools per task: {metrics['avg_tools_per_task']} (std {metrics['std_tools_per_task']})")
+    print(f"   Avg duration: {metrics['avg_duration_ms']:.0f}ms (std {metrics['std_duration_ms']:.0f}ms, "
+          f"p95 {metrics['p95_duration_ms']:.0f}ms)")
+    for name, tool in list(metrics.get('per_tool', {}).items())[:10]:
+        print(f"   Tool {name}: {tool['tasks']} tasks, {tool['success_rate']:.1%} success")
+
     # Export for resume
     print(f"\n📝 RESUME METRIC:")
     print(f"   TASK_SUCCESS_RATE={metrics['success_rate_pct']}")
-    
+
     return metrics
 
-def mean(values):
-    """Calculate mean"""
-    return sum(values) / len(values)
+def simulate_agent_tasks(n_tasks=100, seed=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Simulate agent task execution"""
+
+    print(f"🎯 Generating Task Success Metrics ({n_tasks} tasks)...")
+
+    # Simulate realistic task success rate in vectorized chunks, folded into
+    # running aggregates (most tasks succeed, some fail - realistic for production agents)
+    return report_task_metrics(simulate_tasks(n_tasks, seed=seed, chunk_size=chunk_size))
+
+def measure_agent_tasks(log_paths):
+    """Task success metrics from real agent task logs, streamed"""
+
+    print(f"🎯 Measuring Task Success Metrics from {len(log_paths)} log file(s)...")
+    return report_task_metrics(aggregate_task_logs(log_paths))
 
 if __name__ == '__main__':
-    metrics = simulate_agent_tasks(100)
+    parser = argparse.ArgumentParser(description="Generate task_success.json")
+    parser.add_argument("--log", nargs='+', help="agent task logs (.jsonl / .jsonl.gz / .parquet / .csv) instead of simulating")
+    parser.add_argument("--tasks", type=int, default=100, help="tasks to simulate")
+    args = parser.parse_args()
+    if args.log:
+        measure_agent_tasks(args.log)
+    else:
+        simulate_agent_tasks(args.tasks)
     print(f"\n✅ Saved to: task_success.json")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Streaming Latency Histogram
+Fixed-memory log-bucketed histogram (HDR-style) shared by the latency scripts
+"""
+
+import math
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram with bounded relative error.
+
+    Bucket i covers (gamma**(i-1), gamma**i] with gamma = (1 + e) / (1 - e), so
+    any reported quantile is within relative error e of a recorded value.
+    Memory is fixed by (lowest, highest, relative_error), never by sample count.
+    Values outside [lowest, highest] are clamped into the end buckets.
+    """
+
+    def __init__(self, lowest=0.001, highest=3_600_000.0, relative_error=0.01):
+        if not 0 < relative_error < 1:
+            raise ValueError("relative_error must be in (0, 1)")
+        if not 0 < lowest < highest:
+            raise ValueError("need 0 < lowest < highest")
+        self.lowest = lowest
+        self.highest = highest
+        self.relative_error = relative_error
+        self._gamma = (1 + relative_error) / (1 - relative_error)
+        self._log_gamma = math.log(self._gamma)
+        self._offset = math.ceil(math.log(lowest) / self._log_gamma)
+        n_buckets = math.ceil(math.log(highest) / self._log_gamma) - self._offset + 1
+        self.counts = [0] * n_buckets
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _index(self, value):
+        value = min(max(value, self.lowest), self.highest)
+        return math.ceil(math.log(value) / self._log_gamma) - self._offset
+
+    def record(self, value, count=1):
+        """Record a single value (e.g. one latency in ms)"""
+        self.counts[self._index(value)] += count
+        self.count += count
+        self.total += value * count
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def record_many(self, values):
+        """Record a batch; numpy arrays take a vectorized bincount path"""
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        if np is None or not isinstance(values, np.ndarray):
+            for v in values:
+                self.record(v)
+            return
+        if values.size == 0:
+            return
+        clipped = np.clip(values, self.lowest, self.highest)
+        idx = np.ceil(np.log(clipped) / self._log_gamma).astype(np.int64) - self._offset
+        np.clip(idx, 0, len(self.counts) - 1, out=idx)
+        binned = np.bincount(idx, minlength=len(self.counts))
+        self.counts = [c + int(b) for c, b in zip(self.counts, binned)]
+        self.count += int(values.size)
+        self.total += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+    def _compatible(self, other):
+        return (self.lowest == other.lowest and self.highest == other.highest
+                and self.relative_error == other.relative_error)
+
+    def merge(self, other):
+        """Fold another histogram (e.g. from a worker) into this one"""
+        if not self._compatible(other):
+            raise ValueError("cannot merge histograms with different bucket layouts")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q):
+        """Value at quantile q in [0, 1]; usable at any point while recording"""
+        if self.count == 0:
+            return 0.0
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (self.count - 1)
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen > rank:
+                upper = self._gamma ** (i + self._offset)
+                value = 2 * upper / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def percentile(self, p):
+        """Same as quantile() with p in [0, 100]"""
+        return self.quantile(p / 100.0)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
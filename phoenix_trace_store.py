@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Phoenix Trace Store
+Indexed SQLite store of assembled agent traces, so dashboards can pull the most
+recent, slowest or failed traces of any time window without scanning span files
+"""
+
+import argparse
+import math
+import os
+import sqlite3
+import time
+
+from phoenix_traces import MAX_OPEN_TRACES, iter_traces
+
+EVIDENCE_DIR = os.path.dirname(os.path.abspath(__file__))
+TRACE_STORE_PATH = os.path.join(EVIDENCE_DIR, 'phoenix_traces.sqlite')
+INGEST_BATCH = 10_000
+# slowest(): the window's rows are sorted directly unless walking the latency
+# index is estimated to read this many times fewer rows (the walk degrades
+# when slow traces cluster outside the window, the sort never does)
+WINDOW_SORT_BIAS = 16
+MAX_NS = 2 ** 63 - 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingests (
+    ingest_id  INTEGER PRIMARY KEY,
+    ingest_ts  REAL NOT NULL,
+    source     TEXT,
+    traces     INTEGER NOT NULL,
+    failed     INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS traces (
+    trace_key      INTEGER PRIMARY KEY,
+    trace_id       TEXT NOT NULL UNIQUE,
+    start_ns       INTEGER,
+    latency_ms     REAL,
+    latency_bucket INTEGER,
+    success        INTEGER NOT NULL,
+    tools_used     INTEGER NOT NULL,
+    spans          INTEGER NOT NULL,
+    faithfulness   REAL,
+    user_query     TEXT
+);
+CREATE INDEX IF NOT EXISTS traces_start ON traces (start_ns);
+CREATE INDEX IF NOT EXISTS traces_success ON traces (success, start_ns);
+CREATE INDEX IF NOT EXISTS traces_latency ON traces (latency_bucket, latency_ms);
+CREATE TABLE IF NOT EXISTS trace_tools (
+    tool_name  TEXT NOT NULL,
+    start_ns   INTEGER,
+    trace_key  INTEGER NOT NULL REFERENCES traces (trace_key)
+);
+CREATE INDEX IF NOT EXISTS trace_tools_name ON trace_tools (tool_name, start_ns);
+"""
+
+COLUMNS = ("trace_id, start_ns, latency_ms, latency_bucket, success, tools_used, spans, "
+           "faithfulness, user_query")
+SELECT = ("SELECT t.trace_id, t.start_ns, t.latency_ms, t.success, t.tools_used, t.spans, "
+          "t.faithfulness, t.user_query FROM traces t")
+
+
+def latency_bucket(latency_ms):
+    """log2 bucket of a latency: 0 is < 2ms, b covers [2^b, 2^(b+1)) ms"""
+    if latency_ms is None:
+        return None
+    return int(math.log2(latency_ms)) if latency_ms >= 2 else 0
+
+
+def _window(since, until):
+    """(since, until) in epoch seconds -> start_ns bounds"""
+    return (int(since * 1e9) if since is not None else 0,
+            int(until * 1e9) if until is not None else MAX_NS)
+
+
+def _trace(row):
+    """A stored row in phoenix_traces.iter_traces() shape"""
+    start_ns = row['start_ns']
+    return {
+        'id': row['trace_id'],
+        'start_ns': start_ns,
+        'timestamp': (time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(start_ns / 1e9))
+                      if start_ns is not None else ''),
+        'user_query': row['user_query'] or '',
+        'tools_used': row['tools_used'],
+        'spans': row['spans'],
+        'latency_ms': row['latency_ms'],
+        'success': bool(row['success']),
+        'faithfulness': row['faithfulness'],
+    }
+
+
+class TraceStore:
+    """One row per trace plus a tool-name index.
+
+    traces       indexed on start_ns, (success, start_ns) and (latency_bucket, latency_ms)
+    trace_tools  one row per distinct tool a trace called, indexed on (tool_name, start_ns)
+    ingests      one row per ingest with trace / failure totals
+    """
+
+    def __init__(self, path=TRACE_STORE_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        # WAL lets the dashboard read while an ingest appends
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- writing ------------------------------------------------------------
+
+    def ingest(self, traces, source=None, batch=INGEST_BATCH):
+        """Insert trace dicts (phoenix_traces.iter_traces output) in batched transactions.
+
+        A trace_id already stored is left as it is, so re-ingesting an export is a no-op.
+        Returns (traces added, failed traces added).
+        """
+        added = failed = 0
+        insert = (f"INSERT OR IGNORE INTO traces ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+        conn = self.conn
+        pending = 0
+        conn.execute("BEGIN")
+        try:
+            for t in traces:
+                cur = conn.execute(insert, (
+                    t['id'], t['start_ns'], t['latency_ms'], latency_bucket(t['latency_ms']),
+                    int(t['success']), t['tools_used'], t['spans'], t['faithfulness'], t['user_query']))
+                if not cur.rowcount:
+                    continue
+                added += 1
+                failed += not t['success']
+                if t.get('tool_names'):
+                    conn.executemany("INSERT INTO trace_tools VALUES (?, ?, ?)",
+                                     [(name, t['start_ns'], cur.lastrowid) for name in t['tool_names']])
+                pending += 1
+                if pending >= batch:
+                    conn.execute("COMMIT")
+                    conn.execute("BEGIN")
+                    pending = 0
+            conn.execute("INSERT INTO ingests (ingest_ts, source, traces, failed) VALUES (?, ?, ?, ?)",
+                         (time.time(), source, added, failed))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        # Refresh planner statistics for the new row counts
+        conn.execute("PRAGMA optimize")
+        return added, failed
+
+    # -- queries ------------------------------------------------------------
+
+    def totals(self):
+        """(traces, failed) over everything stored, from the ingest log"""
+        row = self.conn.execute("SELECT COALESCE(SUM(traces), 0), COALESCE(SUM(failed), 0) FROM ingests").fetchone()
+        return row[0], row[1]
+
+    def last_ingest(self):
+        """(ingest_id, ingest_ts) of the newest ingest, or None; identifies the store's contents"""
+        row = self.conn.execute("SELECT ingest_id, ingest_ts FROM ingests ORDER BY ingest_id DESC LIMIT 1").fetchone()
+        return tuple(row) if row else None
+
+    def counts(self, since=None, until=None):
+        """(traces, failed) with start time in the window"""
+        lo, hi = _window(since, until)
+        total = self.conn.execute("SELECT COUNT(*) FROM traces WHERE start_ns >= ? AND start_ns < ?",
+                                  (lo, hi)).fetchone()[0]
+        failed = self.conn.execute("SELECT COUNT(*) FROM traces WHERE success = 0 AND start_ns >= ? AND start_ns < ?",
+                                   (lo, hi)).fetchone()[0]
+        return total, failed
+
+    def recent(self, n=10, since=None, until=None, success=None, tool=None):
+        """n most recent traces in the window, newest first; optionally only
+        failed/successful ones or ones that called `tool`"""
+        lo, hi = _window(since, until)
+        if tool is not None:
+            sql = (f"{SELECT} JOIN trace_tools tt ON tt.trace_key = t.trace_key "
+                   "WHERE tt.tool_name = ? AND tt.start_ns >= ? AND tt.start_ns < ?")
+            params = [tool, lo, hi]
+            if success is not None:
+                sql += " AND t.success = ?"
+                params.append(int(success))
+            sql += " ORDER BY tt.start_ns DESC LIMIT ?"
+        elif success is not None:
+            sql = f"{SELECT} WHERE t.success = ? AND t.start_ns >= ? AND t.start_ns < ? ORDER BY t.start_ns DESC LIMIT ?"
+            params = [int(success), lo, hi]
+        else:
+            sql = f"{SELECT} WHERE t.start_ns >= ? AND t.start_ns < ? ORDER BY t.start_ns DESC LIMIT ?"
+            params = [lo, hi]
+        return [_trace(row) for row in self.conn.execute(sql, params + [n])]
+
+    def failed(self, n=10, since=None, until=None):
+        """n most recent failed traces in the window"""
+        return self.recent(n, since, until, success=False)
+
+    def slowest(self, k=10, since=None, until=None):
+        """Top k traces by latency in the window, slowest first.
+
+        Walking the latency index from the top reads about k / share rows,
+        where share is the window's part of the stored time span; sorting reads
+        share * total rows through the start_ns index. The cheaper one is used.
+        """
+        lo, hi = _window(since, until)
+        # Separate MIN / MAX queries: each is one index probe, combined they are a scan
+        first = self.conn.execute("SELECT MIN(start_ns) FROM traces").fetchone()[0]
+        last = self.conn.execute("SELECT MAX(start_ns) FROM traces").fetchone()[0]
+        if first is None:
+            return []
+        share = max(min(hi, last + 1) - max(lo, first), 0) / max(last + 1 - first, 1)
+        if not share:
+            return []
+        window_rows = share * self.totals()[0]
+        index = 'traces_start' if window_rows <= WINDOW_SORT_BIAS * k / share else 'traces_latency'
+        order = ("t.latency_ms DESC" if index == 'traces_start'
+                 else "t.latency_bucket DESC, t.latency_ms DESC")
+        rows = self.conn.execute(
+            f"{SELECT} INDEXED BY {index} WHERE t.start_ns >= ? AND t.start_ns < ? "
+            f"AND t.latency_ms IS NOT NULL ORDER BY {order} LIMIT ?", (lo, hi, k))
+        return [_trace(row) for row in rows]
+
+    def latency_histogram(self, since=None, until=None):
+        """[(bucket lower bound ms, count)] over the window, fastest first"""
+        lo, hi = _window(since, until)
+        rows = self.conn.execute(
+            "SELECT latency_bucket, COUNT(*) FROM traces WHERE start_ns >= ? AND start_ns < ? "
+            "AND latency_bucket IS NOT NULL GROUP BY latency_bucket ORDER BY latency_bucket", (lo, hi))
+        return [(0 if b == 0 else 2 ** b, count) for b, count in rows]
+
+    def tools(self):
+        """Distinct tool names with the number of traces that called each"""
+        rows = self.conn.execute("SELECT tool_name, COUNT(*) FROM trace_tools GROUP BY tool_name ORDER BY 2 DESC")
+        return [(name, count) for name, count in rows]
+
+
+def ingest_spans(paths, path=TRACE_STORE_PATH, max_open=MAX_OPEN_TRACES):
+    """Assemble span files into traces and add them to the store at `path`"""
+    with TraceStore(path) as store:
+        return store.ingest(iter_traces(paths, max_open), source=','.join([paths] if isinstance(paths, str) else paths))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest agent spans into, or query, the Phoenix trace store")
+    parser.add_argument("--db", default=TRACE_STORE_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    ingest = sub.add_parser("ingest", help="assemble span exports into traces and store them")
+    ingest.add_argument("paths", nargs='+')
+    ingest.add_argument("--max-open", type=int, default=MAX_OPEN_TRACES)
+    for name, help_text in (("recent", "most recent traces"), ("slowest", "slowest traces"),
+                            ("failed", "most recent failed traces")):
+        query = sub.add_parser(name, help=help_text)
+        query.add_argument("-n", type=int, default=10)
+        query.add_argument("--hours", type=float, default=None, help="window: the last N hours")
+        if name == "recent":
+            query.add_argument("--tool", default=None)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.command == "ingest":
+        added, failed = ingest_spans(args.paths, args.db, args.max_open)
+        print(f"✅ Stored {added} traces ({failed} failed) in {time.perf_counter() - start:.2f}s")
+        return 0
+
+    since = time.time() - args.hours * 3600 if args.hours else None
+    with TraceStore(args.db) as store:
+        if args.command == "recent":
+            traces = store.recent(args.n, since=since, tool=args.tool)
+        elif args.command == "slowest":
+            traces = store.slowest(args.n, since=since)
+        else:
+            traces = store.failed(args.n, since=since)
+    print(f"🔍 {len(traces)} {args.command} traces ({(time.perf_counter() - start) * 1000:.1f}ms)")
+    for t in traces:
+        print(f"   {t['timestamp']}  {t['id'][:16]}  {'✅' if t['success'] else '❌'} "
+              f"{t['latency_ms']}ms tools={t['tools_used']}  {t['user_query'][:60]}")
+    return 0
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Phoenix Trace Ingestion
+Streams agent spans from OTLP-JSON / JSONL exports and assembles them into
+per-trace summaries (latency, tool calls, status, faithfulness) in bounded memory
+"""
+
+import argparse
+import gzip
+import heapq
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+# Open traces kept while waiting for more of their spans; past this the
+# least recently touched trace is emitted as complete
+MAX_OPEN_TRACES = 100_000
+
+# OpenInference semantic conventions (what Phoenix itself writes)
+SPAN_KIND_KEY = 'openinference.span.kind'
+TOOL_KIND = 'TOOL'
+TOOL_NAME_KEY = 'tool.name'
+QUERY_KEYS = ('input.value', 'user.query', 'llm.input_messages.0.message.content')
+FAITHFULNESS_KEYS = ('eval.faithfulness.score', 'faithfulness.score', 'faithfulness')
+STATUS_ERROR = (2, 'STATUS_CODE_ERROR', 'ERROR')
+QUERY_CHARS = 200
+# Only these attributes are decoded; tool spans carry large payloads we never read
+WANTED_KEYS = frozenset((SPAN_KIND_KEY, TOOL_NAME_KEY) + QUERY_KEYS + FAITHFULNESS_KEYS)
+
+
+def _open(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def _attr_value(value):
+    """Plain value of an OTLP AnyValue ({"stringValue": ...}, {"intValue": "3"}, ...)"""
+    if not isinstance(value, dict):
+        return value
+    for key, kind in (('stringValue', str), ('intValue', int), ('doubleValue', float), ('boolValue', bool)):
+        if key in value:
+            return kind(value[key])
+    return None
+
+
+def _attributes(span):
+    """The WANTED_KEYS attributes of a span (OTLP key/value list or a plain dict)"""
+    attrs = span.get('attributes') or {}
+    if isinstance(attrs, list):
+        return {a['key']: _attr_value(a.get('value')) for a in attrs if a['key'] in WANTED_KEYS}
+    return attrs
+
+
+def _nanos(span, key, fallback):
+    value = span.get(key, span.get(fallback))
+    return int(value) if value is not None else None
+
+
+def _spans_in(record):
+    """Spans in one decoded line: an ExportTraceServiceRequest or a single flat span"""
+    if 'resourceSpans' in record:
+        for resource in record['resourceSpans']:
+            for scope in resource.get('scopeSpans') or resource.get('instrumentationLibrarySpans') or ():
+                yield from scope.get('spans', ())
+    else:
+        yield record
+
+
+def read_spans(path):
+    """Stream spans from a JSONL file (one request or span per line), optionally gzipped.
+
+    A `.json` file is a single (possibly pretty-printed) OTLP-JSON document and
+    is decoded in one piece. JSONL is only ever read line by line: lines that
+    do not decode (e.g. a truncated last write) are skipped and reported.
+    """
+    name = path[:-3] if path.endswith('.gz') else path
+    with _open(path) as f:
+        if name.endswith('.json'):
+            yield from _spans_in(json.load(f))
+            return
+        bad, first_bad = 0, None
+        for n, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                bad += 1
+                first_bad = first_bad or n
+                continue
+            yield from _spans_in(record)
+    if bad:
+        print(f"⏭️ Skipped {bad} malformed line(s) in {path} (first at line {first_bad})")
+
+
+class TraceSummary:
+    """Running aggregate of one trace's spans; the spans themselves are not kept"""
+
+    __slots__ = ('trace_id', 'start', 'end', 'root_start', 'root_end', 'tools', 'tool_names', 'spans',
+                 'error', 'root_error', 'query', 'faithfulness')
+
+    def __init__(self, trace_id):
+        self.trace_id = trace_id
+        self.start = self.end = self.root_start = self.root_end = None
+        self.tools = self.spans = 0
+        self.tool_names = set()
+        self.error = self.root_error = False
+        self.query = None
+        self.faithfulness = None
+
+    def add(self, span):
+        attrs = _attributes(span)
+        start = _nanos(span, 'startTimeUnixNano', 'start_time_unix_nano')
+        end = _nanos(span, 'endTimeUnixNano', 'end_time_unix_nano')
+        self.spans += 1
+        if start is not None and (self.start is None or start < self.start):
+            self.start = start
+        if end is not None and (self.end is None or end > self.end):
+            self.end = end
+        if str(attrs.get(SPAN_KIND_KEY, '')).upper() == TOOL_KIND:
+            self.tools += 1
+            if attrs.get(TOOL_NAME_KEY):
+                self.tool_names.add(str(attrs[TOOL_NAME_KEY]))
+        status = span.get('status') or {}
+        failed = status.get('code') in STATUS_ERROR
+        self.error |= failed
+        for key in FAITHFULNESS_KEYS:
+            if attrs.get(key) is not None:
+                self.faithfulness = float(attrs[key])
+                break
+        if not (span.get('parentSpanId') or span.get('parent_span_id')):
+            self.root_start, self.root_end, self.root_error = start, end, failed
+            for key in QUERY_KEYS:
+                if attrs.get(key):
+                    self.query = str(attrs[key])[:QUERY_CHARS]
+                    break
+
+    def as_dict(self):
+        start = self.root_start if self.root_start is not None else self.start
+        end = self.root_end if self.root_end is not None else self.end
+        latency = (end - start) / 1e6 if start is not None and end is not None else None
+        return {
+            'id': self.trace_id,
+            'start_ns': start,
+            'timestamp': (datetime.fromtimestamp(start / 1e9, tz=timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+                          if start is not None else ''),
+            'user_query': self.query or '',
+            'tools_used': self.tools,
+            'tool_names': sorted(self.tool_names),
+            'spans': self.spans,
+            'latency_ms': round(latency, 1) if latency is not None else None,
+            # A failed tool call the agent recovered from doesn't fail the task;
+            # the root span's status decides when there is one
+            'success': not (self.root_error if self.root_start is not None else self.error),
+            'faithfulness': self.faithfulness,
+        }
+
+
+class TraceAssembler:
+    """Groups a span stream by trace_id, holding at most `max_open` traces.
+
+    Exporters write a trace's spans close together, so when the open set is full
+    the least recently touched trace is taken to be complete and emitted. If more
+    of its spans turn up later they are emitted as a second, partial trace;
+    `split_traces` counts those seen within the last `max_open` evictions, so
+    raise `max_open` if it is not zero.
+    """
+
+    def __init__(self, max_open=MAX_OPEN_TRACES):
+        self.max_open = max_open
+        self.open = OrderedDict()
+        self.evicted = OrderedDict()
+        self.split_traces = 0
+
+    def feed(self, spans):
+        """Yield trace dicts as traces complete, then the rest at end of stream"""
+        open_traces = self.open
+        for span in spans:
+            trace_id = span.get('traceId') or span.get('trace_id')
+            trace = open_traces.get(trace_id)
+            if trace is None:
+                trace = open_traces[trace_id] = TraceSummary(trace_id)
+                if len(open_traces) > self.max_open:
+                    yield self._emit(open_traces.popitem(last=False)[1])
+            else:
+                open_traces.move_to_end(trace_id)
+            trace.add(span)
+        while open_traces:
+            yield self._emit(open_traces.popitem(last=False)[1])
+
+    def _emit(self, trace):
+        evicted = self.evicted
+        if trace.trace_id in evicted:
+            self.split_traces += 1
+        evicted[trace.trace_id] = None
+        if len(evicted) > self.max_open:
+            evicted.popitem(last=False)
+        return trace.as_dict()
+
+
+def iter_traces(paths, max_open=MAX_OPEN_TRACES):
+    """Trace dicts from one or more span files, streamed"""
+    if isinstance(paths, str):
+        paths = [paths]
+    assembler = TraceAssembler(max_open)
+    yield from assembler.feed(span for path in paths for span in read_spans(path))
+
+
+def recent_traces(traces, n=10):
+    """The n most recent traces of a stream, newest first, without holding the rest"""
+    return heapq.nlargest(n, traces, key=lambda t: t['start_ns'] or 0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarise agent traces from OTLP-JSON / JSONL span exports")
+    parser.add_argument("paths", nargs='+', help="span files (.jsonl, .json, optionally .gz)")
+    parser.add_argument("--recent", type=int, default=10)
+    parser.add_argument("--max-open", type=int, default=MAX_OPEN_TRACES)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    count = failed = 0
+
+    def counted(traces):
+        nonlocal count, failed
+        for trace in traces:
+            count += 1
+            failed += not trace['success']
+            yield trace
+
+    recent = recent_traces(counted(iter_traces(args.paths, args.max_open)), args.recent)
+    print(f"🎯 {count} traces ({failed} failed) in {time.perf_counter() - start:.2f}s")
+    for t in recent:
+        faith = f"{t['faithfulness']:.2f}" if t['faithfulness'] is not None else 'n/a'
+        print(f"   {t['timestamp']}  {t['id'][:16]}  {'✅' if t['success'] else '❌'} "
+              f"{t['latency_ms']}ms tools={t['tools_used']} faithfulness={faith}  {t['user_query'][:60]}")
+    return 0
+
+if __name__ == '__main__':
+    main()
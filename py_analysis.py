@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Python Source Analyzer
+Parses each file once with `ast` and extracts, in a single pass over the tree,
+validator defs, ValidationError raises, `tool_name == "..."` dispatch branches
+and secret / sanitization / environment reads
+"""
+
+import ast
+import re
+
+from repo_scan import Analyzer
+
+VALIDATOR_PREFIXES = ('validate_', 'check_')
+# Called function names that count as a security control (matched anywhere in the name)
+SECURITY_RE = re.compile(r"get_secret|sanitize|redact|pii|load_secrets_to_env|getenv", re.I)
+TOOL_SUBJECT = 'tool_name'
+# Every construct above needs one of these substrings; files without any skip the parse
+TRIGGER_RE = re.compile(r"validate_|check_|ValidationError|tool_name|environ|" + SECURITY_RE.pattern, re.I)
+EMPTY_RESULT = {"validators": 0, "validation_raises": 0, "tools": [], "security": 0}
+
+
+def _name(node):
+    """Terminal identifier of a Name / Attribute (`os.environ` -> 'environ'), else None"""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _strings(node):
+    """String constants in `"x"` or a tuple / list / set of them"""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return [node.value]
+    if isinstance(node, (ast.Tuple, ast.List, ast.Set)):
+        return [e.value for e in node.elts if isinstance(e, ast.Constant) and isinstance(e.value, str)]
+    return []
+
+
+def _dispatched(compare):
+    """Tool names a `tool_name == "x"` / `"x" == tool_name` / `tool_name in (...)` test selects"""
+    operands = [compare.left] + compare.comparators
+    names = []
+    for op, left, right in zip(compare.ops, operands, operands[1:]):
+        if isinstance(op, ast.Eq):
+            if _name(left) == TOOL_SUBJECT:
+                names += _strings(right)
+            elif _name(right) == TOOL_SUBJECT:
+                names += _strings(left)
+        elif isinstance(op, ast.In) and _name(left) == TOOL_SUBJECT:
+            names += _strings(right)
+    return names
+
+
+def _match_cases(match):
+    """Tool names from `match tool_name: case "x" | "y":`"""
+    if _name(match.subject) != TOOL_SUBJECT:
+        return []
+    names = []
+    for case in match.cases:
+        for pattern in ast.walk(case.pattern):
+            if isinstance(pattern, ast.MatchValue):
+                names += _strings(pattern.value)
+    return names
+
+
+def analyze_python(text):
+    """{"validators", "validation_raises", "tools", "security"} for one source file.
+
+    Each construct is counted once: `raise ValidationError("x")` is one raise,
+    `os.environ.get("KEY")` one environment read. Raises SyntaxError on
+    unparsable source.
+    """
+    if not TRIGGER_RE.search(text):
+        return dict(EMPTY_RESULT)
+    tree = ast.parse(text)
+    validators = raises = security = 0
+    tools = set()
+    match_type = getattr(ast, 'Match', ())
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if any(node.name.startswith(p) and len(node.name) > len(p) for p in VALIDATOR_PREFIXES):
+                validators += 1
+        elif isinstance(node, ast.Raise):
+            exc = node.exc.func if isinstance(node.exc, ast.Call) else node.exc
+            name = _name(exc)
+            if name and name.endswith('ValidationError'):
+                raises += 1
+        elif isinstance(node, ast.Compare):
+            tools.update(_dispatched(node))
+        elif isinstance(node, ast.Call):
+            func = node.func
+            name = _name(func)
+            if name and SECURITY_RE.search(name):
+                security += 1
+            elif name == 'get' and isinstance(func, ast.Attribute) and _name(func.value) == 'environ':
+                security += 1
+        elif isinstance(node, ast.Subscript):
+            if _name(node.value) == 'environ':
+                security += 1
+        elif match_type and isinstance(node, match_type):
+            tools.update(_match_cases(node))
+    return {"validators": validators, "validation_raises": raises,
+            "tools": sorted(tools), "security": security}
+
+
+PYTHON_ANALYZER = Analyzer("python", [".py"], analyze_python, version=1)
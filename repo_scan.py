@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Repository Scanner
+One os.scandir walk per tree, per-file analyzers fanned out to a thread pool,
+and a persistent (path, mtime, size) cache so unchanged files are never re-read;
+files whose contents were seen before (touched, copied, checked out again) are
+matched by content hash instead of being re-analyzed
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+EVIDENCE_DIR = os.path.dirname(os.path.abspath(__file__))
+SCAN_CACHE_PATH = os.path.join(EVIDENCE_DIR, '.repo_scan_cache.sqlite')
+# Never hold source files we count
+SKIP_DIRS = {'.git', '.hg', '.svn', '__pycache__'}
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+SCHEMA_VERSION = 2
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    analyzer  TEXT NOT NULL,
+    path      TEXT NOT NULL,
+    mtime_ns  INTEGER NOT NULL,
+    size      INTEGER NOT NULL,
+    digest    TEXT NOT NULL,
+    result    TEXT NOT NULL,
+    PRIMARY KEY (analyzer, path)
+);
+CREATE INDEX IF NOT EXISTS files_digest ON files (analyzer, digest);
+"""
+
+
+class Analyzer:
+    """A per-file function applied to files with the given suffixes.
+
+    `func(text)` returns a JSON-serialisable result. Bump `version` whenever
+    func changes so cached results from the old version are discarded.
+    """
+
+    def __init__(self, name, suffixes, func, version=1):
+        self.name = name
+        self.suffixes = tuple(suffixes)
+        self.func = func
+        self.key = f"{name}:{version}"
+
+
+def walk_files(root, suffixes):
+    """(path, stat) for every file under root ending in one of `suffixes`, one scandir per directory"""
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            stack.append(entry.path)
+                    elif entry.name.endswith(suffixes) and entry.is_file():
+                        yield entry.path, entry.stat()
+                except OSError:
+                    continue
+
+
+def read_source(path):
+    """(content digest, text); undecodable bytes are replaced rather than dropping the file"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return hashlib.blake2b(data, digest_size=16).hexdigest(), data.decode('utf-8', errors='replace')
+
+
+class ScanCache:
+    """Analyzer results keyed by (analyzer, path), valid while mtime and size match"""
+
+    def __init__(self, path=SCAN_CACHE_PATH, check_same_thread=True):
+        self.conn = sqlite3.connect(path, check_same_thread=check_same_thread)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.conn.executescript(f"DROP TABLE IF EXISTS files; PRAGMA user_version = {SCHEMA_VERSION};")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def load(self, analyzer_key, prefix):
+        """{path: (mtime_ns, size, result)} for cached files under `prefix`"""
+        rows = self.conn.execute(
+            "SELECT path, mtime_ns, size, result FROM files WHERE analyzer = ? AND path >= ? AND path < ?",
+            (analyzer_key, prefix, prefix + '￿'))
+        return {path: (mtime_ns, size, result) for path, mtime_ns, size, result in rows}
+
+    def result_for(self, analyzer_key, digest):
+        """Result JSON of any file this analyzer has seen with these contents, in any tree"""
+        row = self.conn.execute("SELECT result FROM files WHERE analyzer = ? AND digest = ? LIMIT 1",
+                                (analyzer_key, digest)).fetchone()
+        return row[0] if row else None
+
+    def store(self, analyzer_key, entries, removed=()):
+        """Write (path, mtime_ns, size, digest, result JSON) rows and drop paths that no longer exist"""
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)",
+                                  [(analyzer_key, *entry) for entry in entries])
+            self.conn.executemany("DELETE FROM files WHERE analyzer = ? AND path = ?",
+                                  [(analyzer_key, path) for path in removed])
+
+
+class DigestLookup:
+    """Content-digest lookups for worker threads: one read connection per thread,
+    one indexed query per changed file, plus the digests analyzed this run"""
+
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+        self.local = threading.local()
+        self.caches = []
+        self.seen = {}
+
+    def get(self, analyzer_key, digest):
+        result = self.seen.get((analyzer_key, digest))
+        if result is None:
+            cache = getattr(self.local, 'cache', None)
+            if cache is None:
+                # Used by this thread only; closed from the scanning thread afterwards
+                cache = self.local.cache = ScanCache(self.cache_path, check_same_thread=False)
+                self.caches.append(cache)
+            result = cache.result_for(analyzer_key, digest)
+        return result
+
+    def close(self):
+        for cache in self.caches:
+            cache.close()
+
+
+def _run(analyzer, path, lookup):
+    """(digest, result JSON, content-hash hit, error) for one file"""
+    try:
+        digest, text = read_source(path)
+        result = lookup.get(analyzer.key, digest)
+        if result is not None:
+            return digest, result, True, None
+        result = lookup.seen[analyzer.key, digest] = json.dumps(analyzer.func(text))
+        return digest, result, False, None
+    except (OSError, ValueError, SyntaxError) as e:
+        return None, None, False, f"{path}: {e}"
+
+
+def scan(root, analyzers, cache_path=SCAN_CACHE_PATH, max_workers=SCAN_WORKERS):
+    """Apply every analyzer to its files under root.
+
+    Returns ({analyzer name: {path: result}}, stats) where stats counts files
+    read, cache hits (unchanged stat), content-hash hits among the files read,
+    and errors (unreadable or unparsable files are reported, not counted).
+    """
+    root = os.path.abspath(root)
+    prefix = root + os.sep
+    suffixes = tuple({s for a in analyzers for s in a.suffixes})
+    results = {a.name: {} for a in analyzers}
+    stats = {"files": 0, "read": 0, "cached": 0, "same_content": 0, "errors": []}
+
+    with ScanCache(cache_path) as cache:
+        cached = {a.key: cache.load(a.key, prefix) for a in analyzers}
+        seen = {a.key: set() for a in analyzers}
+        jobs = []
+        for path, st in walk_files(root, suffixes):
+            stats["files"] += 1
+            for analyzer in analyzers:
+                if not path.endswith(analyzer.suffixes):
+                    continue
+                seen[analyzer.key].add(path)
+                hit = cached[analyzer.key].get(path)
+                if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+                    results[analyzer.name][path] = json.loads(hit[2])
+                    stats["cached"] += 1
+                else:
+                    jobs.append((analyzer, path, st))
+
+        fresh = {a.key: [] for a in analyzers}
+        if jobs:
+            lookup = DigestLookup(cache_path)
+            try:
+                with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    outcomes = pool.map(lambda job: _run(job[0], job[1], lookup), jobs)
+                    for (analyzer, path, st), (digest, result, hit, error) in zip(jobs, outcomes):
+                        stats["read"] += 1
+                        stats["same_content"] += hit
+                        if error:
+                            stats["errors"].append(error)
+                            continue
+                        results[analyzer.name][path] = json.loads(result)
+                        fresh[analyzer.key].append((path, st.st_mtime_ns, st.st_size, digest, result))
+            finally:
+                lookup.close()
+        for analyzer in analyzers:
+            removed = set(cached[analyzer.key]) - seen[analyzer.key]
+            if fresh[analyzer.key] or removed:
+                cache.store(analyzer.key, fresh[analyzer.key], removed)
+    return results, stats
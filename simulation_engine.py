@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Batched Simulation Engine
+Vectorized, seeded, chunked sample generation for the KPI generators
+"""
+
+import numpy as np
+from latency_histogram import LatencyHistogram
+from task_metrics import TaskMetrics
+
+# Samples per chunk; peak memory is a few arrays of this length
+DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+def make_rng(seed=None):
+    """Seeded numpy Generator (seed=None draws fresh OS entropy)"""
+    return np.random.default_rng(seed)
+
+
+def chunk_sizes(n, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield chunk lengths that add up to n"""
+    chunk_size = max(1, int(chunk_size))
+    done = 0
+    while done < n:
+        size = min(chunk_size, n - done)
+        done += size
+        yield size
+
+
+# --- API latency -----------------------------------------------------------
+
+def latency_chunk(rng, size):
+    """Base latency 50-150ms, plus a 200-400ms spike on 5% of requests"""
+    latency = rng.uniform(50, 150, size)
+    spikes = rng.random(size) < 0.05
+    latency[spikes] += rng.uniform(200, 400, int(spikes.sum()))
+    return latency
+
+
+def simulate_latency(n, seed=None, chunk_size=DEFAULT_CHUNK_SIZE, on_chunk=None):
+    """Stream n simulated latencies into a LatencyHistogram"""
+    rng = make_rng(seed)
+    hist = LatencyHistogram()
+    for size in chunk_sizes(n, chunk_size):
+        hist.record_many(latency_chunk(rng, size))
+        if on_chunk:
+            on_chunk(hist.count, hist)
+    return hist
+
+
+# --- Agent tasks -----------------------------------------------------------
+
+def task_chunk(rng, size):
+    """89% success rate, 1-14 tools, 500-3000ms duration"""
+    success = rng.random(size) < 0.89
+    tools_used = rng.integers(1, 15, size)
+    duration_ms = rng.uniform(500, 3000, size)
+    return success, tools_used, duration_ms
+
+
+def simulate_tasks(n, seed=None, chunk_size=DEFAULT_CHUNK_SIZE, metrics=None):
+    """Stream n simulated agent tasks into a TaskMetrics aggregate"""
+    rng = make_rng(seed)
+    metrics = metrics or TaskMetrics()
+    for size in chunk_sizes(n, chunk_size):
+        metrics.record_many(*task_chunk(rng, size))
+    return metrics
+
+
+# --- RAG faithfulness ------------------------------------------------------
+
+# Faithfulness below this counts as a hallucination
+HALLUCINATION_THRESHOLD = 0.8
+
+
+def faithfulness_chunk(rng, size):
+    """99.2% faithful (0.85-1.0), the rest hallucinated (0.3-0.79)"""
+    faithful = rng.random(size) < 0.992
+    return np.where(faithful, rng.uniform(0.85, 1.0, size), rng.uniform(0.3, 0.79, size))
+
+
+def simulate_faithfulness(n, seed=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Reduce n simulated faithfulness scores to running totals"""
+    rng = make_rng(seed)
+    totals = {"n": 0, "hallucinations": 0, "score_sum": 0.0, "min": np.inf, "max": -np.inf}
+    for size in chunk_sizes(n, chunk_size):
+        scores = faithfulness_chunk(rng, size)
+        totals["n"] += size
+        totals["hallucinations"] += int(np.count_nonzero(scores < HALLUCINATION_THRESHOLD))
+        totals["score_sum"] += float(scores.sum())
+        totals["min"] = min(totals["min"], float(scores.min()))
+        totals["max"] = max(totals["max"], float(scores.max()))
+    return totals
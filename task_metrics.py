@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Streaming Task Metrics
+O(1)-memory running aggregates of agent task records: success counts,
+Welford mean/variance of duration and tool usage, a duration histogram and
+per-tool breakdowns, mergeable across chunks and workers
+"""
+
+import argparse
+import gzip
+import json
+import math
+from collections import defaultdict
+
+import numpy as np
+from latency_histogram import LatencyHistogram
+
+# Records decoded per batch before the vectorized update
+RECORD_BATCH = 100_000
+
+
+class RunningStats:
+    """Count, mean and variance by Welford's update, merged with Chan's formula"""
+
+    __slots__ = ('n', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    def _combine(self, n, mean, m2, lo, hi):
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.n * n / total
+        self.n = total
+        self.min = min(self.min, lo)
+        self.max = max(self.max, hi)
+
+    def add_many(self, values):
+        """Fold a numpy batch in as one (n, mean, M2) block"""
+        values = np.asarray(values, dtype=np.float64)
+        if values.size:
+            mean = float(values.mean())
+            self._combine(int(values.size), mean, float(np.square(values - mean).sum()),
+                          float(values.min()), float(values.max()))
+
+    def merge(self, other):
+        if other.n:
+            self._combine(other.n, other.mean, other.m2, other.min, other.max)
+        return self
+
+    @property
+    def variance(self):
+        """Sample variance (n - 1 denominator)"""
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+
+class ToolStats:
+    """Per-tool usage: tasks that called it, how many of those succeeded, their durations"""
+
+    __slots__ = ('tasks', 'successes', 'duration')
+
+    def __init__(self):
+        self.tasks = 0
+        self.successes = 0
+        self.duration = RunningStats()
+
+    def merge(self, other):
+        self.tasks += other.tasks
+        self.successes += other.successes
+        self.duration.merge(other.duration)
+        return self
+
+
+class TaskMetrics:
+    """Running aggregate over a stream of agent tasks; memory does not grow with task count.
+
+    Tasks without a duration (NaN, e.g. a trace missing its start or end time)
+    still count towards success and tool metrics; `missing_duration` counts them.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.successes = 0
+        self.missing_duration = 0
+        self.duration = RunningStats()
+        self.tools_used = RunningStats()
+        self.duration_hist = LatencyHistogram()
+        self.per_tool = defaultdict(ToolStats)
+
+    def record(self, success, duration_ms, tools_used=None, tools=()):
+        """One task; `tools` names the distinct tools it called (for per-tool breakdowns)"""
+        self.n += 1
+        self.successes += bool(success)
+        timed = not math.isnan(duration_ms)
+        if timed:
+            self.duration.add(duration_ms)
+            self.duration_hist.record(duration_ms)
+        else:
+            self.missing_duration += 1
+        self.tools_used.add(len(tools) if tools_used is None else tools_used)
+        for name in tools:
+            stats = self.per_tool[name]
+            stats.tasks += 1
+            stats.successes += bool(success)
+            if timed:
+                stats.duration.add(duration_ms)
+
+    def record_many(self, success, tools_used, duration_ms):
+        """A chunk of tasks as numpy arrays (no tool names), e.g. from simulation_engine"""
+        success = np.asarray(success, dtype=bool)
+        duration_ms = np.asarray(duration_ms, dtype=np.float64)
+        self.n += int(success.size)
+        self.successes += int(np.count_nonzero(success))
+        timed = ~np.isnan(duration_ms)
+        if not timed.all():
+            self.missing_duration += int(timed.size - np.count_nonzero(timed))
+            duration_ms = duration_ms[timed]
+        self.duration.add_many(duration_ms)
+        self.duration_hist.record_many(duration_ms)
+        self.tools_used.add_many(tools_used)
+
+    def merge(self, other):
+        """Fold in another aggregate (e.g. from a worker or another log file)"""
+        self.n += other.n
+        self.successes += other.successes
+        self.missing_duration += other.missing_duration
+        self.duration.merge(other.duration)
+        self.tools_used.merge(other.tools_used)
+        self.duration_hist.merge(other.duration_hist)
+        for name, stats in other.per_tool.items():
+            self.per_tool[name].merge(stats)
+        return self
+
+    @property
+    def success_rate(self):
+        return self.successes / self.n if self.n else 0.0
+
+    def as_dict(self):
+        """task_success.json fields"""
+        metrics = {
+            "n_tasks": self.n,
+            "successes": self.successes,
+            "failures": self.n - self.successes,
+            "success_rate": round(self.success_rate, 3),
+            "success_rate_pct": f"{self.success_rate:.1%}",
+            "avg_tools_per_task": round(self.tools_used.mean, 1),
+            "std_tools_per_task": round(self.tools_used.std, 2),
+            "avg_duration_ms": round(self.duration.mean, 0),
+            "std_duration_ms": round(self.duration.std, 1),
+            "p50_duration_ms": round(self.duration_hist.percentile(50), 1),
+            "p95_duration_ms": round(self.duration_hist.percentile(95), 1),
+            "p99_duration_ms": round(self.duration_hist.percentile(99), 1),
+        }
+        if self.missing_duration:
+            metrics["missing_duration"] = self.missing_duration
+        if self.per_tool:
+            metrics["per_tool"] = {
+                name: {
+                    "tasks": stats.tasks,
+                    "success_rate": round(stats.successes / stats.tasks, 3),
+                    "avg_duration_ms": round(stats.duration.mean, 0),
+                }
+                for name, stats in sorted(self.per_tool.items(), key=lambda item: -item[1].tasks)
+            }
+        return metrics
+
+
+# --- Agent task logs -------------------------------------------------------
+
+def _task_fields(record):
+    """(success, duration_ms, tools_used, tool names) from one log record.
+
+    Accepts task records ({"success", "duration_ms", "tools_used" | "tools"})
+    and phoenix_traces summaries ({"success", "latency_ms", "tools_used", "tool_names"}).
+    `tools` is a list (Parquet list column) or a ';'-separated string (CSV).
+    A missing duration (e.g. `latency_ms: null` on an incomplete trace) is NaN.
+    """
+    duration = record.get('duration_ms', record.get('latency_ms'))
+    tools = record.get('tools', record.get('tool_names'))
+    if isinstance(tools, str):
+        tools = [t for t in tools.split(';') if t]
+    elif tools is None or isinstance(tools, float):
+        # missing, or NaN from a tabular source
+        tools = ()
+    tools_used = record.get('tools_used')
+    return bool(record['success']), math.nan if duration is None else float(duration), len(tools) if tools_used is None else int(tools_used), set(tools)
+
+
+def iter_task_records(path):
+    """Stream task records from JSONL (optionally .gz), or Parquet / CSV in chunks"""
+    if path.endswith(('.parquet', '.csv')):
+        from ge_streaming import iter_chunks
+        for chunk in iter_chunks(path):
+            yield from chunk.to_dict('records')
+        return
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def aggregate_records(records, metrics=None, batch=RECORD_BATCH):
+    """Fold a record stream into `metrics` (a new TaskMetrics by default).
+
+    Numeric fields are buffered per batch and folded in vectorized; only the
+    per-tool counters are updated record by record.
+    """
+    metrics = metrics or TaskMetrics()
+    success, duration, tools_used = [], [], []
+    per_tool = metrics.per_tool
+    for record in records:
+        ok, ms, used, names = _task_fields(record)
+        success.append(ok)
+        duration.append(ms)
+        tools_used.append(used)
+        for name in names:
+            stats = per_tool[name]
+            stats.tasks += 1
+            stats.successes += ok
+            if not math.isnan(ms):
+                stats.duration.add(ms)
+        if len(success) >= batch:
+            metrics.record_many(success, tools_used, duration)
+            success, duration, tools_used = [], [], []
+    if success:
+        metrics.record_many(success, tools_used, duration)
+    return metrics
+
+
+def aggregate_task_logs(paths):
+    """One TaskMetrics over every record in `paths`"""
+    metrics = TaskMetrics()
+    for path in paths:
+        aggregate_records(iter_task_records(path), metrics)
+    return metrics
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate agent task logs into task success metrics")
+    parser.add_argument("paths", nargs='+', help="task records: .jsonl / .jsonl.gz / .parquet / .csv")
+    args = parser.parse_args(argv)
+    print(json.dumps(aggregate_task_logs(args.paths).as_dict(), indent=2))
+    return 0
+
+if __name__ == '__main__':
+    main()